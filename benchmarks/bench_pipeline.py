@@ -0,0 +1,353 @@
+"""
+Benchmarks for the detection tick and the API hot paths.
+
+Runs local stand-in servers for the drone feed and the user API, a SQLite
+(or local PostgreSQL) database, and writes the results as JSON so runs can
+be compared between commits:
+
+    PYTHONPATH=src python -m benchmarks.bench_pipeline --drones 20000 --output bench.json
+    PYTHONPATH=src python -m benchmarks.bench_pipeline --compare bench.json
+
+The /nfz benchmark needs an async driver for the chosen database
+(aiosqlite for the default SQLite file).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# --- Stand-in upstream servers ---
+def make_feed(count: int, violator_ratio: float, seed: int) -> list[dict]:
+    """Drone feed where roughly violator_ratio of the drones are inside the default zone."""
+    rng = random.Random(seed)
+    feed = []
+    for n in range(count):
+        if rng.random() < violator_ratio:
+            x, y = rng.randint(-700, 700), rng.randint(-700, 700)
+        else:
+            x, y = rng.choice([-1, 1]) * rng.randint(1001, 50_000), rng.randint(-50_000, 50_000)
+        feed.append({"id": f"drone-{n}", "owner_id": rng.randint(1, count), "x": x, "y": y,
+                     "z": rng.randint(0, 500)})
+    return feed
+
+
+def start_upstream(feed: list[dict], owner_latency: float) -> tuple[ThreadingHTTPServer, str]:
+    """Serve /drones and /users/{id} on a free local port from a background thread."""
+    feed_body = json.dumps(feed).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/drones"):
+                body = feed_body
+            else:
+                time.sleep(owner_latency)
+                owner_id = self.path.rsplit("/", 1)[-1]
+                body = json.dumps({
+                    "first_name": f"first-{owner_id}",
+                    "last_name": f"last-{owner_id}",
+                    "social_security_number": f"{owner_id:0>6}-123A",
+                    "phone_number": f"+35840{owner_id:0>7}",
+                }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 1024  # the default backlog of 5 drops bursts of concurrent lookups
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+# --- Helpers ---
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "count": len(ordered),
+        "p50_ms": round(pick(0.50) * 1000, 3),
+        "p99_ms": round(pick(0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# --- Benchmarks ---
+def bench_tick(task, args) -> dict:
+    """End-to-end tick throughput and per-stage timings."""
+    results = {}
+    for mode in ("sync", "async"):
+        task.settings.pipeline_mode = mode
+        durations = []
+        for _ in range(args.repeat):
+            task.owner_cache.clear()
+            if mode == "async":
+                _, elapsed = timed(task.run_async, task.process_nfz_violations_async())
+            else:
+                _, elapsed = timed(task.process_nfz_violations)
+            durations.append(elapsed)
+        best = min(durations)
+        results[f"tick_{mode}"] = {
+            "seconds_best": round(best, 4),
+            "seconds_mean": round(statistics.fmean(durations), 4),
+            "drones_per_second": round(args.drones / best),
+        }
+
+    task.owner_cache.clear()
+    raw, fetch_s = timed(task.fetch_drones_data)
+    task.settings.validation_mode = "bulk"
+    _, validate_bulk_s = timed(task.validate_all_drones, raw)
+    task.settings.validation_mode = "model"
+    drones, validate_s = timed(task.validate_all_drones, raw)
+    violators, classify_s = timed(
+        lambda: [drone for drone in drones if task.zone_index.match(drone.x, drone.y, drone.z)]
+    )
+    owner_ids = {drone.owner_id for drone in violators}
+    owners, lookup_s = timed(task.run_async, task.fetch_owners_info_async(task.get_http_client(), owner_ids))
+    rows = [task.build_violation_row(drone.model_dump(), owners.get(drone.owner_id, {})) for drone in violators]
+    _, store_s = timed(task.store_violations_batch, rows)
+    from src.fast_api_airguardian.prediction import IncursionPredictor
+    predictor = IncursionPredictor()
+    predictor.observe(raw, task.zone_index, 0.0)
+    moved = [{**drone, "x": drone["x"] + 50, "y": drone["y"] - 20} for drone in raw]
+    _, predict_s = timed(predictor.observe, moved, task.zone_index, 10.0)
+    results["stages_seconds"] = {
+        "fetch": round(fetch_s, 4),
+        "validate": round(validate_s, 4),
+        "validate_bulk": round(validate_bulk_s, 4),
+        "classify": round(classify_s, 4),
+        "owner_lookup": round(lookup_s, 4),
+        "store": round(store_s, 4),
+        "predict": round(predict_s, 4),
+    }
+    results["violators"] = len(violators)
+    return results
+
+
+def bench_pii(task, settings, args) -> dict:
+    """
+    Cost of owner PII protection on one /nfz page and on one tick's writes.
+
+    Stores args.pii_rows plaintext and args.pii_rows encrypted violations in
+    a scratch SQLite file, then times a column-mode /nfz page (fetch and
+    encode) of the plaintext rows, and of the encrypted rows both redacted
+    and decrypted. Overheads are relative to the plaintext page.
+    """
+    import base64
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from src.fast_api_airguardian import pii
+    from src.fast_api_airguardian.repository import ViolationRepository, violations_query
+    from src.fast_api_airguardian.serialization import dumps, projection, violation_dicts, VIOLATION_FIELDS
+
+    owner = {"first_name": "a", "last_name": "b", "social_security_number": "010101-123A",
+             "phone_number": "0401234567"}
+    rows = [task.build_violation_row({"id": f"drone-{n}", "owner_id": n, "x": 10, "y": 20, "z": 30}, owner)
+            for n in range(args.pii_rows)]
+    path = os.path.join(tempfile.mkdtemp(), "pii.db")
+    task.Violation.metadata.create_all(create_engine(f"sqlite:///{path}"))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    repo = ViolationRepository(async_sessionmaker(engine, expire_on_commit=False))
+    previous_key = settings.pii_encryption_key
+    settings.pii_encryption_key = base64.urlsafe_b64encode(os.urandom(32)).decode()
+
+    async def page(zone_id: str, fields: tuple[str, ...]) -> float:
+        query = violations_query().where(task.Violation.zone_id == zone_id)
+        start = time.perf_counter()
+        dumps(violation_dicts(await repo.page_columns(query, args.pii_rows, fields), fields))
+        return time.perf_counter() - start
+
+    async def run() -> dict:
+        await repo.insert_many([{**row, "zone_id": "plain"} for row in rows])
+        protected, protect_s = timed(pii.protect_rows, [{**row, "zone_id": "protected"} for row in rows])
+        await repo.insert_many(protected)
+        samples = {"plain": ("plain", VIOLATION_FIELDS), "redacted": ("protected", projection(False)),
+                   "revealed": ("protected", projection(True))}
+        seconds = {name: min([await page(*sample) for _ in range(args.repeat + 4)])
+                   for name, sample in samples.items()}
+        await engine.dispose()
+        return {**seconds, "protect": protect_s}
+
+    try:
+        seconds = asyncio.run(run())
+    finally:
+        settings.pii_encryption_key = previous_key
+
+    overhead = {name: (seconds[name] / seconds["plain"] - 1) * 100 for name in ("redacted", "revealed")}
+    return {
+        "rows": args.pii_rows,
+        "page_ms": {name: round(seconds[name] * 1000, 3) for name in ("plain", "redacted", "revealed")},
+        "protect_ms": round(seconds["protect"] * 1000, 3),
+        "redacted_overhead_pct": round(overhead["redacted"], 1),
+        "revealed_overhead_pct": round(overhead["revealed"], 1),
+        "max_overhead_pct": args.pii_max_overhead,
+        "within_budget": overhead["revealed"] <= args.pii_max_overhead,
+    }
+
+
+async def load(client, path: str, params: dict, headers: dict, requests: int, concurrency: int) -> dict:
+    """Issue requests from concurrent workers and collect latencies."""
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return percentiles(latencies)
+
+
+def bench_api(main, settings, args) -> dict:
+    """p50/p99 of /drones and /nfz under concurrent load, in process over ASGI."""
+    import httpx
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            results = {"drones": await load(client, "/drones", {}, {}, args.requests, args.concurrency)}
+            headers = {"x-secret": settings.api_secret}
+            for mode, name in (("model", "nfz_page"), ("columns", "nfz_page_columns")):
+                settings.nfz_response_mode = mode
+                results[name] = await load(client, "/nfz", {"limit": 1000}, headers,
+                                           args.requests, args.concurrency)
+            return results
+
+    return asyncio.run(run())
+
+
+def seed_violations(session_factory, task, count: int) -> None:
+    start = datetime(2026, 1, 1)
+    rows = [
+        task.build_violation_row({"id": f"drone-{n % 500}", "x": 10, "y": 20, "z": 30},
+                                 {"first_name": "a", "last_name": "b",
+                                  "social_security_number": "010101-123A", "phone_number": "123"},
+                                 timestamp=start + timedelta(seconds=n))
+        for n in range(count)
+    ]
+    task.store_violations_batch(rows)
+
+
+def compare(current: dict, previous: dict, prefix: str = "") -> None:
+    """Print relative change of every numeric result against a previous run."""
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            compare(value, old, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            print(f"{prefix}{key:<30} {old:>12} -> {value:>12} ({(value - old) / old:+.1%})")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drones", type=int, default=10_000)
+    parser.add_argument("--violator-ratio", type=float, default=0.02)
+    parser.add_argument("--owner-latency", type=float, default=0.05, help="seconds per user API call")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--stored-violations", type=int, default=20_000)
+    parser.add_argument("--database-url", help="sync URL; defaults to a temporary SQLite file")
+    parser.add_argument("--async-database-url",
+                        help="async URL for the async pipeline and /nfz; defaults to the same SQLite file")
+    parser.add_argument("--skip-api", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--log-level", default="ERROR")
+    parser.add_argument("--pii-rows", type=int, default=1000, help="violations per PII encoding sample")
+    parser.add_argument("--pii-max-overhead", type=float, default=50.0,
+                        help="fail when decrypting PII slows an /nfz page by more than this percentage")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+
+    feed = make_feed(args.drones, args.violator_ratio, args.seed)
+    server, upstream = start_upstream(feed, args.owner_latency)
+    os.environ.update({"BASE_URL": f"{upstream}/drones", "USER_API_URL": f"{upstream}/users",
+                       "PUBLISH_EVENTS": "false", "DRONES_CACHE_TTL": "0", "DRONES_CACHE_MAX_STALE": "0"})
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.fast_api_airguardian import task
+    from src.fast_api_airguardian import main
+    from src.fast_api_airguardian.repository import violation_repository
+    from src.fast_api_airguardian.settings import settings
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(args.database_url or f"sqlite:///{db_file}")
+    task.Violation.metadata.drop_all(engine)
+    task.Violation.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    task.get_db_session = session_factory
+    # The async pipeline and /nfz share the violation repository
+    async_engine = create_async_engine(args.async_database_url or f"sqlite+aiosqlite:///{db_file}")
+    violation_repository.session_factory = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "tick": bench_tick(task, args),
+        "pii": bench_pii(task, settings, args),
+    }
+    task.run_async(async_engine.dispose())  # pooled connections belong to the worker's loop
+
+    if not args.skip_api:
+        seed_violations(session_factory, task, args.stored_violations)
+        result["api"] = bench_api(main, settings, args)
+        asyncio.run(async_engine.dispose())
+
+    server.shutdown()
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(json.dumps(result, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print(f"\nChange against {args.compare} (commit {previous.get('commit')}):")
+        compare({key: result[key] for key in ("tick", "pii", "api") if key in result}, previous)
+
+    if not result["pii"]["within_budget"]:
+        print(f"\nPII decryption overhead {result['pii']['revealed_overhead_pct']}% exceeds "
+              f"{args.pii_max_overhead}%", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
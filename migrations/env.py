@@ -13,8 +13,8 @@ from fast_api_airguardian import model  # noqa: F401 — ensures models are regi
 # Alembic Config object
 config = context.config
 
-# Logging
-if config.config_file_name is not None:
+# Logging (left to the caller when run from fast_api_airguardian.migrate)
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # Metadata for autogenerate
@@ -33,6 +33,14 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online() -> None:
+    # fast_api_airguardian.migrate passes the connection holding its advisory lock
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = create_engine(
         os.environ["DATABASE_URL_SYNC"],
         poolclass=pool.NullPool,
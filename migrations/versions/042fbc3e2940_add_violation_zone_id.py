@@ -0,0 +1,31 @@
+"""add violation zone_id
+
+Revision ID: 042fbc3e2940
+Revises: fa777ac5412e
+Create Date: 2026-10-17 10:03:54.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '042fbc3e2940'
+down_revision: Union[str, Sequence[str], None] = 'fa777ac5412e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('violations', sa.Column('zone_id', sa.String(),
+                                          server_default='default', nullable=False))
+    op.create_index(op.f('ix_violations_zone_id'), 'violations', ['zone_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_violations_zone_id'), table_name='violations')
+    op.drop_column('violations', 'zone_id')
@@ -0,0 +1,34 @@
+"""add encrypted owner pii columns and ssn lookup hash
+
+Revision ID: 5d2e8a41c3b7
+Revises: 7bf124c883e1
+Create Date: 2026-10-17 21:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a41c3b7'
+down_revision: Union[str, Sequence[str], None] = '7bf124c883e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('violations', sa.Column('owner_ssn_enc', sa.LargeBinary(), nullable=True))
+    op.add_column('violations', sa.Column('owner_phone_enc', sa.LargeBinary(), nullable=True))
+    op.add_column('violations', sa.Column('owner_ssn_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_violations_owner_ssn_hash'), 'violations', ['owner_ssn_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_violations_owner_ssn_hash'), table_name='violations')
+    op.drop_column('violations', 'owner_ssn_hash')
+    op.drop_column('violations', 'owner_phone_enc')
+    op.drop_column('violations', 'owner_ssn_enc')
@@ -0,0 +1,41 @@
+"""add drone tracks
+
+Revision ID: 7bf124c883e1
+Revises: fcfe6597b004
+Create Date: 2026-10-17 16:20:54.207731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7bf124c883e1'
+down_revision: Union[str, Sequence[str], None] = 'fcfe6597b004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'drone_tracks',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('drone_id', sa.String(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_drone_tracks_drone_id_start_time', 'drone_tracks', ['drone_id', 'start_time'])
+    op.create_index(op.f('ix_drone_tracks_end_time'), 'drone_tracks', ['end_time'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_drone_tracks_end_time'), table_name='drone_tracks')
+    op.drop_index('ix_drone_tracks_drone_id_start_time', table_name='drone_tracks')
+    op.drop_table('drone_tracks')
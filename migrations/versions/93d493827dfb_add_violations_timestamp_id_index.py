@@ -0,0 +1,28 @@
+"""add violations (timestamp, id) index
+
+Revision ID: 93d493827dfb
+Revises: 042fbc3e2940
+Create Date: 2026-10-17 10:41:07.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93d493827dfb'
+down_revision: Union[str, Sequence[str], None] = '042fbc3e2940'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_violations_timestamp_id', 'violations', ['timestamp', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_violations_timestamp_id', table_name='violations')
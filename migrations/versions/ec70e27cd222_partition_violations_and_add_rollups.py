@@ -0,0 +1,137 @@
+"""partition violations by timestamp and add hourly rollups
+
+Revision ID: ec70e27cd222
+Revises: 93d493827dfb
+Create Date: 2026-10-17 13:02:45.118305
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec70e27cd222'
+down_revision: Union[str, Sequence[str], None] = '93d493827dfb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = """
+    id INTEGER NOT NULL DEFAULT nextval('violations_id_seq'),
+    drone_id VARCHAR NOT NULL,
+    zone_id VARCHAR NOT NULL DEFAULT 'default',
+    timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    position_x INTEGER NOT NULL,
+    position_y INTEGER NOT NULL,
+    position_z INTEGER NOT NULL,
+    distance_from_center INTEGER NOT NULL,
+    owner_first_name VARCHAR NOT NULL,
+    owner_last_name VARCHAR NOT NULL,
+    owner_ssn VARCHAR NOT NULL,
+    owner_phone VARCHAR NOT NULL,
+    episode_start TIMESTAMP WITHOUT TIME ZONE,
+    episode_end TIMESTAMP WITHOUT TIME ZONE,
+    min_distance INTEGER,
+    sample_count INTEGER NOT NULL DEFAULT 1
+"""
+COLUMN_NAMES = ("id, drone_id, zone_id, timestamp, position_x, position_y, position_z, "
+                "distance_from_center, owner_first_name, owner_last_name, owner_ssn, owner_phone, "
+                "episode_start, episode_end, min_distance, sample_count")
+INDEXES = {
+    'ix_violations_drone_id': 'drone_id',
+    'ix_violations_zone_id': 'zone_id',
+    'ix_violations_timestamp': 'timestamp',
+    'ix_violations_timestamp_id': 'timestamp, id',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'violation_rollups_drone_hourly',
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('drone_id', sa.String(), nullable=False),
+        sa.Column('violations', sa.Integer(), nullable=False),
+        sa.Column('closest_distance', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket', 'drone_id'),
+    )
+    op.create_table(
+        'violation_rollups_zone_hourly',
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('zone_id', sa.String(), nullable=False),
+        sa.Column('violations', sa.Integer(), nullable=False),
+        sa.Column('drones', sa.Integer(), nullable=False),
+        sa.Column('closest_distance', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket', 'zone_id'),
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        _partition_violations(op.get_bind())
+        op.execute(
+            "INSERT INTO violation_rollups_drone_hourly (bucket, drone_id, violations, closest_distance) "
+            "SELECT date_trunc('hour', timestamp), drone_id, count(*), min(distance_from_center) "
+            "FROM violations GROUP BY 1, 2"
+        )
+        op.execute(
+            "INSERT INTO violation_rollups_zone_hourly (bucket, zone_id, violations, drones, closest_distance) "
+            "SELECT date_trunc('hour', timestamp), zone_id, count(*), count(DISTINCT drone_id), "
+            "min(distance_from_center) FROM violations GROUP BY 1, 2"
+        )
+
+
+def _partition_violations(bind) -> None:
+    """
+    Rebuild violations as a table partitioned by RANGE (timestamp).
+
+    Existing rows go to one archive partition up to today; daily partitions
+    follow for today and the next days, the maintenance task keeps creating
+    new ones and drops expired ones.
+    """
+    op.execute("ALTER TABLE violations RENAME TO violations_unpartitioned")
+    op.execute("ALTER TABLE violations_unpartitioned RENAME CONSTRAINT violations_pkey "
+               "TO violations_unpartitioned_pkey")
+    op.execute("ALTER SEQUENCE violations_id_seq OWNED BY NONE")
+    op.execute(f"CREATE TABLE violations ({COLUMNS}, PRIMARY KEY (id, timestamp)) "
+               "PARTITION BY RANGE (timestamp)")
+
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    first = bind.execute(sa.text("SELECT min(timestamp) FROM violations_unpartitioned")).scalar()
+    if first is not None and first < today:
+        start = first.replace(hour=0, minute=0, second=0, microsecond=0)
+        op.execute(f"CREATE TABLE violations_archive PARTITION OF violations "
+                   f"FOR VALUES FROM ('{start}') TO ('{today}')")
+    for offset in range(4):
+        day = today + timedelta(days=offset)
+        op.execute(f"CREATE TABLE violations_p{day:%Y%m%d} PARTITION OF violations "
+                   f"FOR VALUES FROM ('{day}') TO ('{day + timedelta(days=1)}')")
+    op.execute("CREATE TABLE violations_default PARTITION OF violations DEFAULT")
+
+    op.execute(f"INSERT INTO violations ({COLUMN_NAMES}) "
+               f"SELECT {COLUMN_NAMES} FROM violations_unpartitioned")
+    op.execute("DROP TABLE violations_unpartitioned")
+    op.execute("ALTER SEQUENCE violations_id_seq OWNED BY violations.id")
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON violations ({columns})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE violations RENAME TO violations_partitioned")
+        op.execute("ALTER SEQUENCE violations_id_seq OWNED BY NONE")
+        for name in INDEXES:
+            op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+        op.execute("ALTER TABLE violations_partitioned RENAME CONSTRAINT violations_pkey "
+                   "TO violations_partitioned_pkey")
+        op.execute(f"CREATE TABLE violations ({COLUMNS}, PRIMARY KEY (id))")
+        op.execute(f"INSERT INTO violations ({COLUMN_NAMES}) "
+                   f"SELECT {COLUMN_NAMES} FROM violations_partitioned")
+        op.execute("DROP TABLE violations_partitioned")
+        op.execute("ALTER SEQUENCE violations_id_seq OWNED BY violations.id")
+        for name, columns in INDEXES.items():
+            op.execute(f"CREATE INDEX {name} ON violations ({columns})")
+
+    op.drop_table('violation_rollups_zone_hourly')
+    op.drop_table('violation_rollups_drone_hourly')
@@ -0,0 +1,35 @@
+"""add violation episode columns
+
+Revision ID: fa777ac5412e
+Revises: 3c95c9a2afd0
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa777ac5412e'
+down_revision: Union[str, Sequence[str], None] = '3c95c9a2afd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('violations', sa.Column('episode_start', sa.DateTime(), nullable=True))
+    op.add_column('violations', sa.Column('episode_end', sa.DateTime(), nullable=True))
+    op.add_column('violations', sa.Column('min_distance', sa.Integer(), nullable=True))
+    op.add_column('violations', sa.Column('sample_count', sa.Integer(),
+                                          server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('violations', 'sample_count')
+    op.drop_column('violations', 'min_distance')
+    op.drop_column('violations', 'episode_end')
+    op.drop_column('violations', 'episode_start')
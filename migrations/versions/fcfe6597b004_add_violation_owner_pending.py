@@ -0,0 +1,34 @@
+"""add violation owner id and pending flag
+
+Revision ID: fcfe6597b004
+Revises: ec70e27cd222
+Create Date: 2026-10-17 15:41:08.530172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fcfe6597b004'
+down_revision: Union[str, Sequence[str], None] = 'ec70e27cd222'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('violations', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.add_column('violations', sa.Column('owner_pending', sa.Boolean(),
+                                          server_default=sa.false(), nullable=False))
+    op.create_index('ix_violations_owner_pending', 'violations', ['owner_id'],
+                    postgresql_where=sa.text('owner_pending'), sqlite_where=sa.text('owner_pending'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_violations_owner_pending', table_name='violations')
+    op.drop_column('violations', 'owner_pending')
+    op.drop_column('violations', 'owner_id')
@@ -0,0 +1,156 @@
+import logging
+import math
+import time
+
+import redis
+
+from .events import get_redis
+from .metrics import BREAKER_OPEN
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+UPSTREAMS = ("drone_feed", "user_api")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one upstream, shared by worker processes through Redis.
+
+    After settings.breaker_failure_threshold consecutive failed calls the
+    circuit opens and calls fail fast for breaker_reset_timeout seconds.
+    Then a single probe call (across all processes) is let through: success
+    closes the circuit, failure opens it again.
+
+    The shared state is re-read at most every breaker_refresh_interval
+    seconds. Without Redis the breaker keeps working per process.
+    """
+
+    def __init__(self, name: str, client_factory=get_redis, clock=time.time):
+        self.name = name
+        self.key = f"nfz:breaker:{name}"
+        self.probe_key = f"{self.key}:probe"
+        self.client_factory = client_factory
+        self._clock = clock
+        self._failures = 0
+        self._open_until = 0.0
+        self._refreshed = float("-inf")
+
+    def _refresh(self, now: float) -> None:
+        if now - self._refreshed < settings.breaker_refresh_interval:
+            return
+        self._refreshed = now
+        try:
+            failures, open_until = self.client_factory().hmget(self.key, "failures", "open_until")
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Circuit breaker state unavailable for {self.name}: {e}")
+            return
+        self._failures = int(failures or 0)
+        self._open_until = float(open_until or 0)
+
+    def is_open(self) -> bool:
+        """True while calls must fail fast (open, or half-open with a probe in flight elsewhere)."""
+        now = self._clock()
+        self._refresh(now)
+        return bool(self._open_until) and now < self._open_until
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit may be probed again, 0 when it is closed."""
+        return max(0.0, self._open_until - self._clock()) if self._open_until else 0.0
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may go to the upstream.
+
+        Returns:
+            bool: True when closed, or when this caller got the half-open probe
+        """
+        now = self._clock()
+        self._refresh(now)
+        if not self._open_until:
+            return True
+        if now < self._open_until:
+            return False
+        try:
+            return bool(self.client_factory().set(
+                self.probe_key, 1, nx=True, px=int(settings.breaker_reset_timeout * 1000)))
+        except redis.RedisError:
+            return True
+
+    def record_success(self) -> None:
+        """
+        Close the circuit and reset the failure count.
+
+        The shared count is reset even when this process saw no failures,
+        since other processes may have counted some since the last refresh.
+        """
+        was_open = bool(self._open_until)
+        self._failures, self._open_until = 0, 0.0
+        try:
+            self.client_factory().delete(self.key, self.probe_key)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to reset circuit breaker {self.name}: {e}")
+        if was_open:
+            BREAKER_OPEN.labels(self.name).set(0)
+            logger.info(f"✅ Circuit closed for {self.name}")
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold or after a failed probe."""
+        try:
+            self._failures = self.client_factory().hincrby(self.key, "failures", 1)
+        except redis.RedisError:
+            self._failures += 1
+        if self._failures < settings.breaker_failure_threshold and not self._open_until:
+            return
+        self._open_until = self._clock() + settings.breaker_reset_timeout
+        try:
+            pipe = self.client_factory().pipeline()
+            pipe.hset(self.key, "open_until", self._open_until)
+            pipe.delete(self.probe_key)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to share circuit breaker state for {self.name}: {e}")
+        BREAKER_OPEN.labels(self.name).set(1)
+        logger.error(f"🚨 Circuit open for {self.name} for {settings.breaker_reset_timeout}s")
+
+
+class RetryBudget:
+    """
+    Retries allowed per upstream per time window, shared by all workers.
+
+    Caps the extra load retries put on a struggling upstream: once
+    settings.retry_budget retries were spent in the current
+    retry_budget_window, failed calls give up instead of retrying.
+    """
+
+    def __init__(self, name: str, client_factory=get_redis, clock=time.time):
+        self.name = name
+        self.client_factory = client_factory
+        self._clock = clock
+        self._window = -1
+        self._used = 0
+
+    def take(self) -> bool:
+        """
+        Spend one retry.
+
+        Returns:
+            bool: True when the budget allows the retry
+        """
+        window = int(self._clock() // settings.retry_budget_window)
+        try:
+            key = f"nfz:retry_budget:{self.name}:{window}"
+            pipe = self.client_factory().pipeline()
+            pipe.incr(key)
+            pipe.expire(key, math.ceil(settings.retry_budget_window * 2))
+            used = pipe.execute()[0]
+        except redis.RedisError:
+            if window != self._window:
+                self._window, self._used = window, 0
+            self._used += 1
+            used = self._used
+        return used <= settings.retry_budget
+
+
+breakers = {name: CircuitBreaker(name) for name in UPSTREAMS}
+retry_budgets = {name: RetryBudget(name) for name in UPSTREAMS}
@@ -0,0 +1,157 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+
+import redis
+
+from .pii import seal, unseal
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OwnerCache:
+    """
+    Bounded TTL + LRU cache of owner records keyed by owner id.
+
+    Owners that the user API reports as missing (404) are cached as an empty
+    dict for a shorter negative TTL. An optional Redis tier lets Celery worker
+    processes share hits; Redis errors degrade to a local-only cache. Records
+    are sealed before they reach Redis, so with PII_ENCRYPTION_KEY set owner
+    SSNs and phones never rest there in plaintext.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        redis_client: redis.Redis | None = None,
+        key_prefix: str = "owner:",
+        clock=time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    def get(self, owner_id: int) -> dict | None:
+        """
+        Look up an owner record.
+
+        Returns:
+            dict: Cached owner info, empty dict for a cached 404
+            None: Not cached (caller should query the user API)
+        """
+        return self.get_many([owner_id]).get(owner_id)
+
+    def get_many(self, owner_ids: list[int]) -> dict[int, dict]:
+        """
+        Look up several owners, consulting Redis once for all local misses.
+
+        Returns:
+            dict[int, dict]: Cached records for the ids that were found
+        """
+        found: dict[int, dict] = {}
+        missing: list[int] = []
+        now = self._clock()
+        with self._lock:
+            for owner_id in owner_ids:
+                entry = self._entries.get(owner_id)
+                if entry is None or entry[0] <= now:
+                    if entry is not None:
+                        del self._entries[owner_id]
+                    missing.append(owner_id)
+                    continue
+                self._entries.move_to_end(owner_id)
+                found[owner_id] = entry[1]
+
+        if missing and self.redis is not None:
+            for owner_id, info in self._redis_get_many(missing).items():
+                self._store_local(owner_id, info)
+                found[owner_id] = info
+                self.redis_hits += 1
+
+        self.hits += len(found)
+        self.misses += len(owner_ids) - len(found)
+        self.negative_hits += sum(1 for info in found.values() if not info)
+        return found
+
+    def set(self, owner_id: int, info: dict) -> None:
+        """Cache a resolved owner record."""
+        self._store_local(owner_id, info)
+        self._redis_set(owner_id, info, self.ttl)
+
+    def set_missing(self, owner_id: int) -> None:
+        """Cache that the user API has no record for this owner."""
+        self._store_local(owner_id, {})
+        self._redis_set(owner_id, {}, self.negative_ttl)
+
+    def clear(self) -> None:
+        """Drop all local entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+        self.hits = self.misses = self.redis_hits = 0
+        self.negative_hits = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "negative_hits": self.negative_hits,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _store_local(self, owner_id: int, info: dict) -> None:
+        ttl = self.ttl if info else self.negative_ttl
+        with self._lock:
+            self._entries[owner_id] = (self._clock() + ttl, info)
+            self._entries.move_to_end(owner_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _redis_get_many(self, owner_ids: list[int]) -> dict[int, dict]:
+        try:
+            values = self.redis.mget([f"{self.key_prefix}{owner_id}" for owner_id in owner_ids])
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Owner cache Redis read failed: {e}")
+            return {}
+        found = {}
+        for owner_id, value in zip(owner_ids, values):
+            data = None if value is None else unseal(value, self.key_prefix)
+            if data is not None:  # written under another key: a miss, refetched and resealed
+                found[owner_id] = json.loads(data)
+        return found
+
+    def _redis_set(self, owner_id: int, info: dict, ttl: float) -> None:
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(f"{self.key_prefix}{owner_id}", seal(json.dumps(info), self.key_prefix), ex=int(ttl))
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Owner cache Redis write failed: {e}")
+
+
+owner_cache = OwnerCache(
+    maxsize=settings.owner_cache_size,
+    ttl=settings.owner_cache_ttl,
+    negative_ttl=settings.owner_cache_negative_ttl,
+    redis_client=redis.Redis.from_url(str(settings.redis_url)) if settings.owner_cache_redis else None,
+)
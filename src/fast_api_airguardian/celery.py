@@ -1,7 +1,11 @@
+import logging
+import time
 from celery import Celery
 from celery.schedules import crontab
-from src.fast_api_airguardian.settings  import settings
+from celery.signals import before_task_publish, worker_init, worker_process_shutdown
+from .settings import settings
 
+logger = logging.getLogger(__name__)
 
 celery_app = Celery(
     "nfz_monitor",
@@ -15,12 +19,77 @@ celery_app.conf.update(
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
-    imports=['src.fast_api_airguardian.task']
+    imports=['src.fast_api_airguardian.task', 'src.fast_api_airguardian.maintenance']
 )
 
 celery_app.conf.beat_schedule = {
     'fetch-drone-positions-every-10s' : {
         'task': 'nfz-violation-check',
-        'schedule': 10.0,
+        'schedule': settings.tick_min_interval,
+        # Ticks still queued after one interval are dropped, a newer one follows
+        'options': {'expires': settings.tick_min_interval},
     },
-}
\ No newline at end of file
+    'violation-maintenance': {
+        'task': 'nfz-violation-maintenance',
+        'schedule': settings.maintenance_interval,
+    },
+}
+
+
+@before_task_publish.connect
+def stamp_publish_time(headers=None, **kwargs):
+    """Record when a tick was published so the worker can report its lag."""
+    if headers is not None and headers.get("task") == "nfz-violation-check":
+        headers["published_at"] = time.time()
+
+
+def process_local_stores() -> list[str]:
+    """Enabled features whose state is kept per worker process (store "memory")."""
+    stores = []
+    if settings.episode_tracking and settings.episode_store == "memory":
+        stores.append("EPISODE_STORE")
+    if settings.delta_processing and settings.feed_snapshot_store == "memory":
+        stores.append("FEED_SNAPSHOT_STORE")
+    if settings.prediction_enabled and settings.prediction_store == "memory":
+        stores.append("PREDICTION_STORE")
+    return stores
+
+
+@worker_init.connect
+def check_process_local_stores(sender=None, **kwargs):
+    """
+    Warn when in-memory stores are used by a pool of several processes.
+
+    Every prefork child would then track its own episodes, feed snapshot and
+    drone positions: one incursion is stored as several episodes, deltas are
+    computed against another child's snapshot, and consecutive ticks rarely
+    reach the same child, so no drone velocity (and no prediction) is found.
+    """
+    pool = getattr(sender, "pool_cls", "")
+    pool_name = pool if isinstance(pool, str) else getattr(pool, "__module__", "")
+    stores = process_local_stores()
+    if stores and "prefork" in pool_name and getattr(sender, "concurrency", 1) != 1:
+        logger.warning(f"⚠️ {', '.join(stores)}=memory is per process but the prefork pool runs "
+                       f"{sender.concurrency} processes; use \"redis\" or --pool solo")
+
+
+@worker_init.connect
+def start_worker_metrics(**kwargs):
+    """
+    Expose the worker's /metrics.
+
+    Prefork children only report through PROMETHEUS_MULTIPROC_DIR; without
+    it, only the solo and threads pools export the pipeline metrics.
+    """
+    if settings.worker_metrics_port is None:
+        return
+    from .metrics import start_metrics_server
+    start_metrics_server(settings.worker_metrics_port)
+
+
+@worker_process_shutdown.connect
+def flush_track_buffer(**kwargs):
+    """Store the positions a worker process buffered for track history before it exits."""
+    if settings.track_recording:
+        from .task import flush_tracks
+        flush_tracks()
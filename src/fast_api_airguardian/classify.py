@@ -0,0 +1,60 @@
+import math
+from operator import itemgetter
+
+import numpy as np
+
+
+def _coordinate(value) -> float:
+    """Best-effort float conversion; unusable values become NaN (never a violator)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _column(raw_drones: list[dict], key: str) -> np.ndarray:
+    """Extract one coordinate of every row into a contiguous float64 array."""
+    try:
+        return np.fromiter(map(itemgetter(key), raw_drones), dtype=np.float64, count=len(raw_drones))
+    except (KeyError, TypeError, ValueError):
+        # Malformed rows somewhere in the feed: convert row by row instead.
+        return np.fromiter((_coordinate(drone.get(key)) for drone in raw_drones),
+                           dtype=np.float64, count=len(raw_drones))
+
+
+def feed_to_arrays(raw_drones: list[dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn the raw drone feed into x, y and z coordinate arrays.
+
+    Rows with missing or non-numeric coordinates get NaN, which compares
+    False against any zone and so can never be reported as a violator.
+
+    Args:
+        raw_drones: Drone dicts as returned by the drone feed
+
+    Returns:
+        tuple: x, y and z as float64 arrays aligned with raw_drones
+    """
+    return (
+        _column(raw_drones, "x"),
+        _column(raw_drones, "y"),
+        _column(raw_drones, "z"),
+    )
+
+
+def drones_to_arrays(drones: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Coordinate arrays of already validated drones.
+
+    Args:
+        drones: Drone-like objects with x, y and z, or None (becomes NaN)
+
+    Returns:
+        tuple: x, y and z as float64 arrays aligned with drones
+    """
+    return tuple(
+        np.fromiter((math.nan if drone is None else getattr(drone, axis) for drone in drones),
+                    dtype=np.float64, count=len(drones))
+        for axis in ("x", "y", "z")
+    )
+
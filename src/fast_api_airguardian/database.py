@@ -6,26 +6,46 @@ from .settings import settings
 # Single Base for all models
 Base = declarative_base()
 
+
+def pool_options() -> dict:
+    """
+    Pool sizing shared by both engines, from settings.
+
+    A process holds at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections per
+    engine it uses, so the total is predictable when scaling workers.
+    """
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": True,
+        # Rows per multi-row INSERT when batching an executemany
+        "insertmanyvalues_page_size": settings.db_insert_page_size,
+    }
+
+
+def async_connect_args(url: str) -> dict:
+    """asyncpg keeps a per-connection cache of prepared statements; size it from settings."""
+    if url.startswith("postgresql+asyncpg"):
+        return {"prepared_statement_cache_size": settings.db_statement_cache_size}
+    return {}
+
+
 # Celery needs sync connections for blocking operations 
 sync_engine = create_engine(
     str(settings.database_url_sync), 
     echo=False,              #disable in production
-    pool_size=5,
-    pool_timeout=30,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,  
+    **pool_options(),
 )
 SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
-# FastAPI needs async connections for concurrent I/O
+# FastAPI and the async worker pipeline need async connections for concurrent I/O
 async_engine = create_async_engine(
     str(settings.database_url_async), 
     echo=False,              #disable in production
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=5,
-    pool_recycle=3600,  
+    connect_args=async_connect_args(str(settings.database_url_async)),
+    **pool_options(),
 )
 AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -49,4 +69,4 @@ def get_db_session():
 
 def create_tables_sync():
     """Create all tables using sync engine"""
-    Base.metadata.create_all(bind=sync_engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=sync_engine)
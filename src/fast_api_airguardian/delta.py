@@ -0,0 +1,172 @@
+import json
+from dataclasses import dataclass, field
+
+import redis
+
+from .parsing import DroneRecord
+from .schemas import Drone
+from .settings import settings
+from .sharding import Owner
+from .zones import Detection, Zone
+
+SNAPSHOT_TTL = 24 * 3600
+
+# Last known state of a drone: owner_id, x, y, z, zone id (None outside) and distance
+DroneState = tuple[int, int, int, int, str | None, float | None]
+
+
+@dataclass
+class FeedDelta:
+    """How the drone feed changed since the previous tick."""
+    added: list[dict] = field(default_factory=list)
+    moved: list[dict] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def counts(self) -> dict:
+        return {"added": len(self.added), "moved": len(self.moved),
+                "removed": len(self.removed), "unchanged": self.unchanged}
+
+    def to_message(self) -> dict:
+        return {"added": self.added, "moved": self.moved, "removed": self.removed}
+
+
+@dataclass
+class FeedSplit:
+    """A feed partitioned into rows to reprocess and drones unchanged since the last tick."""
+    previous: dict[str, DroneState]
+    changed: list[dict]
+    unchanged: dict[str, DroneState]
+    removed: list[str]
+
+
+class InMemorySnapshotStore:
+    """Previous feed kept in the worker process."""
+
+    def __init__(self):
+        self._states: dict[str, DroneState] = {}
+
+    def load(self) -> dict[str, DroneState]:
+        return dict(self._states)
+
+    def save(self, states: dict[str, DroneState], removed: list[str]) -> None:
+        self._states.update(states)
+        for drone_id in removed:
+            self._states.pop(drone_id, None)
+
+
+class RedisSnapshotStore:
+    """
+    Previous feed kept in a Redis hash, shared by worker processes.
+
+    The hash expires when no tick saves to it for SNAPSHOT_TTL seconds, so
+    snapshots of a replaced zone config (another key) do not linger.
+    """
+
+    def __init__(self, client: redis.Redis, key: str = "nfz:feed_snapshot"):
+        self.redis = client
+        self.key = key
+
+    def load(self) -> dict[str, DroneState]:
+        return {drone_id.decode(): tuple(json.loads(raw))
+                for drone_id, raw in self.redis.hgetall(self.key).items()}
+
+    def save(self, states: dict[str, DroneState], removed: list[str]) -> None:
+        pipe = self.redis.pipeline()
+        if states:
+            pipe.hset(self.key, mapping={drone_id: json.dumps(state) for drone_id, state in states.items()})
+        if removed:
+            pipe.hdel(self.key, *removed)
+        pipe.expire(self.key, SNAPSHOT_TTL)
+        pipe.execute()
+
+
+class FeedTracker:
+    """
+    Incremental view of the drone feed.
+
+    Remembers every valid drone's last position and zone result, so each
+    tick only new and moved rows are validated and classified again. Drones
+    that did not move keep their previous result.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.last_delta: FeedDelta | None = None
+
+    def split(self, raw_drones: list[dict], owns: Owner = None) -> FeedSplit:
+        """
+        Partition the feed against the stored snapshot.
+
+        A row is unchanged when its id is known and its owner and position
+        equal the stored (validated) values; anything else is reprocessed.
+        When processing one shard, owns limits removals to its own drones.
+        """
+        previous = self.store.load()
+        changed, unchanged, seen = [], {}, set()
+        for row in raw_drones:
+            drone_id = row.get("id") if isinstance(row, dict) else None
+            state = previous.get(drone_id) if isinstance(drone_id, str) else None
+            if state is not None and (row.get("owner_id"), row.get("x"), row.get("y"), row.get("z")) == state[:4]:
+                unchanged[drone_id] = state
+            else:
+                changed.append(row)
+            seen.add(drone_id)
+        removed = [drone_id for drone_id in previous
+                   if drone_id not in seen and (owns is None or owns(drone_id))]
+        return FeedSplit(previous, changed, unchanged, removed)
+
+    def commit(
+        self,
+        split: FeedSplit,
+        drones: list[Drone | DroneRecord | None],
+        zones: list[Zone | None],
+    ) -> FeedDelta:
+        """
+        Store the reprocessed drones and return the tick's delta.
+
+        Args:
+            split: Result of split for this tick
+            drones: Validated split.changed rows (None for rejected rows)
+            zones: Zone of each drone, None when outside every zone
+
+        Returns:
+            FeedDelta: Added, moved and removed drones
+        """
+        delta = FeedDelta(removed=list(split.removed), unchanged=len(split.unchanged))
+        states: dict[str, DroneState] = {}
+        for row, drone, zone in zip(split.changed, drones, zones):
+            if drone is None:
+                drone_id = row.get("id") if isinstance(row, dict) else None
+                if drone_id in split.previous and drone_id not in split.unchanged:
+                    delta.removed.append(drone_id)  # no longer valid
+                continue
+            states[drone.id] = (drone.owner_id, drone.x, drone.y, drone.z,
+                                zone.id if zone else None, zone.distance(drone.x, drone.y) if zone else None)
+            (delta.moved if drone.id in split.previous else delta.added).append(drone.model_dump())
+        self.store.save(states, delta.removed)
+        self.last_delta = delta
+        return delta
+
+    @staticmethod
+    def unchanged_detections(split: FeedSplit) -> list[Detection]:
+        """Detections of drones that stayed put inside a zone, from their stored state."""
+        return [
+            Detection(DroneRecord(drone_id, owner_id, x, y, z), zone_id, distance)
+            for drone_id, (owner_id, x, y, z, zone_id, distance) in split.unchanged.items()
+            if zone_id is not None
+        ]
+
+
+def create_snapshot_store(zone_version: str):
+    """
+    Build the feed snapshot store selected by settings.feed_snapshot_store.
+
+    Stored states include each drone's zone result, so the Redis snapshot is
+    scoped to zone_version (see ZoneIndex.fingerprint): after NFZ_ZONES_FILE
+    changes every drone is classified again instead of keeping the old zone.
+    The in-process snapshot never outlives the zones it was built with.
+    """
+    if settings.feed_snapshot_store == "redis":
+        return RedisSnapshotStore(redis.Redis.from_url(str(settings.redis_url)), f"nfz:feed_snapshot:{zone_version}")
+    return InMemorySnapshotStore()
@@ -0,0 +1,168 @@
+import json
+from dataclasses import dataclass, field, asdict, replace
+from datetime import datetime
+
+import redis
+
+from .settings import settings
+from .sharding import Owner
+from .zones import Detection
+
+# Episodes are tracked per drone and zone: (drone_id, zone_id)
+EpisodeKey = tuple[str, str]
+
+
+@dataclass
+class Episode:
+    """An open incursion: one violation row that is updated while the drone stays inside the zone."""
+    drone_id: str
+    zone_id: str
+    violation_id: int
+    started_at: datetime
+    min_distance: float
+    sample_count: int
+    x: int
+    y: int
+    z: int
+    distance: float
+
+    @property
+    def key(self) -> EpisodeKey:
+        return self.drone_id, self.zone_id
+
+
+@dataclass
+class EpisodeChanges:
+    """What a tick changes: episodes to open (as detections), update and close."""
+    opened: list[Detection] = field(default_factory=list)
+    updated: list[Episode] = field(default_factory=list)
+    closed: list[Episode] = field(default_factory=list)
+
+
+class InMemoryEpisodeStore:
+    """Open episodes kept in the worker process."""
+
+    def __init__(self):
+        self._episodes: dict[EpisodeKey, Episode] = {}
+
+    def load(self) -> dict[EpisodeKey, Episode]:
+        return {key: replace(episode) for key, episode in self._episodes.items()}
+
+    def save(self, episodes: dict[EpisodeKey, Episode], closed: list[EpisodeKey]) -> None:
+        self._episodes.update(episodes)
+        for key in closed:
+            self._episodes.pop(key, None)
+
+
+class RedisEpisodeStore:
+    """
+    Open episodes kept in a Redis hash so they survive worker restarts.
+
+    Fields are the JSON [drone_id, zone_id] of each episode.
+    """
+
+    def __init__(self, client: redis.Redis, key: str = "nfz:episodes"):
+        self.redis = client
+        self.key = key
+
+    def load(self) -> dict[EpisodeKey, Episode]:
+        episodes = {}
+        for raw in self.redis.hvals(self.key):
+            data = json.loads(raw)
+            data["started_at"] = datetime.fromisoformat(data["started_at"])
+            episode = Episode(**data)
+            episodes[episode.key] = episode
+        return episodes
+
+    def save(self, episodes: dict[EpisodeKey, Episode], closed: list[EpisodeKey]) -> None:
+        pipe = self.redis.pipeline()
+        if episodes:
+            pipe.hset(self.key, mapping={
+                json.dumps(key): json.dumps(asdict(episode), default=datetime.isoformat)
+                for key, episode in episodes.items()
+            })
+        if closed:
+            pipe.hdel(self.key, *(json.dumps(key) for key in closed))
+        pipe.execute()
+
+
+class IncursionTracker:
+    """
+    Turns per-tick NFZ detections into incursion episodes.
+
+    A drone entering a zone opens an episode, later ticks update its
+    closest approach and latest position, and the episode closes on the
+    first tick the drone is no longer inside that zone (or no longer in the
+    feed). A drone moving from one zone to another closes the first
+    episode and opens one for the new zone.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def observe(self, violators: list[Detection], owns: Owner = None) -> EpisodeChanges:
+        """
+        Compare this tick's violators against the open episodes.
+
+        Args:
+            violators: Drones inside a zone with their distance from its center
+            owns: When processing one shard, limits closing to its own drones
+
+        Returns:
+            EpisodeChanges: Drones entering, and episodes continuing or ending
+        """
+        open_episodes = self.store.load()
+        changes = EpisodeChanges()
+        inside = set()
+        for detection in violators:
+            drone = detection.drone
+            key = (drone.id, detection.zone_id)
+            inside.add(key)
+            episode = open_episodes.get(key)
+            if episode is None:
+                changes.opened.append(detection)
+                continue
+            episode.sample_count += 1
+            episode.min_distance = min(episode.min_distance, detection.distance)
+            episode.x, episode.y, episode.z = drone.x, drone.y, drone.z
+            episode.distance = detection.distance
+            changes.updated.append(episode)
+        changes.closed = [episode for key, episode in open_episodes.items()
+                          if key not in inside and (owns is None or owns(episode.drone_id))]
+        return changes
+
+    def commit(self, changes: EpisodeChanges, violation_ids: list[int | None], now: datetime) -> None:
+        """
+        Persist the episode state once the tick's rows are stored.
+
+        Args:
+            changes: Result of observe for this tick
+            violation_ids: Row ids of the opened episodes (None if rejected)
+            now: Detection time of the tick
+        """
+        episodes = {episode.key: episode for episode in changes.updated}
+        for detection, violation_id in zip(changes.opened, violation_ids):
+            if violation_id is None:
+                continue  # not stored, retried as a new entry next tick
+            drone = detection.drone
+            episodes[(drone.id, detection.zone_id)] = Episode(
+                drone_id=drone.id,
+                zone_id=detection.zone_id,
+                violation_id=violation_id,
+                started_at=now,
+                min_distance=detection.distance,
+                sample_count=1,
+                x=drone.x, y=drone.y, z=drone.z,
+                distance=detection.distance,
+            )
+        self.store.save(episodes, [episode.key for episode in changes.closed])
+
+
+def create_episode_store():
+    """Build the episode store selected by settings.episode_store."""
+    if settings.episode_store == "redis":
+        return RedisEpisodeStore(redis.Redis.from_url(str(settings.redis_url)))
+    return InMemoryEpisodeStore()
+
+
+incursion_tracker = IncursionTracker(create_episode_store())
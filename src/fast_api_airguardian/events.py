@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+
+import redis
+import redis.asyncio as aioredis
+
+from .pii import redact
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+VIOLATIONS_CHANNEL = "nfz:violations"
+DRONES_CHANNEL = "nfz:drones"
+DRONE_DELTAS_CHANNEL = "nfz:drones:delta"
+PREDICTIONS_CHANNEL = "nfz:predictions"
+RECONNECT_DELAY = 2.0
+
+_redis: redis.Redis | None = None
+
+
+# --- Worker side: publish ---
+def get_redis() -> redis.Redis:
+    """Sync Redis client used by the Celery worker to publish events."""
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(str(settings.redis_url))
+    return _redis
+
+
+def publish(channel: str, messages: list[str]) -> None:
+    """
+    Publish messages to a Redis channel in one round trip.
+
+    Publishing is best effort: Redis errors are logged and never fail the tick.
+    """
+    if not messages or not settings.publish_events:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(channel, message)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Failed to publish {len(messages)} events to {channel}: {e}")
+
+
+def publish_violations(rows: list[dict]) -> None:
+    """Publish newly stored violations, one JSON message per violation (owner PII redacted unless PII_REDACT is off)."""
+    if settings.pii_redact:
+        rows = [redact(row) for row in rows]
+    publish(VIOLATIONS_CHANNEL, [json.dumps(row, default=str) for row in rows])
+
+
+def publish_drone_snapshot(raw_drones: list[dict]) -> None:
+    """Publish the latest drone feed as a single message (if enabled)."""
+    if settings.publish_drone_snapshots:
+        publish(DRONES_CHANNEL, [json.dumps(raw_drones)])
+
+
+def publish_feed_delta(delta: dict) -> None:
+    """Publish the added, moved and removed drones of a tick (skipped when nothing changed)."""
+    if any(delta.values()):
+        publish(DRONE_DELTAS_CHANNEL, [json.dumps(delta)])
+
+
+def publish_predictions(predictions: list[dict]) -> None:
+    """Publish predicted incursions, one JSON message per prediction."""
+    publish(PREDICTIONS_CHANNEL, [json.dumps(prediction) for prediction in predictions])
+
+
+# --- API side: fan out ---
+class Broadcaster:
+    """
+    Fans messages of one Redis channel out to in-process subscribers.
+
+    Every subscriber gets its own bounded queue. When a client falls behind
+    and its queue is full, its oldest pending message is dropped so one slow
+    consumer never blocks the others. The Redis subscription only runs while
+    there is at least one subscriber.
+    """
+
+    def __init__(self, channel: str, queue_size: int):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.subscribers: set[asyncio.Queue] = set()
+        self.dropped = 0
+        self._listener: asyncio.Task | None = None
+
+    def add_subscriber(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        return queue
+
+    async def subscribe(self) -> asyncio.Queue:
+        """Register a client and make sure the Redis listener is running."""
+        queue = self.add_subscriber()
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers and self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    def publish_local(self, message: str) -> None:
+        """Deliver a message to every subscriber without ever blocking."""
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()  # drop the oldest message of the slow consumer
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    async def _listen(self) -> None:
+        while True:
+            client = aioredis.Redis.from_url(str(settings.redis_url))
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.publish_local(message["data"].decode())
+            except redis.RedisError as e:
+                logger.warning(f"⚠️ Lost subscription to {self.channel}: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                await client.aclose()
+
+
+violation_events = Broadcaster(VIOLATIONS_CHANNEL, settings.event_queue_size)
+prediction_events = Broadcaster(PREDICTIONS_CHANNEL, settings.event_queue_size)
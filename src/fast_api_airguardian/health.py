@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from .database import async_engine
+from .settings import settings
+from .stats import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+
+def pool_status(pool) -> dict:
+    """Connections of a QueuePool in use and available; empty for pools that do not queue."""
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max": pool.size() + settings.db_max_overflow,
+    }
+
+
+async def check_database(engine=async_engine) -> dict:
+    """Round trip a SELECT 1 through the pool, as a request would."""
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return {"pool": pool_status(engine.pool)}
+
+
+async def check_redis() -> dict:
+    """PING through the shared async Redis client."""
+    client = get_async_redis()
+    await client.ping()
+    pool = client.connection_pool
+    return {"pool": {"max": pool.max_connections}}
+
+
+async def _timed(check, timeout: float) -> dict:
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(check(), timeout)
+    except Exception as e:  # any failure (timeout, refused, auth) means not ready
+        logger.warning(f"⚠️ Readiness check {check.__name__} failed: {e!r}")
+        return {"ok": False, "error": repr(e)}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2), **result}
+
+
+async def readiness(checks=None, timeout: float | None = None) -> tuple[bool, dict]:
+    """
+    Run the dependency checks concurrently, each within its own timeout.
+
+    A saturated pool shows up as a check that times out waiting for a
+    connection, so an overloaded process is taken out of rotation too.
+
+    Args:
+        checks: Mapping of name to check coroutine function (default DB and Redis)
+        timeout: Seconds per check (default settings.health_check_timeout)
+
+    Returns:
+        Whether every check passed, and the result of each check
+    """
+    checks = checks or {"database": check_database, "redis": check_redis}
+    timeout = settings.health_check_timeout if timeout is None else timeout
+    results = await asyncio.gather(*(_timed(check, timeout) for check in checks.values()))
+    report = dict(zip(checks, results))
+    return all(result["ok"] for result in results), report
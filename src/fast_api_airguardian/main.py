@@ -1,45 +1,173 @@
-from fastapi import FastAPI, HTTPException, Header, Depends
-from fast_api_airguardian.settings import settings
+from fastapi import FastAPI, HTTPException, Header, Depends, Query, Request, Response, WebSocket, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from .settings import settings
 import httpx
 from typing import List
-from fast_api_airguardian import schemas
+from . import schemas
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fast_api_airguardian.model import Violation
-from .database import get_async_db, create_tables_sync 
+from datetime import datetime, timedelta
+import base64
+from .database import get_async_db
 import time
-from .model import Violation
-from sqlalchemy.exc import OperationalError
+from .model import DroneTrack
+from . import repository
+from .repository import ViolationRepository, violation_repository
+from .serialization import dumps, projection, violation_dicts, violation_models
+from .pii import index_key, pii_authorized, ssn_digest
+from .snapshot import SnapshotCache
+from .events import Broadcaster, prediction_events, violation_events
+from .metrics import UPSTREAM_FETCH_SECONDS, render_latest, stage
+from .stats import close_async_redis, get_async_redis, read_stats
+from . import health as health_checks
+from .tracks import decode_track
+from .watermark import Watermark, read_violations_watermark
+import asyncio
+import hashlib
+import json
 import logging
+import redis
 
 logger = logging.getLogger(__name__)
 
-NO_FLYING_ZONE = 1000
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10_000
+STREAM_BATCH_SIZE = 1000
+SSE_HEARTBEAT_SECONDS = 15.0
+
+# Drone feed shared by API processes (DRONES_CACHE_STORE=redis)
+SHARED_DRONES_KEY = "nfz:api:drones"
+SHARED_DRONES_LOCK_KEY = "nfz:api:drones:lock"
+SHARED_DRONES_POLL_INTERVAL = 0.05
+SHARED_DRONES_POLLS = 20
+UPSTREAM_TIMEOUT = 10.0
+
+# App-lifetime pooled client for upstream calls, created on first use
+_http_client: httpx.AsyncClient | None = None
 
 app = FastAPI(
     title="Drone Monitoring API",
     description="API for monitoring drones and NFZ violations",
     version="1.0.0"
 )
+if settings.gzip_minimum_size > 0:
+    # Server-Sent Events are never compressed, so they are not buffered
+    app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the pooled upstream and Redis clients"""
+    if _http_client is not None:
+        await _http_client.aclose()
+    await close_async_redis()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the app-lifetime pooled HTTP client."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=UPSTREAM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+            ),
+        )
+    return _http_client
+
+
+async def fetch_drone_feed() -> list[dict]:
+    """Fetch the raw drone positions from upstream."""
+    logger.info(f"📡 Fetching drones from {str(settings.base_url)}")
+    with stage("fetch", UPSTREAM_FETCH_SECONDS):
+        response = await get_http_client().get(str(settings.base_url))
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_shared_drone_feed() -> list[dict]:
+    """
+    Drone feed shared by every API process through Redis.
+
+    The process that takes the lock fetches upstream and stores the feed for
+    DRONES_CACHE_TTL seconds; the others poll briefly for it instead of
+    fetching too, so upstream sees about one request per TTL however many
+    workers run. Without Redis each process fetches on its own.
+    """
+    client = get_async_redis()
+    locked = False
+    try:
+        for _ in range(SHARED_DRONES_POLLS):
+            feed = await client.get(SHARED_DRONES_KEY)
+            if feed is not None:
+                return json.loads(feed)
+            locked = bool(await client.set(SHARED_DRONES_LOCK_KEY, 1, nx=True, px=int(UPSTREAM_TIMEOUT * 1000)))
+            if locked:
+                break
+            await asyncio.sleep(SHARED_DRONES_POLL_INTERVAL)
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Shared drone feed unavailable, fetching directly: {e}")
+        return await fetch_drone_feed()
+    feed = await fetch_drone_feed()
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.set(SHARED_DRONES_KEY, dumps(feed), px=max(int(settings.drones_cache_ttl * 1000), 1))
+        if locked:
+            pipe.delete(SHARED_DRONES_LOCK_KEY)
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Failed to share drone feed: {e}")
+    return feed
 
-@app.on_event("startup")
-def startup_event():
-    """Docker-aware startup with retry logic"""
-    max_retries = 5
-    for attempt in range(max_retries):
-        try:
-            create_tables_sync()
-            logger.info("✅ Database tables ready")
-            break
-        except OperationalError as e:
-            if attempt < max_retries - 1:
-                backoff_time = 2 ** attempt  # Exponential backoff
-                logger.warning(f"⚠️ Database not ready, retrying in {backoff_time}s... (attempt {attempt + 1}/{max_retries})")
-                time.sleep(backoff_time)
-            else:
-                logger.error("❌ Failed to connect to database after multiple attempts")
-                raise
+
+async def fetch_drone_snapshot() -> List[schemas.Drone]:
+    """Fetch and validate the current drone positions, from Redis or upstream per DRONES_CACHE_STORE."""
+    if settings.drones_cache_store == "redis":
+        feed = await fetch_shared_drone_feed()
+    else:
+        feed = await fetch_drone_feed()
+    return [schemas.Drone(**drone) for drone in feed]
+
+
+drone_snapshot = SnapshotCache(
+    fetch_drone_snapshot,
+    ttl=settings.drones_cache_ttl,
+    max_stale=settings.drones_cache_max_stale,
+)
+
+# Short response cache: concurrent /nfz/stats requests share one Redis read
+stats_snapshot = SnapshotCache(read_stats, ttl=settings.stats_cache_ttl, max_stale=0)
+
+# Encoded /drones body of the current snapshot: (snapshot, body, watermark)
+_drones_body: tuple[list, bytes, Watermark] | None = None
+
+
+def drones_body(drones: list[schemas.Drone]) -> tuple[bytes, Watermark]:
+    """
+    Encoded /drones body and its watermark, computed once per snapshot.
+
+    The ETag is a hash of the body, so every API process agrees on it.
+    """
+    global _drones_body
+    if _drones_body is None or _drones_body[0] is not drones:
+        body = dumps([drone.model_dump() for drone in drones])
+        watermark = Watermark(hashlib.blake2b(body, digest_size=16).hexdigest(),
+                              drone_snapshot.refreshed_at or time.time())
+        _drones_body = (drones, body, watermark)
+    return _drones_body[1], _drones_body[2]
+
+
+def cache_headers(watermark: Watermark | None, etag: str | None, cache_control: str) -> dict:
+    """Cache-Control, plus ETag and (once its second is over) Last-Modified when the resource has a watermark."""
+    headers = {"Cache-Control": cache_control}
+    if watermark is not None:
+        headers["ETag"] = etag
+        last_modified = watermark.last_modified()
+        if last_modified is not None:
+            headers["Last-Modified"] = last_modified
+    return headers
 
 
 @app.get("/health")
@@ -53,13 +181,51 @@ def health():
     return {"success": "ok"}
 
 
+@app.get("/health/live")
+async def liveness():
+    """
+    Liveness probe: answers as long as this process's event loop is running.
+
+    Dependencies are not checked, so a database outage does not get every
+    worker restarted.
+    """
+    return JSONResponse({"status": "ok"}, headers={"Cache-Control": "no-store"})
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe: the database and Redis answer through this process's pools.
+
+    Returns:
+        200 with per-dependency latency and pool usage, or 503 naming the
+        failed checks when this process should not receive traffic
+    """
+    ready, checks = await health_checks.readiness()
+    return JSONResponse({"status": "ok" if ready else "unavailable", "checks": checks},
+                        status_code=200 if ready else 503, headers={"Cache-Control": "no-store"})
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus metrics of this process (or of all processes sharing
+    PROMETHEUS_MULTIPROC_DIR).
+    """
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/drones", response_model=List[schemas.Drone])
-async def get_drones():
+async def get_drones(if_none_match: str | None = Header(None), if_modified_since: str | None = Header(None)):
     """
     Get real-time drone positions.
 
-    Fetches current drone data from an external service in real-time.
-    Each call return the most up-to-date positions of all active drones.
+    Serves a snapshot of the external drone feed that is at most
+    DRONES_CACHE_TTL seconds old. Concurrent requests share a single
+    upstream fetch, and a slightly stale snapshot is served while it
+    is being refreshed. The snapshot is encoded once; conditional
+    requests matching its ETag or Last-Modified get 304 Not Modified.
 
     Raises:
         HTTPException 503: Service unavailable
@@ -69,46 +235,345 @@ async def get_drones():
         List[Drone]: Real-time list of all the active drones with current positions
     """
     try:
-        logger.info(f"📡 Fetching drones from {str(settings.base_url)}")
-        async with httpx.AsyncClient() as client:
-            response = await client.get(str(settings.base_url))
-            response.raise_for_status()
-            data = response.json()
-    except Exception as e:
-            logger.error(f"❌ Drone fetch error: {e}")
-            raise HTTPException(status_code=503, detail="Drone data unavailable")
-    try:
-        drones = [schemas.Drone(**drone) for drone in data]
-        return drones
+        drones = await drone_snapshot.get()
     except ValidationError as e:
         logger.error(f"❌ Validation error while parsing drone data: {e}")
         raise HTTPException(status_code=500, detail="Invalid drone data received")
+    except Exception as e:
+        logger.error(f"❌ Drone fetch error: {e}")
+        raise HTTPException(status_code=503, detail="Drone data unavailable")
+
+    body, watermark = drones_body(drones)
+    etag = watermark.etag()
+    headers = cache_headers(watermark, etag, f"public, max-age={int(settings.drones_cache_ttl)}")
+    if watermark.not_modified(etag, if_none_match, if_modified_since):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/drones/{drone_id}/track", response_model=schemas.TrackSchema)
+async def read_drone_track(
+    drone_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    x_secret: str = Header(None),
+    start: datetime | None = Query(None, alias="from"),
+    end: datetime | None = Query(None, alias="to"),
+):
+    """
+    Get the recorded positions of one drone (requires TRACK_RECORDING).
+
+    Only the track segments overlapping the range are read and decoded.
+    Positions still buffered by the worker appear once their segment is
+    flushed (at most TRACK_FLUSH_INTERVAL seconds later).
+
+    Args:
+        from: Start of the range (UTC), default one hour before to
+        to: End of the range (UTC), default now
+
+    Raises:
+        HTTPException 401: Invalid secret key
+        HTTPException 400: Range is empty or longer than TRACK_MAX_QUERY_HOURS
+
+    Returns:
+        TrackSchema: Positions within the range, oldest first
+    """
+    if x_secret != settings.api_secret:
+        raise HTTPException(status_code=401, detail="Invalid secret key")
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=1)
+    if start > end or end - start > timedelta(hours=settings.track_max_query_hours):
+        raise HTTPException(status_code=400, detail="Invalid track range")
+
+    # Segments never span two buckets, which bounds the start_time index range
+    earliest = start - timedelta(seconds=settings.track_bucket_seconds)
+    segments = await db.scalars(
+        select(DroneTrack)
+        .where(DroneTrack.drone_id == drone_id, DroneTrack.start_time.between(earliest, end),
+               DroneTrack.end_time >= start)
+        .order_by(DroneTrack.start_time)
+    )
+    return {"drone_id": drone_id, "start": start, "end": end,
+            "points": decode_track(segments.all(), start, end)}
+
+
+def encode_cursor(timestamp: datetime, violation_id: int) -> str:
+    """Opaque keyset cursor pointing after the given (timestamp, id)."""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{violation_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException 400: Malformed cursor
+    """
+    try:
+        timestamp, violation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(violation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def violations_query(
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    drone_id: str | None = None,
+    min_distance: int | None = None,
+    owner_ssn: str | None = None,
+):
+    """
+    Build the /nfz select ordered by (timestamp, id) for keyset pagination.
+
+    Raises:
+        HTTPException 400: Malformed cursor, or SSN search without a PII key
+    """
+    after = decode_cursor(cursor) if cursor else None
+    owner_ssn_hash = None
+    if owner_ssn:
+        key = index_key()
+        if key is None:
+            raise HTTPException(status_code=400, detail="Owner search requires PII_INDEX_KEY or PII_ENCRYPTION_KEY")
+        owner_ssn_hash = ssn_digest(owner_ssn, key)
+    return repository.violations_query(after, since, until, drone_id, min_distance, owner_ssn_hash)
+
+
+def get_violation_repository() -> ViolationRepository:
+    """Violation repository over the app's async engine."""
+    return violation_repository
+
+
+async def stream_violations_ndjson(repo: ViolationRepository, query, revealed: bool):
+    """Yield violations as NDJSON lines from a server-side cursor."""
+    if settings.nfz_response_mode == "columns":
+        fields = projection(revealed)
+        async for batch in repo.stream_columns(query, STREAM_BATCH_SIZE, fields):
+            yield b"".join(dumps(violation) + b"\n" for violation in violation_dicts(batch, fields))
+        return
+    async for violation in repo.stream(query, STREAM_BATCH_SIZE):
+        yield violation_models([violation], revealed)[0].model_dump_json() + "\n"
 
 
 @app.get("/nfz", response_model=list[schemas.ViolationSchema])
 async def read_violations(
-    db: AsyncSession = Depends(get_async_db),
-    x_secret: str = Header(None)
+    request: Request,
+    response: Response,
+    repo: ViolationRepository = Depends(get_violation_repository),
+    x_secret: str = Header(None),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    drone_id: str | None = None,
+    min_distance: int | None = None,
+    output_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    owner_ssn: str | None = None,
+    x_pii_secret: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
 ):
     """
-    Get all NFZ (No-Fly Zone) violations.
+    Get NFZ (No-Fly Zone) violations, oldest first.
 
     Requires a secret key for API authentication (in header)
-    db: Database connection (automatically handled)
+    repo: Violation repository (automatically handled)
+
+    Results are paginated by (timestamp, id). When more rows are available
+    the X-Next-Cursor response header holds the cursor for the next page.
+    With format=ndjson the matching rows are streamed one JSON object per
+    line in constant memory; limit is then optional. With
+    NFZ_RESPONSE_MODE=columns only the schema's columns are selected and
+    encoded directly (orjson if installed), with the same JSON output.
+
+    Owner SSN and phone are redacted unless PII_REDACT is off or the
+    x-pii-secret header holds PII_SECRET; redacted responses never read or
+    decrypt the PII columns. Searching by owner_ssn needs the PII secret
+    too and uses the keyed SSN hash index.
+
+    Responses carry an ETag and Last-Modified derived from the watermark
+    the worker bumps on every write. A conditional request that matches is
+    answered with 304 Not Modified without querying the database.
+
+    Args:
+        limit: Page size (default 1000, max 10000)
+        cursor: X-Next-Cursor value of the previous page
+        since: Only violations at or after this time
+        until: Only violations before this time
+        drone_id: Only violations of this drone
+        min_distance: Only violations at least this far from the zone center
+        format: "json" (default) or "ndjson"
+        owner_ssn: Only violations of the owner with this SSN
 
     Raises:
+        HTTPException 400: Invalid cursor
         HTTPException 401: Invalid secret key
+        HTTPException 403: Invalid PII secret, or owner search without it
         HTTPException 200: No violations found
 
     Return: 
-        List[ViolationSchema]: All recorded NFZ violation incidents.
+        List[ViolationSchema]: Recorded NFZ violation incidents.
     """
     if x_secret != settings.api_secret:
         raise HTTPException(status_code=401, detail="Invalid secret key")
-        
-    result = await db.execute(select(Violation))
-    violations = result.scalars().all()
+
+    if x_pii_secret is not None and not pii_authorized(x_pii_secret):
+        raise HTTPException(status_code=403, detail="Invalid PII secret")
+    revealed = not settings.pii_redact or x_pii_secret is not None
+    if owner_ssn and not revealed:
+        raise HTTPException(status_code=403, detail="Owner search requires the PII secret")
+
+    query = violations_query(cursor, since, until, drone_id, min_distance, owner_ssn)
+    watermark = await read_violations_watermark()
+    etag = None
+    if watermark is not None:
+        # One ETag per distinct query and projection, whatever the parameter order
+        etag = watermark.etag(f"revealed={revealed}",
+                              *sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    # Stored violations change at most once per beat tick; decrypted PII is never cached
+    cache_control = "private, no-store" if revealed else f"private, max-age={int(settings.tick_min_interval)}"
+    headers = cache_headers(watermark, etag, cache_control)
+    if watermark is not None and watermark.not_modified(etag, if_none_match, if_modified_since):
+        return Response(status_code=304, headers=headers)
+
+    if output_format == "ndjson":
+        if limit:
+            query = query.limit(limit)
+        return StreamingResponse(stream_violations_ndjson(repo, query, revealed), media_type="application/x-ndjson",
+                                 headers=headers)
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    if settings.nfz_response_mode == "columns":
+        # Column tuples encoded directly, without ORM entities or response_model validation
+        fields = projection(revealed)
+        rows = await repo.page_columns(query, page_size, fields)
+        if not rows:
+            raise HTTPException(status_code=200, detail="No NFZ violations found", headers=headers)
+        if len(rows) == page_size:
+            last = rows[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.timestamp, last.id)
+        return Response(content=dumps(violation_dicts(rows, fields)), media_type="application/json", headers=headers)
+
+    violations = await repo.page(query, page_size)
 
     if not violations:
-        raise HTTPException(status_code=200, detail="No NFZ violations found")
-    return violations
\ No newline at end of file
+        raise HTTPException(status_code=200, detail="No NFZ violations found", headers=headers)
+    response.headers.update(headers)
+    if len(violations) == page_size:
+        last = violations[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.timestamp, last.id)
+    return violation_models(violations, revealed)
+
+
+@app.get("/nfz/stats", response_model=schemas.StatsSchema)
+async def read_violation_stats(x_secret: str = Header(None)):
+    """
+    Aggregated NFZ violation statistics.
+
+    Served from counters the worker maintains in Redis as it stores
+    violations, so the cost does not grow with the violations table.
+    Responses are cached for STATS_CACHE_TTL seconds.
+
+    Raises:
+        HTTPException 401: Invalid secret key
+        HTTPException 503: Statistics unavailable
+
+    Returns:
+        StatsSchema: Counts per time window and zone, top drones and
+        owners, and a histogram of distances from the zone center
+    """
+    if x_secret != settings.api_secret:
+        raise HTTPException(status_code=401, detail="Invalid secret key")
+    try:
+        return await stats_snapshot.get()
+    except redis.RedisError as e:
+        logger.error(f"❌ Failed to read violation stats: {e}")
+        raise HTTPException(status_code=503, detail="Statistics unavailable")
+
+
+async def sse_events(broadcaster: Broadcaster, event: str):
+    """Yield a broadcaster's messages as Server-Sent Events, with keep-alive comments."""
+    queue = await broadcaster.subscribe()
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event}\ndata: {message}\n\n"
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+@app.get("/nfz/events")
+async def stream_violation_events(x_secret: str = Header(None)):
+    """
+    Live NFZ violations as Server-Sent Events.
+
+    Every violation stored by the worker is pushed as a "violation" event
+    whose data is the violation as JSON. Clients that fall behind lose
+    their oldest pending events instead of slowing down other clients.
+
+    Raises:
+        HTTPException 401: Invalid secret key
+    """
+    if x_secret != settings.api_secret:
+        raise HTTPException(status_code=401, detail="Invalid secret key")
+    return StreamingResponse(sse_events(violation_events, "violation"), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/nfz/predictions/events")
+async def stream_prediction_events(x_secret: str = Header(None)):
+    """
+    Predicted NFZ incursions as Server-Sent Events (requires PREDICTION_ENABLED).
+
+    Each "prediction" event carries the drone, the zone, the estimated
+    seconds until it enters and its position and velocity, giving
+    operators lead time before the violation happens.
+
+    Raises:
+        HTTPException 401: Invalid secret key
+    """
+    if x_secret != settings.api_secret:
+        raise HTTPException(status_code=401, detail="Invalid secret key")
+    return StreamingResponse(sse_events(prediction_events, "prediction"), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+@app.websocket("/ws/violations")
+async def violations_websocket(websocket: WebSocket):
+    """
+    Live NFZ violations over WebSocket, one JSON text message per violation.
+
+    The secret key is read from the x-secret header or, for browser
+    clients that cannot set headers, from the "secret" query parameter.
+    Messages from the client are read (and ignored) alongside the sender,
+    so a disconnect ends the subscription right away rather than on the
+    next failed send.
+    """
+    secret = websocket.headers.get("x-secret") or websocket.query_params.get("secret")
+    if secret != settings.api_secret:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    queue = await violation_events.subscribe()
+
+    async def forward():
+        while True:
+            await websocket.send_text(await queue.get())
+
+    async def until_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    jobs = [asyncio.create_task(forward()), asyncio.create_task(until_disconnect())]
+    try:
+        done, _ = await asyncio.wait(jobs, return_when=asyncio.FIRST_COMPLETED)
+        for job in done:
+            job.exception()  # e.g. WebSocketDisconnect from a send: the client is gone either way
+    finally:
+        violation_events.unsubscribe(queue)
+        for job in jobs:
+            job.cancel()
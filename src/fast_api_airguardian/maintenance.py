@@ -0,0 +1,261 @@
+import logging
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .celery import celery_app
+from .database import get_db_session
+from .metrics import PARTITION_FAILURES
+from .model import DroneHourlyRollup, DroneTrack, Violation, ZoneHourlyRollup
+from .settings import settings
+from .watermark import bump_violations_version
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = Violation.__tablename__
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+# --- Partitions (PostgreSQL) ---
+def period_start(moment: datetime) -> datetime:
+    """Start of the partition period (day, or ISO week starting Monday) containing moment."""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if settings.partition_interval == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def next_period(start: datetime) -> datetime:
+    """First period boundary strictly after start."""
+    step = timedelta(weeks=1) if settings.partition_interval == "week" else timedelta(days=1)
+    return period_start(start) + step
+
+
+def is_partitioned(db: Session) -> bool:
+    """True when violations is a native partitioned table (it is not on SQLite/before the migration)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = db.execute(text("SELECT relkind FROM pg_class WHERE relname = :name"),
+                         {"name": PARENT_TABLE}).scalar()
+    return relkind == "p"
+
+
+def list_partitions(db: Session) -> list[tuple[str, datetime | None]]:
+    """
+    Partitions of violations with their exclusive upper bound.
+
+    Returns:
+        list: (name, upper bound) pairs, upper bound None for the default partition
+    """
+    rows = db.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT_TABLE}).all()
+    partitions = []
+    for name, bound in rows:
+        match = _UPPER_BOUND.search(bound or "")
+        partitions.append((name, datetime.fromisoformat(match.group(1)) if match else None))
+    return partitions
+
+
+def create_partition(db: Session, name: str, start: datetime, end: datetime) -> int:
+    """
+    Create the partition of [start, end), taking over its rows from the default partition.
+
+    PostgreSQL refuses a new partition whose range already has rows in the
+    default partition (written while maintenance was not running), so those
+    are moved into a standalone table that is then attached.
+
+    Returns:
+        int: Rows moved out of the default partition
+    """
+    bounds = f"FROM ('{start.isoformat(sep=' ')}') TO ('{end.isoformat(sep=' ')}')"
+    in_range = "timestamp >= :start AND timestamp < :end"
+    params = {"start": start, "end": end}
+    stray = db.execute(text(f'SELECT count(*) FROM "{DEFAULT_PARTITION}" WHERE {in_range}'), params).scalar()
+    if not stray:
+        db.execute(text(f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} FOR VALUES {bounds}'))
+        return 0
+    db.execute(text(f'CREATE TABLE "{name}" (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    db.execute(text(
+        f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE {in_range} RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved'
+    ), params)
+    db.execute(text(f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION "{name}" FOR VALUES {bounds}'))
+    return stray
+
+
+def ensure_partitions(db: Session, now: datetime) -> tuple[list[str], list[str]]:
+    """
+    Create partitions up to settings.partitions_ahead periods past now.
+
+    New partitions always start where the latest existing one ends, so
+    switching between daily and weekly partitions never creates overlaps,
+    and periods missed while maintenance was down are created too (their
+    rows are moved out of the default partition). A partition that cannot
+    be created is counted in nfz_partition_failures_total and skipped; its
+    rows stay in the default partition.
+
+    Returns:
+        tuple: Names of the created partitions, and of those that failed
+    """
+    bounds = [upper for _, upper in list_partitions(db) if upper is not None]
+    cursor = max(bounds) if bounds else period_start(now)
+    horizon = period_start(now)
+    for _ in range(settings.partitions_ahead + 1):
+        horizon = next_period(horizon)
+
+    created, failed = [], []
+    while cursor < horizon:
+        end = next_period(cursor)
+        name = f"{PARENT_TABLE}_p{cursor:%Y%m%d}"
+        try:
+            with db.begin_nested():
+                moved = create_partition(db, name, cursor, end)
+            if moved:
+                logger.warning(f"⚠️ Moved {moved} rows from {DEFAULT_PARTITION} into {name}")
+            created.append(name)
+        except SQLAlchemyError as e:
+            PARTITION_FAILURES.inc()
+            logger.error(f"🚨 Could not create partition {name}, its rows stay in {DEFAULT_PARTITION}: {e}")
+            failed.append(name)
+        cursor = end
+    return created, failed
+
+
+def drop_expired_partitions(db: Session, cutoff: datetime) -> list[str]:
+    """
+    Drop every partition whose whole range is older than cutoff.
+
+    Rows that ended up in the default partition are deleted row by row.
+
+    Returns:
+        list[str]: Names of the dropped partitions
+    """
+    dropped = []
+    for name, upper in list_partitions(db):
+        if upper is not None and upper <= cutoff:
+            db.execute(text(f'DROP TABLE "{name}"'))
+            dropped.append(name)
+    db.execute(text(f'DELETE FROM "{DEFAULT_PARTITION}" WHERE timestamp < :cutoff'), {"cutoff": cutoff})
+    return dropped
+
+
+# --- Hourly rollups ---
+def _hour(column, dialect: str):
+    if dialect == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00.000000", column)
+
+
+def refresh_rollups(db: Session, since: datetime) -> int:
+    """
+    Recompute the hourly rollups of every hour from since onwards.
+
+    The affected hours are deleted and aggregated again from the raw rows
+    in the same transaction, so reruns are idempotent and late episode
+    updates are picked up. Older rollups are kept after their raw rows
+    have been dropped by retention.
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    dialect = db.get_bind().dialect.name
+    bucket = _hour(Violation.timestamp, dialect).label("bucket")
+    recent = Violation.timestamp >= since
+    written = 0
+
+    db.execute(delete(DroneHourlyRollup).where(DroneHourlyRollup.bucket >= since))
+    written += db.execute(insert(DroneHourlyRollup).from_select(
+        ["bucket", "drone_id", "violations", "closest_distance"],
+        select(bucket, Violation.drone_id, func.count(), func.min(Violation.distance_from_center))
+        .where(recent).group_by(bucket, Violation.drone_id),
+    )).rowcount
+
+    db.execute(delete(ZoneHourlyRollup).where(ZoneHourlyRollup.bucket >= since))
+    written += db.execute(insert(ZoneHourlyRollup).from_select(
+        ["bucket", "zone_id", "violations", "drones", "closest_distance"],
+        select(bucket, Violation.zone_id, func.count(), func.count(Violation.drone_id.distinct()),
+               func.min(Violation.distance_from_center))
+        .where(recent).group_by(bucket, Violation.zone_id),
+    )).rowcount
+    return written
+
+
+def run_maintenance(now: datetime | None = None) -> dict:
+    """
+    Create upcoming partitions, apply retention and refresh the rollups.
+
+    On a partitioned PostgreSQL table retention drops whole partitions;
+    otherwise (SQLite, or before the partitioning migration) it falls back
+    to deleting expired rows. Drone track segments older than
+    settings.track_retention_days are deleted as well.
+
+    Returns:
+        dict: Created, failed and dropped partitions, deleted rows and track segments,
+        and rollup rows written
+    """
+    now = now or datetime.utcnow()
+    result = {"created_partitions": [], "failed_partitions": [], "dropped_partitions": [], "deleted_rows": 0,
+              "deleted_track_segments": 0}
+    db = get_db_session()
+    try:
+        rollups_since = (now - timedelta(hours=settings.rollup_lookback_hours)).replace(
+            minute=0, second=0, microsecond=0)
+        result["rollup_rows"] = refresh_rollups(db, rollups_since)
+
+        partitioned = is_partitioned(db)
+        if partitioned:
+            result["created_partitions"], result["failed_partitions"] = ensure_partitions(db, now)
+        if settings.violation_retention_days > 0:
+            cutoff = now - timedelta(days=settings.violation_retention_days)
+            if partitioned:
+                result["dropped_partitions"] = drop_expired_partitions(db, cutoff)
+            else:
+                result["deleted_rows"] = db.execute(
+                    delete(Violation).where(Violation.timestamp < cutoff)).rowcount
+        if settings.track_retention_days > 0:
+            track_cutoff = now - timedelta(days=settings.track_retention_days)
+            result["deleted_track_segments"] = db.execute(
+                delete(DroneTrack).where(DroneTrack.end_time < track_cutoff)).rowcount
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Violations maintenance failed: {e}")
+        raise
+    finally:
+        db.close()
+    if result["deleted_rows"] or result["dropped_partitions"]:
+        bump_violations_version()
+    logger.info(f"✅ Violations maintenance: {result}")
+    return result
+
+
+@celery_app.task(name="nfz-violation-maintenance")
+def violation_maintenance_task():
+    """
+    Celery task for partition management, retention and hourly rollups.
+
+    Returns:
+        dict: Task execution result with:
+            - success: Boolean indicating task completion status
+            - created_partitions / failed_partitions / dropped_partitions: Partition names
+            - deleted_rows: Rows deleted by retention on unpartitioned tables
+            - deleted_track_segments: Expired drone track segments
+            - rollup_rows: Rollup rows written
+            - timestamp: UTC timestamp of task completion
+            - error: Error message if task failed
+    """
+    try:
+        result = run_maintenance()
+        return {"success": True, **result, "timestamp": datetime.utcnow().isoformat()}
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }
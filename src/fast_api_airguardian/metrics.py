@@ -0,0 +1,137 @@
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+from .settings import settings
+
+try:  # OpenTelemetry is optional; spans are only emitted when it is installed
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+# Upstream calls take tens of milliseconds to seconds (with retries)
+UPSTREAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# In-process stages over a whole feed
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+UPSTREAM_FETCH_SECONDS = Histogram(
+    "nfz_upstream_fetch_seconds", "Drone feed fetch latency, including retries",
+    buckets=UPSTREAM_BUCKETS,
+)
+VALIDATION_SECONDS = Histogram(
+    "nfz_validation_seconds", "Time spent validating the drone feed", buckets=STAGE_BUCKETS,
+)
+CLASSIFICATION_SECONDS = Histogram(
+    "nfz_classification_seconds", "Time spent finding drones inside No-Fly Zones",
+    buckets=STAGE_BUCKETS,
+)
+OWNER_LOOKUP_SECONDS = Histogram(
+    "nfz_owner_lookup_seconds", "Latency of a single owner lookup that missed the cache",
+    buckets=UPSTREAM_BUCKETS,
+)
+DB_WRITE_SECONDS = Histogram(
+    "nfz_db_write_seconds", "Latency of violation writes", ["operation"], buckets=STAGE_BUCKETS,
+)
+TICK_SECONDS = Histogram(
+    "nfz_tick_seconds", "Duration of a whole detection tick", buckets=UPSTREAM_BUCKETS,
+)
+UPSTREAM_RETRIES = Counter(
+    "nfz_upstream_retries_total", "Failed upstream attempts that were retried", ["upstream"],
+)
+UPSTREAM_FAILURES = Counter(
+    "nfz_upstream_failures_total", "Upstream calls that failed after every retry", ["upstream"],
+)
+UPSTREAM_SHORT_CIRCUITS = Counter(
+    "nfz_upstream_short_circuits_total", "Upstream calls skipped because the circuit was open", ["upstream"],
+)
+BREAKER_OPEN = Gauge(
+    "nfz_circuit_open", "1 while the upstream's circuit breaker is open", ["upstream"],
+    multiprocess_mode="mostrecent",
+)
+DRONES_SEEN = Counter("nfz_drones_seen_total", "Drones received from the drone feed")
+DRONES_INVALID = Counter("nfz_drones_invalid_total", "Drones rejected by validation")
+DRONES_CHANGED = Counter(
+    "nfz_drones_changed_total", "Feed changes seen by incremental processing", ["kind"],
+)
+VIOLATIONS = Counter("nfz_violations_total", "Drones detected inside a No-Fly Zone", ["zone"])
+PREDICTION_SECONDS = Histogram(
+    "nfz_prediction_seconds", "Time spent predicting incursions over a feed", buckets=STAGE_BUCKETS,
+)
+PREDICTED_INCURSIONS = Counter(
+    "nfz_predicted_incursions_total", "Drones predicted to enter a No-Fly Zone", ["zone"],
+)
+TICK_LAG_SECONDS = Gauge(
+    "nfz_tick_lag_seconds", "Delay between beat publishing a tick and a worker starting it",
+    multiprocess_mode="mostrecent",
+)
+TICKS_SKIPPED = Counter(
+    "nfz_ticks_skipped_total", "Beat ticks skipped by the overlap guard", ["reason"],
+)
+PARTITION_FAILURES = Counter(
+    "nfz_partition_failures_total", "Violation partitions the maintenance task failed to create",
+)
+TICK_INTERVAL_SECONDS = Gauge(
+    "nfz_tick_interval_seconds", "Adaptive interval until the next detection tick",
+    multiprocess_mode="mostrecent",
+)
+
+_tracer = trace.get_tracer(__name__) if trace is not None and settings.otel_enabled else None
+
+
+@contextmanager
+def stage(name: str, histogram: Histogram | None = None):
+    """
+    Time one pipeline stage into a histogram, inside an OTel span if enabled.
+
+    Args:
+        name: Stage name, used for the span ("nfz.<name>")
+        histogram: Histogram (or labelled child) observing the duration
+    """
+    span = _tracer.start_as_current_span(f"nfz.{name}") if _tracer else nullcontext()
+    start = time.perf_counter()
+    with span:
+        try:
+            yield
+        finally:
+            if histogram is not None:
+                histogram.observe(time.perf_counter() - start)
+
+
+def registry() -> CollectorRegistry:
+    """
+    Registry to export from this process.
+
+    With PROMETHEUS_MULTIPROC_DIR set (Celery prefork, several API
+    workers) the values written by every process are aggregated.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        from prometheus_client import REGISTRY
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry)
+    return collector_registry
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve /metrics over HTTP from a background thread (used by the worker)."""
+    start_http_server(port, registry=registry())
+    logger.info(f"📈 Metrics server listening on :{port}")
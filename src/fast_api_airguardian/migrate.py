@@ -0,0 +1,100 @@
+import logging
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+from .database import sync_engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+# pg_advisory_xact_lock key shared by every process that migrates this database
+MIGRATION_LOCK_KEY = 0x6E667A_6D6967  # "nfz" "mig"
+MAX_ATTEMPTS = 5
+
+# The first revision alters tables made by the pre-Alembic startup create_all;
+# this is that schema, which already has the revision's NOT NULL constraints
+BASELINE_REVISION = "3c95c9a2afd0"
+BASELINE = MetaData()
+Table(
+    "violations", BASELINE,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("drone_id", String, index=True, nullable=False),
+    Column("timestamp", DateTime, index=True, nullable=False),
+    Column("position_x", Integer, nullable=False),
+    Column("position_y", Integer, nullable=False),
+    Column("position_z", Integer, nullable=False),
+    Column("distance_from_center", Integer, nullable=False),
+    Column("owner_first_name", String, nullable=False),
+    Column("owner_last_name", String, nullable=False),
+    Column("owner_ssn", String, nullable=False),
+    Column("owner_phone", String, nullable=False),
+)
+
+
+def alembic_config(connection: Connection) -> Config:
+    """Alembic config running on an already open connection (see migrations/env.py)."""
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    return config
+
+
+def run_migrations(engine=sync_engine) -> str:
+    """
+    Bring the schema to the latest Alembic revision, once per database.
+
+    Runs in a single transaction holding a PostgreSQL advisory lock, so when
+    several containers or processes start together one migrates and the
+    others wait, then find nothing left to do. A database without an
+    alembic_version table is stamped at the baseline revision and upgraded,
+    so every later revision (partitioning included) runs on it: an empty
+    one gets the baseline tables first, one created by the old startup
+    create_all already has them.
+
+    Returns:
+        "created", "adopted" or "upgraded"
+    """
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        config = alembic_config(connection)
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" in tables:
+            result = "upgraded"
+        elif "violations" in tables:
+            logger.warning(f"⚠️ Tables exist without an Alembic revision, upgrading them from {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
+            result = "adopted"
+        else:
+            BASELINE.create_all(connection)
+            command.stamp(config, BASELINE_REVISION)
+            result = "created"
+        command.upgrade(config, "head")
+        return result
+
+
+def main() -> None:
+    """Run the migrations, waiting for the database to accept connections."""
+    logging.basicConfig(level=logging.INFO)
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            result = run_migrations()
+            logger.info(f"✅ Database schema {result}")
+            return
+        except OperationalError as e:
+            if attempt == MAX_ATTEMPTS - 1:
+                logger.error("❌ Failed to connect to database after multiple attempts")
+                raise
+            backoff_time = 2 ** attempt  # Exponential backoff
+            logger.warning(f"⚠️ Database not ready, retrying in {backoff_time}s... "
+                           f"(attempt {attempt + 1}/{MAX_ATTEMPTS}): {e}")
+            time.sleep(backoff_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,27 @@
 # fast_api_airguardian/model.py
 
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, Index, LargeBinary
+from sqlalchemy import text
 from sqlalchemy.orm import declarative_base as sync_declarative_base
 from sqlalchemy.ext.declarative import declarative_base as async_declarative_base
 
 from .database import Base 
 
 class Violation(Base):  # ✅ SINGLE model for both Celery and FastAPI
+    # On PostgreSQL the migrations turn this into a table partitioned by
+    # RANGE (timestamp) with primary key (id, timestamp); id alone stays
+    # unique (one sequence), so the ORM keeps it as the identity.
     __tablename__ = "violations"
+    __table_args__ = (
+        # Keyset pagination of /nfz orders by (timestamp, id)
+        Index("ix_violations_timestamp_id", "timestamp", "id"),
+        Index("ix_violations_owner_pending", "owner_id", postgresql_where=text("owner_pending"),
+              sqlite_where=text("owner_pending")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     drone_id                = Column(String, index=True, nullable=False)
+    zone_id                 = Column(String, index=True, nullable=False, default="default", server_default="default")
     timestamp               = Column(DateTime, index=True, nullable=False)
     position_x              = Column(Integer, nullable=False)
     position_y              = Column(Integer, nullable=False)
@@ -19,4 +30,58 @@ class Violation(Base):  # ✅ SINGLE model for both Celery and FastAPI
     owner_first_name        = Column(String, nullable=False)
     owner_last_name         = Column(String, nullable=False)
     owner_ssn               = Column(String, nullable=False)
-    owner_phone             = Column(String, nullable=False)
\ No newline at end of file
+    owner_phone             = Column(String, nullable=False)
+    # Owner PII encrypted at rest (owner_ssn/owner_phone are then empty) and
+    # the keyed SSN hash used to search by owner; see pii.py
+    owner_ssn_enc           = Column(LargeBinary, nullable=True)
+    owner_phone_enc         = Column(LargeBinary, nullable=True)
+    owner_ssn_hash          = Column(String(64), index=True, nullable=True)
+    # Owner lookup failed (user API down); filled in by the owner backfill task
+    owner_id                = Column(Integer, nullable=True)
+    owner_pending           = Column(Boolean, nullable=False, default=False, server_default="false")
+    # Incursion episode (set when episode tracking is enabled)
+    episode_start           = Column(DateTime, nullable=True)
+    episode_end             = Column(DateTime, nullable=True)
+    min_distance            = Column(Integer, nullable=True)
+    sample_count            = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+class DroneHourlyRollup(Base):
+    """Violations per drone and hour, kept after raw rows expire."""
+    __tablename__ = "violation_rollups_drone_hourly"
+
+    bucket                  = Column(DateTime, primary_key=True)
+    drone_id                = Column(String, primary_key=True)
+    violations              = Column(Integer, nullable=False)
+    closest_distance        = Column(Integer, nullable=False)
+
+
+class ZoneHourlyRollup(Base):
+    """Violations and distinct drones per zone and hour, kept after raw rows expire."""
+    __tablename__ = "violation_rollups_zone_hourly"
+
+    bucket                  = Column(DateTime, primary_key=True)
+    zone_id                 = Column(String, primary_key=True)
+    violations              = Column(Integer, nullable=False)
+    drones                  = Column(Integer, nullable=False)
+    closest_distance        = Column(Integer, nullable=False)
+
+
+class DroneTrack(Base):
+    """
+    A segment of one drone's recorded positions.
+
+    Samples are delta-encoded and compressed in data (see tracks.py); a
+    segment never spans two track buckets.
+    """
+    __tablename__ = "drone_tracks"
+    __table_args__ = (
+        Index("ix_drone_tracks_drone_id_start_time", "drone_id", "start_time"),
+    )
+
+    id                      = Column(Integer, primary_key=True, autoincrement=True)
+    drone_id                = Column(String, nullable=False)
+    start_time              = Column(DateTime, nullable=False)
+    end_time                = Column(DateTime, index=True, nullable=False)
+    sample_count            = Column(Integer, nullable=False)
+    data                    = Column(LargeBinary, nullable=False)
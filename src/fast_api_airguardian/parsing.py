@@ -0,0 +1,133 @@
+import logging
+import time
+from collections import Counter
+from operator import itemgetter
+
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict  # pydantic needs it on Python < 3.12
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_REASONS_LOGGED = 5
+
+
+class DroneFields(TypedDict):
+    """Same fields and types as schemas.Drone, validated without building models."""
+    id: str
+    owner_id: int
+    x: int
+    y: int
+    z: int
+
+
+class DroneRecord:
+    """Compact validated drone, attribute-compatible with schemas.Drone."""
+    __slots__ = ("id", "owner_id", "x", "y", "z")
+
+    def __init__(self, id: str, owner_id: int, x: int, y: int, z: int):
+        self.id = id
+        self.owner_id = owner_id
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def model_dump(self) -> dict:
+        return {"id": self.id, "owner_id": self.owner_id, "x": self.x, "y": self.y, "z": self.z}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DroneRecord) and self.model_dump() == other.model_dump()
+
+    def __repr__(self) -> str:
+        return f"DroneRecord(id={self.id!r}, owner_id={self.owner_id}, x={self.x}, y={self.y}, z={self.z})"
+
+
+_feed_adapter = TypeAdapter(list[DroneFields])
+_fields = itemgetter("id", "owner_id", "x", "y", "z")
+
+
+class RejectionReport:
+    """
+    Aggregates rejected feed rows into one log line per interval.
+
+    Instead of one error per bad row, rejections are counted by field and
+    error type and logged as a summary at most every interval seconds.
+    """
+
+    def __init__(self, interval: float, clock=time.monotonic):
+        self.interval = interval
+        self._clock = clock
+        self._last_logged: float | None = None
+        self.rows = 0
+        self.rejected = 0
+        self.reasons: Counter[str] = Counter()
+        self.example: str | None = None
+
+    def record(self, rows: int, rejected: dict[int, list[dict]], raw_drones: list) -> None:
+        """Account for one parsed feed and log a summary if one is due."""
+        self.rows += rows
+        self.rejected += len(rejected)
+        for index, errors in rejected.items():
+            for error in errors:
+                field = ".".join(str(part) for part in error["loc"][1:]) or "row"
+                self.reasons[f"{field}: {error['type']}"] += 1
+            if self.example is None:
+                row = raw_drones[index]
+                self.example = str(row.get("id", "unknown")) if isinstance(row, dict) else repr(row)[:50]
+        if self.rejected:
+            self.flush()
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        Log and reset the accumulated rejections.
+
+        Returns:
+            bool: True if a summary was logged
+        """
+        now = self._clock()
+        if not force and self._last_logged is not None and now - self._last_logged < self.interval:
+            return False
+        if self.rejected:
+            reasons = ", ".join(f"{reason} ×{count}" for reason, count in self.reasons.most_common(MAX_REASONS_LOGGED))
+            logger.error(f"❌ Rejected {self.rejected}/{self.rows} drones ({reasons}; e.g. drone {self.example})")
+        self._last_logged = now
+        self.rows = 0
+        self.rejected = 0
+        self.reasons.clear()
+        self.example = None
+        return True
+
+
+rejection_report = RejectionReport(settings.validation_error_log_interval)
+
+
+def parse_drones(raw_drones: list) -> list[DroneRecord | None]:
+    """
+    Validate the whole feed in one pydantic-core call.
+
+    Accepts and rejects exactly the rows schemas.Drone would, but validates
+    into plain dicts and builds slotted records instead of one model per
+    row. Bad rows are reported through rejection_report.
+
+    Args:
+        raw_drones: Drone dicts as returned by the drone feed
+
+    Returns:
+        list[DroneRecord | None]: Records aligned with raw_drones, None for rejected rows
+    """
+    rejected: dict[int, list[dict]] = {}
+    try:
+        valid = _feed_adapter.validate_python(raw_drones)
+        keep = range(len(raw_drones))
+    except ValidationError as e:
+        for error in e.errors(include_url=False, include_input=False):
+            rejected.setdefault(error["loc"][0], []).append(error)
+        keep = [index for index in range(len(raw_drones)) if index not in rejected]
+        valid = _feed_adapter.validate_python([raw_drones[index] for index in keep])
+
+    records: list[DroneRecord | None] = [None] * len(raw_drones)
+    for index, row in zip(keep, valid):
+        records[index] = DroneRecord(*_fields(row))
+    rejection_report.record(len(raw_drones), rejected, raw_drones)
+    return records
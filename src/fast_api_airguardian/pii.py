@@ -0,0 +1,196 @@
+import base64
+import hashlib
+import hmac
+import os
+from functools import lru_cache
+
+from .settings import settings
+
+try:  # the "pii" extra; only needed when PII_ENCRYPTION_KEY is set
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = InvalidTag = None
+
+PII_FIELDS = ("owner_ssn", "owner_phone")
+ENCRYPTED_FIELDS = tuple(f"{field}_enc" for field in PII_FIELDS)
+REDACTED = "[redacted]"
+
+_VERSION = b"\x01"
+_NONCE_SIZE = 12
+
+
+class PiiCipher:
+    """
+    AES-256-GCM for the owner PII columns, applied to a whole batch at once.
+
+    Tokens are a version byte, a random 96-bit nonce and the ciphertext with
+    its tag. The column name is the associated data, so a token copied into
+    another column does not decrypt. Nonces for a batch come from one
+    os.urandom call; the per-value work is a single call into OpenSSL.
+    """
+
+    def __init__(self, key: bytes):
+        if AESGCM is None:
+            raise RuntimeError("PII encryption requires the cryptography package")
+        self._aead = AESGCM(key)
+
+    def encrypt_many(self, values: list[str], field: str) -> list[bytes | None]:
+        """Encrypt values of one column; empty values stay None."""
+        nonces = os.urandom(_NONCE_SIZE * len(values))
+        aad = field.encode()
+        encrypt = self._aead.encrypt
+        tokens = []
+        for n, value in enumerate(values):
+            if not value:
+                tokens.append(None)
+                continue
+            nonce = nonces[n * _NONCE_SIZE:(n + 1) * _NONCE_SIZE]
+            tokens.append(_VERSION + nonce + encrypt(nonce, value.encode(), aad))
+        return tokens
+
+    def decrypt_many(self, tokens: list[bytes], field: str) -> list[str]:
+        """
+        Decrypt tokens of one column.
+
+        Raises:
+            cryptography.exceptions.InvalidTag: A token was tampered with or
+            encrypted with another key or for another column
+        """
+        aad = field.encode()
+        decrypt = self._aead.decrypt
+        return [decrypt(token[1:1 + _NONCE_SIZE], token[1 + _NONCE_SIZE:], aad).decode() for token in tokens]
+
+
+def _decode_key(value: str) -> bytes:
+    key = base64.urlsafe_b64decode(value)
+    if len(key) != 32:
+        raise ValueError("PII keys must be 32 bytes, base64-encoded")
+    return key
+
+
+@lru_cache(maxsize=4)
+def _cipher(key: str) -> PiiCipher:
+    return PiiCipher(_decode_key(key))
+
+
+def get_cipher() -> PiiCipher | None:
+    """Cipher for settings.pii_encryption_key, None when encryption is off."""
+    if not settings.pii_encryption_key:
+        return None
+    return _cipher(settings.pii_encryption_key)
+
+
+def index_key() -> bytes | None:
+    """HMAC key of the SSN lookup hash, None when neither PII key is set."""
+    if settings.pii_index_key:
+        return _decode_key(settings.pii_index_key)
+    if settings.pii_encryption_key:
+        return hmac.digest(_decode_key(settings.pii_encryption_key), b"owner_ssn_hash", "sha256")
+    return None
+
+
+def ssn_digest(ssn: str, key: bytes) -> str:
+    """Keyed hash of a normalized SSN, stored in owner_ssn_hash and used to search by owner."""
+    return hmac.new(key, ssn.strip().upper().encode(), hashlib.sha256).hexdigest()
+
+
+def pii_authorized(secret: str | None) -> bool:
+    """Whether a request's x-pii-secret unlocks decrypted PII."""
+    return bool(settings.pii_secret) and secret is not None and hmac.compare_digest(secret, settings.pii_secret)
+
+
+# --- Write side ---
+def protect_rows(rows: list[dict]) -> list[dict]:
+    """
+    Copies of violation rows ready to store: SSN hashed and PII encrypted.
+
+    Each column is encrypted in one batch for all rows. With encryption on
+    the plaintext columns are stored empty. Rows are returned unchanged when
+    no PII key is configured.
+
+    Args:
+        rows: Column mappings holding owner_ssn and owner_phone
+    """
+    key, cipher = index_key(), get_cipher()
+    if not rows or (key is None and cipher is None):
+        return rows
+    rows = [dict(row) for row in rows]
+    if key is not None:
+        for row in rows:
+            row["owner_ssn_hash"] = ssn_digest(row["owner_ssn"], key) if row["owner_ssn"] else None
+    if cipher is not None:
+        for field, encrypted in zip(PII_FIELDS, ENCRYPTED_FIELDS):
+            tokens = cipher.encrypt_many([row[field] for row in rows], field)
+            for row, token in zip(rows, tokens):
+                row[encrypted] = token
+                row[field] = ""
+    return rows
+
+
+# --- Read side ---
+def reveal(violations: list[dict]) -> None:
+    """
+    Decrypt the PII of a page of violations in place, one batch per column.
+
+    Rows stored before encryption was enabled keep their plaintext values.
+    The *_enc entries are removed.
+
+    Raises:
+        RuntimeError: Encrypted rows but no PII_ENCRYPTION_KEY configured
+    """
+    for field, encrypted in zip(PII_FIELDS, ENCRYPTED_FIELDS):
+        tokens = [violation.pop(encrypted, None) for violation in violations]
+        positions = [n for n, token in enumerate(tokens) if token is not None]
+        if not positions:
+            continue
+        cipher = get_cipher()
+        if cipher is None:
+            raise RuntimeError("Encrypted PII found but PII_ENCRYPTION_KEY is not set")
+        for n, value in zip(positions, cipher.decrypt_many([tokens[n] for n in positions], field)):
+            violations[n][field] = value
+
+
+def seal(data: str, field: str) -> bytes:
+    """
+    Bytes to keep PII outside the violations table (e.g. in Redis).
+
+    Encrypted for field when PII_ENCRYPTION_KEY is set, plain UTF-8 otherwise,
+    so cached copies rest no less protected than the stored columns.
+    """
+    cipher = get_cipher()
+    if cipher is None:
+        return data.encode()
+    return cipher.encrypt_many([data], field)[0]
+
+
+def unseal(blob: bytes, field: str) -> str | None:
+    """
+    Inverse of seal.
+
+    Returns:
+        str: The data
+        None: blob was sealed with encryption switched the other way or
+        under another key; callers treat it as absent
+    """
+    cipher = get_cipher()
+    encrypted = blob[:1] == _VERSION
+    if cipher is None:
+        return None if encrypted else blob.decode()
+    if not encrypted:
+        return None
+    try:
+        return cipher.decrypt_many([blob], field)[0]
+    except InvalidTag:
+        return None
+
+
+def redact(violation: dict) -> dict:
+    """Copy of a violation message without owner PII, as published to live subscribers."""
+    redacted = {key: value for key, value in violation.items()
+                if key not in ENCRYPTED_FIELDS and key != "owner_ssn_hash"}
+    if "owner_ssn" in redacted:
+        redacted["owner_ssn"] = REDACTED
+    if "owner_phone" in redacted:
+        redacted["owner_phone"] = None
+    return redacted
@@ -0,0 +1,189 @@
+import json
+import logging
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import redis
+
+from .classify import feed_to_arrays
+from .settings import settings
+from .zones import ZoneIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PredictedIncursion:
+    """A drone expected to enter a zone within the prediction horizon."""
+    drone_id: str
+    zone_id: str
+    seconds_to_entry: float
+    x: float
+    y: float
+    z: float
+    vx: float
+    vy: float
+
+    def to_message(self) -> dict:
+        return {"drone_id": self.drone_id, "zone_id": self.zone_id,
+                "seconds_to_entry": round(self.seconds_to_entry, 1),
+                "x": self.x, "y": self.y, "z": self.z,
+                "vx": round(self.vx, 2), "vy": round(self.vy, 2)}
+
+
+class PositionHistory:
+    """
+    Last position, time and active predictions of every drone seen by this process.
+
+    Positions are kept as arrays sorted by drone id, so a whole feed is
+    matched against the previous positions with one searchsorted call.
+    """
+
+    def __init__(self):
+        self.ids = np.array([], dtype=str)
+        self.x = np.array([])
+        self.y = np.array([])
+        self.t = np.array([])
+        self.active: dict[str, tuple[str, ...]] = {}
+
+    def load(self, ids: np.ndarray):
+        """
+        Previous state of each drone.
+
+        Returns:
+            tuple: x, y and time of the previous position (NaN when unknown),
+            and the zones each drone was already predicted to enter
+        """
+        active = [self.active.get(drone_id, ()) for drone_id in ids.tolist()]
+        if not len(self.ids):
+            unknown = np.full(len(ids), np.nan)
+            return unknown, unknown, unknown, active
+        index = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        found = self.ids[index] == ids
+        return (np.where(found, self.x[index], np.nan), np.where(found, self.y[index], np.nan),
+                np.where(found, self.t[index], np.nan), active)
+
+    def save(self, ids: np.ndarray, x: np.ndarray, y: np.ndarray, now: float,
+             active: dict[str, tuple[str, ...]]) -> None:
+        """
+        Store the current positions and predictions of the drones in ids.
+
+        Recent state of drones absent this tick (other shards) is kept until
+        it is older than settings.prediction_max_gap.
+        """
+        keep = now - self.t <= settings.prediction_max_gap
+        if len(self.ids):
+            index = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+            keep[index[self.ids[index] == ids]] = False  # replaced by this tick
+        remembered = set(self.ids[keep].tolist())
+        self.active = {drone_id: zones for drone_id, zones in self.active.items() if drone_id in remembered}
+        self.active.update(active)
+        ids = np.concatenate([self.ids[keep], ids])
+        order = np.argsort(ids, kind="stable")
+        self.ids = ids[order]
+        self.x = np.concatenate([self.x[keep], x])[order]
+        self.y = np.concatenate([self.y[keep], y])[order]
+        self.t = np.concatenate([self.t[keep], np.full(len(x), now)])[order]
+
+
+class RedisPositionHistory:
+    """
+    The same state in Redis, shared by every worker process.
+
+    One key per drone expires after settings.prediction_max_gap, so
+    consecutive ticks handled by different prefork children (or shards)
+    still see each drone's previous position and predictions.
+    """
+
+    def __init__(self, client: redis.Redis, key_prefix: str = "nfz:prediction:"):
+        self.redis = client
+        self.key_prefix = key_prefix
+
+    def load(self, ids: np.ndarray):
+        """Same as PositionHistory.load, with one MGET for the whole feed."""
+        x, y, t = (np.full(len(ids), np.nan) for _ in range(3))
+        active = [()] * len(ids)
+        values = self.redis.mget([f"{self.key_prefix}{drone_id}" for drone_id in ids.tolist()]) if len(ids) else []
+        for n, raw in enumerate(values):
+            if raw is not None:
+                data = json.loads(raw)
+                x[n], y[n], t[n], active[n] = data["x"], data["y"], data["t"], tuple(data["zones"])
+        return x, y, t, active
+
+    def save(self, ids: np.ndarray, x: np.ndarray, y: np.ndarray, now: float,
+             active: dict[str, tuple[str, ...]]) -> None:
+        """Same as PositionHistory.save, in one pipeline."""
+        ttl = max(1, math.ceil(settings.prediction_max_gap))
+        pipe = self.redis.pipeline(transaction=False)
+        for drone_id, drone_x, drone_y in zip(ids.tolist(), x.tolist(), y.tolist()):
+            state = {"x": drone_x, "y": drone_y, "t": now, "zones": active.get(drone_id, ())}
+            pipe.set(f"{self.key_prefix}{drone_id}", json.dumps(state), ex=ttl)
+        pipe.execute()
+
+
+class IncursionPredictor:
+    """
+    Predicts NFZ incursions from consecutive feed snapshots.
+
+    Every drone's velocity is estimated from its previous position, and
+    each zone computes when the drone would enter it at that velocity. A
+    prediction is reported once when it first appears, not on every tick
+    while it holds.
+    """
+
+    def __init__(self, history=None):
+        self.history = PositionHistory() if history is None else history
+
+    def observe(self, raw_drones: list[dict], zone_index: ZoneIndex, now: float) -> list[PredictedIncursion]:
+        """
+        Update the position history with one tick and predict incursions.
+
+        Args:
+            raw_drones: Drone dicts as returned by the drone feed
+            zone_index: Zones to predict against
+            now: Epoch time of the snapshot
+
+        Returns:
+            list[PredictedIncursion]: New predictions, soonest first
+        """
+        x, y, z = feed_to_arrays(raw_drones)
+        valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(z)
+        ids = np.array([str(row.get("id")) if isinstance(row, dict) else "" for row in raw_drones], dtype=str)
+        ids, x, y, z = ids[valid], x[valid], y[valid], z[valid]
+
+        px, py, pt, previous = self.history.load(ids)
+        dt = now - pt
+        known = (dt > 0) & (dt <= settings.prediction_max_gap)  # False for unknown (NaN) drones
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vx = np.where(known, (x - px) / dt, 0.0)
+            vy = np.where(known, (y - py) / dt, 0.0)
+        moving = known & (np.hypot(vx, vy) >= settings.prediction_min_speed)
+
+        movers = np.flatnonzero(moving)
+        mx, my, mz, mvx, mvy = x[movers], y[movers], z[movers], vx[movers], vy[movers]
+        predictions, active = [], {}
+        for zone in zone_index.zones if len(movers) else ():
+            times = zone.entry_times(mx, my, mz, mvx, mvy, settings.prediction_horizon,
+                                     settings.prediction_polygon_steps)
+            for n in np.flatnonzero(~np.isnan(times)):
+                drone_id = str(ids[movers[n]])
+                active[drone_id] = active.get(drone_id, ()) + (zone.id,)
+                if zone.id not in previous[movers[n]]:
+                    predictions.append(PredictedIncursion(
+                        drone_id, zone.id, float(times[n]), float(mx[n]), float(my[n]), float(mz[n]),
+                        float(mvx[n]), float(mvy[n])))
+        # Drones absent from this feed belong to other shards: their state
+        # (predictions included) holds until the history forgets them
+        self.history.save(ids, x, y, now, active)
+        return sorted(predictions, key=lambda prediction: prediction.seconds_to_entry)
+
+
+def create_position_history():
+    """Build the position history selected by settings.prediction_store."""
+    if settings.prediction_store == "redis":
+        return RedisPositionHistory(redis.Redis.from_url(str(settings.redis_url)))
+    return PositionHistory()
+
+
+incursion_predictor = IncursionPredictor(create_position_history())
@@ -0,0 +1,190 @@
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .episodes import EpisodeChanges
+from .model import Violation
+
+logger = logging.getLogger(__name__)
+
+# Errors caused by the rows themselves: a failing batch is bisected to drop
+# them. Anything else (connection lost, database down) fails the whole batch.
+ROW_ERRORS = (IntegrityError, DataError)
+# Id reported for a stored row when the keys are not fetched (no RETURNING)
+STORED = 0
+
+
+def violations_query(
+    after: tuple[datetime, int] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    drone_id: str | None = None,
+    min_distance: int | None = None,
+    owner_ssn_hash: str | None = None,
+):
+    """
+    Build a violations select ordered by (timestamp, id) for keyset pagination.
+
+    The drone_id, timestamp and owner_ssn_hash filters use the existing
+    column indexes.
+
+    Args:
+        after: (timestamp, id) of the last row of the previous page
+        owner_ssn_hash: Keyed SSN hash (pii.ssn_digest) of the owner
+    """
+    query = select(Violation).order_by(Violation.timestamp, Violation.id)
+    if after:
+        query = query.where(tuple_(Violation.timestamp, Violation.id) > after)
+    if since:
+        query = query.where(Violation.timestamp >= since)
+    if until:
+        query = query.where(Violation.timestamp < until)
+    if drone_id:
+        query = query.where(Violation.drone_id == drone_id)
+    if min_distance is not None:
+        query = query.where(Violation.distance_from_center >= min_distance)
+    if owner_ssn_hash:
+        query = query.where(Violation.owner_ssn_hash == owner_ssn_hash)
+    return query
+
+
+def episode_updates(changes: EpisodeChanges, now: datetime) -> tuple[list[dict], list[dict]]:
+    """
+    Parameters of the bulk UPDATEs for a tick's episode changes.
+
+    Returns:
+        tuple: Rows of continuing episodes and rows of closed episodes
+    """
+    updated = [
+        {
+            "id": episode.violation_id,
+            "position_x": episode.x,
+            "position_y": episode.y,
+            "position_z": episode.z,
+            "distance_from_center": round(episode.distance),
+            "min_distance": round(episode.min_distance),
+            "sample_count": episode.sample_count,
+        }
+        for episode in changes.updated
+    ]
+    closed = [{"id": episode.violation_id, "episode_end": now} for episode in changes.closed]
+    return updated, closed
+
+
+def _only(query, columns: tuple[str, ...]):
+    return query.with_only_columns(*(getattr(Violation, name) for name in columns), Violation.id)
+
+
+class ViolationRepository:
+    """
+    Reads and writes of the violations table over the async engine.
+
+    Used by the API and by the async worker pipeline, so both sides share
+    the pool sizing of settings. Writes are batched: a tick's new rows are
+    one executemany INSERT and its episode changes one bulk UPDATE by
+    primary key. On asyncpg each statement is prepared once per connection
+    and reused from its statement cache (DB_STATEMENT_CACHE_SIZE).
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def insert_many(self, rows: list[dict], returning: bool = False) -> list[int | None]:
+        """
+        Insert rows in one transaction, bisecting on ROW_ERRORS to isolate bad rows.
+
+        Args:
+            rows: Column mappings as returned by build_violation_row
+            returning: Fetch the generated primary keys (INSERT ... RETURNING)
+
+        Returns:
+            list[int | None]: Primary keys aligned with rows (STORED when
+            returning is not set), None for rejected rows
+
+        Raises:
+            SQLAlchemyError: Any other error; nothing of the batch is stored
+        """
+        if not rows:
+            return []
+        async with self.session_factory() as session:
+            return await self._insert(session, rows, returning)
+
+    async def _insert(self, session: AsyncSession, rows: list[dict], returning: bool) -> list[int | None]:
+        try:
+            if returning:
+                stmt = insert(Violation).returning(Violation.id, sort_by_parameter_order=True)
+                ids = list((await session.execute(stmt, rows)).scalars())
+            else:
+                await session.execute(insert(Violation), rows)
+                ids = [STORED] * len(rows)
+            await session.commit()
+            return ids
+        except SQLAlchemyError as e:
+            await session.rollback()
+            if not isinstance(e, ROW_ERRORS):
+                raise
+            if len(rows) == 1:
+                logger.error(f"❌ Rejected violation for drone {rows[0].get('drone_id')}: {e}")
+                return [None]
+            middle = len(rows) // 2
+            return (await self._insert(session, rows[:middle], returning)
+                    + await self._insert(session, rows[middle:], returning))
+
+    async def update_episodes(self, changes: EpisodeChanges, now: datetime) -> None:
+        """
+        Update continuing episodes in place and close finished ones, in one transaction.
+
+        Raises:
+            SQLAlchemyError: The update failed and was rolled back
+        """
+        updated, closed = episode_updates(changes, now)
+        if not updated and not closed:
+            return
+        async with self.session_factory() as session:
+            try:
+                if updated:
+                    await session.execute(update(Violation), updated)
+                if closed:
+                    await session.execute(update(Violation), closed)
+                await session.commit()
+            except SQLAlchemyError:
+                await session.rollback()
+                raise
+
+    async def page(self, query, limit: int) -> list[Violation]:
+        """Fetch up to limit rows of a violations_query."""
+        async with self.session_factory() as session:
+            return list((await session.scalars(query.limit(limit))).all())
+
+    async def page_columns(self, query, limit: int, columns: tuple[str, ...]) -> list:
+        """
+        Fetch up to limit rows of a violations_query as plain column tuples.
+
+        Skips hydrating ORM entities. Each row holds the named columns
+        followed by the id (for the next page's cursor).
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(_only(query, columns).limit(limit))
+            return result.all()
+
+    async def stream_columns(self, query, batch_size: int, columns: tuple[str, ...]) -> AsyncIterator[list]:
+        """Yield batches of column tuples (as page_columns) from a server-side cursor."""
+        async with self.session_factory() as session:
+            result = await session.stream(_only(query, columns).execution_options(yield_per=batch_size))
+            async for batch in result.partitions():
+                yield batch
+
+    async def stream(self, query, batch_size: int) -> AsyncIterator[Violation]:
+        """Yield the rows of a violations_query from a server-side cursor, batch_size at a time."""
+        async with self.session_factory() as session:
+            result = await session.stream_scalars(query.execution_options(yield_per=batch_size))
+            async for violation in result:
+                yield violation
+
+
+violation_repository = ViolationRepository()
@@ -0,0 +1,159 @@
+import logging
+import uuid
+from dataclasses import dataclass
+
+import redis
+
+from .events import get_redis
+from .metrics import TICK_INTERVAL_SECONDS, TICKS_SKIPPED
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "nfz:tick:lock"
+SCHEDULE_KEY = "nfz:tick:schedule"
+SKIPPED_KEY = "nfz:tick:skipped"
+
+# Deletes the lock only if this worker still holds it (the lease may have expired)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class UpstreamHealth:
+    """Upstream retries and failures seen during the current tick."""
+    retries: int = 0
+    failures: int = 0
+
+    def retry(self) -> None:
+        self.retries += 1
+
+    def failure(self) -> None:
+        self.failures += 1
+
+    def reset(self) -> None:
+        self.retries = self.failures = 0
+
+
+def next_interval(previous: float, duration: float, health: UpstreamHealth) -> float:
+    """
+    Interval until the next tick, adapted to the last one.
+
+    A healthy tick runs again after settings.tick_interval_factor times its
+    duration. Upstream retries stretch the previous interval by half, failures
+    double it, so a struggling upstream is polled less often until it
+    recovers. The result is bounded by tick_min_interval/tick_max_interval.
+    """
+    interval = duration * settings.tick_interval_factor
+    if health.failures:
+        interval = max(interval, previous * 2)
+    elif health.retries:
+        interval = max(interval, previous * 1.5)
+    return min(max(interval, settings.tick_min_interval), settings.tick_max_interval)
+
+
+class TickScheduler:
+    """
+    Keeps beat ticks from overlapping and spaces them out adaptively.
+
+    Beat publishes a tick every tick_min_interval seconds. A tick only runs
+    when it is not late, no other tick holds the Redis lock, and the
+    adaptive interval since the previous run has elapsed (within half a
+    beat period); otherwise it is skipped and counted. Redis errors fail
+    open: the tick runs unguarded. A sharded tick hands its lock to the
+    chord callback, which releases it once every shard has finished, so
+    tick_lock_lease must cover the whole fan-out.
+    """
+
+    def __init__(self, client_factory=get_redis):
+        self.client_factory = client_factory
+        self._token: str | None = None
+
+    def acquire(self, now: float, published_at: float | None = None) -> str | None:
+        """
+        Try to start a tick.
+
+        Args:
+            now: Current epoch time
+            published_at: When beat published the tick, if known
+
+        Returns:
+            str | None: Skip reason ("late", "overlap" or "not_due"), None when the tick may run
+        """
+        self._token = None
+        if published_at is not None and now - published_at > settings.tick_max_lag:
+            return self._skip("late")
+        try:
+            client = self.client_factory()
+            next_at = client.hget(SCHEDULE_KEY, "next_at")
+            if next_at is not None and now + settings.tick_min_interval / 2 < float(next_at):
+                return self._skip("not_due")
+            token = uuid.uuid4().hex
+            if not client.set(LOCK_KEY, token, nx=True, px=int(settings.tick_lock_lease * 1000)):
+                return self._skip("overlap")
+            self._token = token
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Tick guard unavailable, running unguarded: {e}")
+        return None
+
+    @property
+    def token(self) -> str | None:
+        """Token of the lock held for the running tick, None when unguarded."""
+        return self._token
+
+    def hand_off(self) -> None:
+        """Leave the lock to the task that was given token; it releases it instead."""
+        self._token = None
+
+    def release(self, started: float, duration: float, health: UpstreamHealth, token: str | None = None) -> dict:
+        """
+        Schedule the next tick and release the lock.
+
+        Args:
+            started: Epoch time the tick started
+            duration: Tick duration in seconds
+            health: Upstream retries and failures during the tick
+            token: Lock token handed off by the task that acquired it
+                (default this scheduler's own)
+
+        Returns:
+            dict: Next interval in seconds and ticks skipped since the previous run
+        """
+        report = {"next_interval": settings.tick_min_interval, "skipped": {}}
+        try:
+            client = self.client_factory()
+            previous = client.hget(SCHEDULE_KEY, "interval")
+            interval = next_interval(float(previous or settings.tick_min_interval), duration, health)
+            pipe = client.pipeline()
+            pipe.hset(SCHEDULE_KEY, mapping={"interval": interval, "next_at": started + interval})
+            pipe.hgetall(SKIPPED_KEY)
+            pipe.delete(SKIPPED_KEY)
+            token = token or self._token
+            if token is not None:
+                pipe.eval(_RELEASE_SCRIPT, 1, LOCK_KEY, token)
+            _, skipped, *_ = pipe.execute()
+            TICK_INTERVAL_SECONDS.set(interval)
+            report = {"next_interval": round(interval, 3),
+                      "skipped": {reason.decode(): int(count) for reason, count in skipped.items()}}
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to update the tick schedule: {e}")
+        finally:
+            self._token = None
+        return report
+
+    def _skip(self, reason: str) -> str:
+        TICKS_SKIPPED.labels(reason).inc()
+        try:
+            self.client_factory().hincrby(SKIPPED_KEY, reason, 1)
+        except redis.RedisError:
+            pass
+        logger.info(f"⏭️ Skipping NFZ tick: {reason}")
+        return reason
+
+
+upstream_health = UpstreamHealth()
+tick_scheduler = TickScheduler()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime
 
 
@@ -12,6 +12,7 @@ class Drone(BaseModel):
 
 class ViolationSchema(BaseModel):
     drone_id: str
+    zone_id: str = "default"
     timestamp: datetime
     position_x: int
     position_y: int
@@ -20,7 +21,64 @@ class ViolationSchema(BaseModel):
     owner_first_name: str
     owner_last_name: str
     owner_ssn: str
-    owner_phone: int
+    owner_phone: int | None
+    owner_pending: bool = False
+    episode_start: datetime | None = None
+    episode_end: datetime | None = None
+    min_distance: int | None = None
+    sample_count: int = 1
 
     model_config = ConfigDict(from_attributes=True)  # modern way
 
+    @field_validator("owner_phone", mode="before")
+    @classmethod
+    def empty_phone_is_none(cls, value):
+        # Pending or unknown owners are stored with an empty phone
+        return value or None
+
+
+class TrackPoint(BaseModel):
+    timestamp: datetime
+    x: int
+    y: int
+    z: int
+
+
+class TrackSchema(BaseModel):
+    drone_id: str
+    start: datetime
+    end: datetime
+    points: list[TrackPoint]
+
+
+class ViolationCounts(BaseModel):
+    total: int
+    last_hour: int
+    last_24h: int
+    last_7d: int
+
+
+class DroneCount(BaseModel):
+    drone_id: str
+    violations: int
+
+
+class OwnerCount(BaseModel):
+    owner_id: int
+    name: str
+    violations: int
+
+
+class DistanceBucket(BaseModel):
+    min_distance: int
+    max_distance: int
+    count: int
+
+
+class StatsSchema(BaseModel):
+    generated_at: datetime
+    violations: ViolationCounts
+    zones: dict[str, int]
+    top_drones: list[DroneCount]
+    top_owners: list[OwnerCount]
+    distance_histogram: list[DistanceBucket]
@@ -0,0 +1,99 @@
+import json
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+from .pii import ENCRYPTED_FIELDS, PII_FIELDS, REDACTED, reveal
+from .schemas import ViolationSchema
+
+try:  # orjson is optional; the stdlib encoder produces the same JSON, more slowly
+    import orjson
+except ImportError:
+    orjson = None
+
+# Columns selected for the column response mode, in ViolationSchema order
+VIOLATION_FIELDS = tuple(ViolationSchema.model_fields)
+# Redacted projections never read the PII columns; revealed ones add the ciphertexts
+REDACTED_FIELDS = tuple(field for field in VIOLATION_FIELDS if field not in PII_FIELDS)
+REVEALED_FIELDS = VIOLATION_FIELDS + ENCRYPTED_FIELDS
+_TEMPLATE = dict.fromkeys(VIOLATION_FIELDS)
+_PHONE = TypeAdapter(int | None)
+
+
+def projection(revealed: bool) -> tuple[str, ...]:
+    """Columns to select for a redacted or revealed /nfz response."""
+    return REVEALED_FIELDS if revealed else REDACTED_FIELDS
+
+
+def phone_to_int(value: str | None) -> int | None:
+    """
+    Coerce a stored phone number like ViolationSchema does.
+
+    Plain digit strings take a fast path; anything else goes through the
+    same pydantic int validation, so both response modes accept and reject
+    the same values.
+    """
+    if not value:
+        return None
+    if value.isascii() and value.isdigit():
+        return int(value)
+    return _PHONE.validate_python(value)
+
+
+def violation_dicts(rows, fields: tuple[str, ...] = VIOLATION_FIELDS) -> list[dict]:
+    """
+    Turn column tuples into ViolationSchema-shaped dicts.
+
+    Rows of REVEALED_FIELDS are decrypted in one batch per column; rows
+    without the PII columns (REDACTED_FIELDS) get redacted values.
+
+    Args:
+        rows: Column tuples in fields order (extra trailing columns are ignored)
+        fields: The projection the rows were selected with
+    """
+    violations = []
+    for row in rows:
+        violation = _TEMPLATE.copy()  # keeps the schema's key order
+        violation.update(zip(fields, row))
+        violations.append(violation)
+    if "owner_ssn" not in fields:
+        for violation in violations:
+            violation["owner_ssn"] = REDACTED
+        return violations
+    if ENCRYPTED_FIELDS[0] in fields:
+        reveal(violations)
+    for violation in violations:
+        violation["owner_phone"] = phone_to_int(violation["owner_phone"])
+    return violations
+
+
+def violation_models(violations, revealed: bool) -> list[ViolationSchema]:
+    """
+    Validate Violation entities into schemas, redacted or with decrypted PII.
+
+    Args:
+        violations: Violation ORM entities
+        revealed: Decrypt the owner PII instead of redacting it
+    """
+    models = [ViolationSchema.model_validate(violation) for violation in violations]
+    if not revealed:
+        return [model.model_copy(update={"owner_ssn": REDACTED, "owner_phone": None}) for model in models]
+    pii = [{field: getattr(violation, field) for field in PII_FIELDS + ENCRYPTED_FIELDS} for violation in violations]
+    reveal(pii)
+    return [
+        model.model_copy(update={"owner_ssn": values["owner_ssn"], "owner_phone": phone_to_int(values["owner_phone"])})
+        for model, values in zip(models, pii)
+    ]
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    """Encode as compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default).encode()
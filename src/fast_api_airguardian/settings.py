@@ -13,7 +13,128 @@ class Settings(BaseSettings):
     postgres_password: str
     database_url_async: str
     database_url_sync: PostgresDsn
-    
+
+    # Database connection pools, per process and engine (seconds)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 3600
+    db_statement_cache_size: int = 100  # asyncpg prepared statements per connection
+    db_insert_page_size: int = 1000  # rows per multi-row INSERT
+
+    # Detection pipeline
+    pipeline_mode: Literal["sync", "async"] = "sync"
+    owner_lookup_concurrency: int = 50
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+
+    # Owner info cache
+    owner_cache_size: int = 10_000
+    owner_cache_ttl: float = 300.0
+    owner_cache_negative_ttl: float = 60.0
+    owner_cache_redis: bool = False
+
+    # Incursion episodes: one violation row per stay inside the zone
+    # ("memory" only suits a single worker process: solo pool or concurrency 1)
+    episode_tracking: bool = False
+    episode_store: Literal["memory", "redis"] = "redis"
+
+    # Upstream circuit breakers and shared retry budget (per upstream, seconds)
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    breaker_refresh_interval: float = 1.0
+    retry_budget: int = 20
+    retry_budget_window: float = 10.0
+    owner_backfill_delay: float = 30.0
+    owner_backfill_batch: int = 200
+
+    # Beat tick guard: Redis lock lease, late tick cutoff and adaptive interval bounds (seconds)
+    tick_guard: bool = True
+    tick_lock_lease: float = 60.0
+    tick_max_lag: float = 10.0
+    tick_min_interval: float = 10.0
+    tick_max_interval: float = 60.0
+    tick_interval_factor: float = 2.0
+
+    # Fan-out: split each tick into shards processed by any worker (1 disables)
+    shard_count: int = 1
+    shard_strategy: Literal["hash", "tile"] = "hash"
+    shard_tile_size: float = 5000.0
+
+    # Feed validation ("bulk" validates the whole feed at once into slotted records)
+    validation_mode: Literal["model", "bulk"] = "model"
+    validation_error_log_interval: float = 60.0
+
+    # Incremental processing: only reprocess new and moved drones (store: "memory" or "redis", as above)
+    delta_processing: bool = False
+    feed_snapshot_store: Literal["memory", "redis"] = "redis"
+
+    # NFZ classification ("vectorized" uses NumPy over the raw feed)
+    classification_mode: Literal["scalar", "vectorized"] = "scalar"
+
+    # No-Fly Zones (JSON list of circle/polygon zones; default is one circle at 0,0)
+    nfz_zones_file: str | None = None
+    zone_grid_cell_size: float = 1000.0
+
+    # Owner PII: AES-256-GCM at rest and a keyed SSN hash for lookups (base64 32-byte keys;
+    # the index key defaults to one derived from the encryption key). Redacted in /nfz and
+    # live events unless the request carries x-pii-secret.
+    pii_encryption_key: str | None = None
+    pii_index_key: str | None = None
+    pii_secret: str | None = None
+    pii_redact: bool = True
+
+    # /nfz response encoding ("columns" selects column tuples and encodes them directly, with orjson if installed)
+    nfz_response_mode: Literal["model", "columns"] = "model"
+
+    # Compress response bodies of at least this many bytes
+    gzip_minimum_size: int = 1000  # 0 disables
+
+    # /drones snapshot cache (seconds); "redis" shares one upstream fetch between API processes
+    drones_cache_ttl: float = 2.0
+    drones_cache_max_stale: float = 10.0
+    drones_cache_store: Literal["memory", "redis"] = "memory"
+
+    # Readiness probe: budget of each DB / Redis check (seconds)
+    health_check_timeout: float = 2.0
+
+    # Live events over Redis pub/sub
+    publish_events: bool = True
+    publish_drone_snapshots: bool = False
+    event_queue_size: int = 100
+
+    # Violations partitioning (PostgreSQL), retention and hourly rollups
+    partition_interval: Literal["day", "week"] = "day"
+    partitions_ahead: int = 3
+    violation_retention_days: int = 90  # 0 keeps violations forever
+    rollup_lookback_hours: int = 3
+    maintenance_interval: float = 300.0
+
+    # /nfz/stats aggregates in Redis
+    stats_enabled: bool = True
+    stats_cache_ttl: float = 5.0
+    stats_top_n: int = 10
+    stats_distance_bucket: int = 100
+
+    # Predicted incursions: velocity from consecutive ticks, alert when entering within the horizon (seconds)
+    prediction_enabled: bool = False
+    prediction_horizon: float = 60.0
+    prediction_max_gap: float = 30.0
+    prediction_min_speed: float = 0.5  # units per second
+    prediction_polygon_steps: int = 12
+    prediction_store: Literal["memory", "redis"] = "redis"
+
+    # Drone track history (delta-encoded segments per drone and bucket, seconds)
+    track_recording: bool = False
+    track_bucket_seconds: int = 300
+    track_flush_interval: float = 300.0
+    track_retention_days: int = 7  # 0 keeps tracks forever
+    track_max_query_hours: float = 24.0
+
+    # Observability (worker /metrics port, None disables; spans need opentelemetry-api)
+    worker_metrics_port: int | None = 9100
+    otel_enabled: bool = False
+
     model_config = ConfigDict(env_file=".env")  # modern way
 
 settings = Settings()
\ No newline at end of file
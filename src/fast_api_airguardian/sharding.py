@@ -0,0 +1,44 @@
+import math
+import zlib
+from typing import Callable
+
+# Decides whether a drone id belongs to the current shard (None: every drone)
+Owner = Callable[[str], bool] | None
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """Stable shard of a key (crc32, identical in every worker process)."""
+    return zlib.crc32(key.encode()) % shard_count
+
+
+def _tile_key(row: dict, tile_size: float) -> str:
+    try:
+        return f"{math.floor(float(row['x']) / tile_size)}:{math.floor(float(row['y']) / tile_size)}"
+    except (KeyError, TypeError, ValueError):
+        return ""  # malformed rows all go to the same shard and fail validation there
+
+
+def split_feed(raw_drones: list[dict], shard_count: int, strategy: str, tile_size: float) -> list[list[dict]]:
+    """
+    Split the raw feed into shard_count shards.
+
+    "hash" assigns each drone by its id, so a drone always lands on the same
+    shard and per-drone state (episodes, feed snapshot) can be scoped to it.
+    "tile" assigns drones by spatial grid tile, keeping nearby drones together.
+
+    Returns:
+        list[list[dict]]: Rows of each shard, in feed order
+    """
+    shards: list[list[dict]] = [[] for _ in range(shard_count)]
+    for row in raw_drones:
+        if strategy == "tile":
+            key = _tile_key(row, tile_size)
+        else:
+            key = str(row.get("id", "")) if isinstance(row, dict) else ""
+        shards[shard_of(key, shard_count)].append(row)
+    return shards
+
+
+def shard_owner(shard: int, shard_count: int) -> Owner:
+    """Ownership test for drone ids of one hash shard."""
+    return lambda drone_id: shard_of(drone_id, shard_count) == shard
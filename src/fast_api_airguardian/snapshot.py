@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotCache:
+    """
+    Short-TTL cache of an upstream snapshot with single-flight refresh.
+
+    Concurrent callers share one in-flight fetch. Within the TTL the cached
+    value is returned as is; after it, and up to max_stale seconds more,
+    the stale value is still served while one background refresh runs.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[Any]], ttl: float, max_stale: float,
+                 clock=time.monotonic):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._clock = clock
+        self._value: Any = None
+        self._fetched_at: float | None = None
+        self._refresh: asyncio.Task | None = None
+        self.refreshed_at: float | None = None  # wall time of the last refresh, for Last-Modified
+
+    async def get(self) -> Any:
+        """
+        Return the current snapshot, fetching it if missing or too stale.
+
+        Raises:
+            Exception: Whatever the upstream fetch raised, when no usable
+            snapshot is cached
+        """
+        if self._fetched_at is not None:
+            age = self._clock() - self._fetched_at
+            if age < self.ttl:
+                return self._value
+            if age < self.ttl + self.max_stale:
+                self._start_refresh()
+                return self._value
+        return await asyncio.shield(self._start_refresh())
+
+    def clear(self) -> None:
+        """Forget the cached snapshot."""
+        self._value = None
+        self._fetched_at = None
+        self.refreshed_at = None
+        self._refresh = None
+
+    def _start_refresh(self) -> asyncio.Task:
+        if (self._refresh is None or self._refresh.done()
+                or self._refresh.get_loop() is not asyncio.get_running_loop()):
+            self._refresh = asyncio.ensure_future(self._do_refresh())
+            self._refresh.add_done_callback(self._log_failure)
+        return self._refresh
+
+    async def _do_refresh(self) -> Any:
+        value = await self._fetch()
+        self._value = value
+        self._fetched_at = self._clock()
+        self.refreshed_at = time.time()
+        return value
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Snapshot refresh failed: {task.exception()}")
@@ -0,0 +1,168 @@
+import calendar
+import logging
+from collections import Counter
+from datetime import datetime
+
+import redis
+import redis.asyncio as aioredis
+
+from .events import get_redis
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "nfz:stats"
+TOTAL_KEY = f"{PREFIX}:total"
+DRONES_KEY = f"{PREFIX}:drones"
+OWNERS_KEY = f"{PREFIX}:owners"
+OWNER_NAMES_KEY = f"{PREFIX}:owner_names"
+ZONES_KEY = f"{PREFIX}:zones"
+DISTANCE_KEY = f"{PREFIX}:distance"
+
+# Counter buckets: (key prefix, bucket seconds, buckets per window, window name)
+WINDOWS = (
+    ("m", 60, 60, "last_hour"),
+    ("h", 3600, 24, "last_24h"),
+    ("d", 86400, 7, "last_7d"),
+)
+
+_async_redis: aioredis.Redis | None = None
+
+
+def _epoch(timestamp: datetime) -> int:
+    return calendar.timegm(timestamp.utctimetuple())
+
+
+def _bucket_key(name: str, seconds: int, epoch: int) -> str:
+    return f"{PREFIX}:{name}:{epoch // seconds}"
+
+
+# --- Worker side: incremental updates ---
+def record_violations(rows: list[dict], owner_ids: list[int | None]) -> None:
+    """
+    Fold a tick's stored violations into the Redis aggregates.
+
+    Counts are pre-aggregated in process, so a tick costs one pipeline of
+    a handful of commands however many violations it stored. Updates are
+    best effort: Redis errors are logged and never fail the tick.
+
+    Args:
+        rows: Stored violation rows (as built by build_violation_row)
+        owner_ids: Owner id of each row, None when unknown
+    """
+    if not rows or not settings.stats_enabled:
+        return
+    buckets: Counter[tuple[str, int]] = Counter()  # (key, ttl seconds)
+    drones: Counter[str] = Counter()
+    owners: Counter[str] = Counter()
+    zones: Counter[str] = Counter()
+    distances: Counter[int] = Counter()
+    names: dict[str, str] = {}
+    bucket_size = settings.stats_distance_bucket
+    for row, owner_id in zip(rows, owner_ids):
+        epoch = _epoch(row["timestamp"])
+        for name, seconds, count, _ in WINDOWS:
+            buckets[_bucket_key(name, seconds, epoch), seconds * (count + 1)] += 1
+        drones[row["drone_id"]] += 1
+        zones[row["zone_id"]] += 1
+        distances[row["distance_from_center"] // bucket_size * bucket_size] += 1
+        if owner_id:
+            owners[str(owner_id)] += 1
+            name = f"{row['owner_first_name']} {row['owner_last_name']}".strip()
+            if name:  # pending owners have no name yet
+                names[str(owner_id)] = name
+
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.incrby(TOTAL_KEY, len(rows))
+        for (key, ttl), amount in buckets.items():
+            pipe.incrby(key, amount)
+            pipe.expire(key, ttl)
+        for member, amount in drones.items():
+            pipe.zincrby(DRONES_KEY, amount, member)
+        for member, amount in owners.items():
+            pipe.zincrby(OWNERS_KEY, amount, member)
+        if names:
+            pipe.hset(OWNER_NAMES_KEY, mapping=names)
+        for zone_id, amount in zones.items():
+            pipe.hincrby(ZONES_KEY, zone_id, amount)
+        for bucket, amount in distances.items():
+            pipe.hincrby(DISTANCE_KEY, str(bucket), amount)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Failed to update violation stats: {e}")
+
+
+# --- API side: reads ---
+def get_async_redis() -> aioredis.Redis:
+    """App-lifetime async Redis client for the stats endpoint."""
+    global _async_redis
+    if _async_redis is None:
+        _async_redis = aioredis.Redis.from_url(str(settings.redis_url))
+    return _async_redis
+
+
+async def close_async_redis() -> None:
+    global _async_redis
+    if _async_redis is not None:
+        await _async_redis.aclose()
+        _async_redis = None
+
+
+def window_keys(now: datetime) -> dict[str, list[str]]:
+    """Bucket keys summed by each time window, newest first."""
+    epoch = _epoch(now)
+    return {
+        window: [_bucket_key(name, seconds, epoch - n * seconds) for n in range(count)]
+        for name, seconds, count, window in WINDOWS
+    }
+
+
+def _count(value) -> int:
+    return int(value) if value is not None else 0
+
+
+async def read_stats(now: datetime | None = None) -> dict:
+    """
+    Read every aggregate in one pipelined round trip (plus one for owner names).
+
+    The cost depends on the number of buckets and top entries returned,
+    not on the number of stored violations.
+
+    Returns:
+        dict: Data for schemas.StatsSchema
+    """
+    now = now or datetime.utcnow()
+    windows = window_keys(now)
+    top_n = settings.stats_top_n
+
+    pipe = get_async_redis().pipeline(transaction=False)
+    pipe.get(TOTAL_KEY)
+    for keys in windows.values():
+        pipe.mget(keys)
+    pipe.zrevrange(DRONES_KEY, 0, top_n - 1, withscores=True)
+    pipe.zrevrange(OWNERS_KEY, 0, top_n - 1, withscores=True)
+    pipe.hgetall(ZONES_KEY)
+    pipe.hgetall(DISTANCE_KEY)
+    total, *window_counts, top_drones, top_owners, zones, distances = await pipe.execute()
+
+    owner_ids = [member.decode() for member, _ in top_owners]
+    names = await get_async_redis().hmget(OWNER_NAMES_KEY, owner_ids) if owner_ids else []
+
+    return {
+        "generated_at": now,
+        "violations": {
+            "total": _count(total),
+            **{window: sum(_count(value) for value in counts)
+               for window, counts in zip(windows, window_counts)},
+        },
+        "zones": {zone_id.decode(): int(count) for zone_id, count in zones.items()},
+        "top_drones": [{"drone_id": member.decode(), "violations": int(score)}
+                       for member, score in top_drones],
+        "top_owners": [{"owner_id": int(owner_id), "name": (name or b"").decode(), "violations": int(score)}
+                       for owner_id, name, (_, score) in zip(owner_ids, names, top_owners)],
+        "distance_histogram": [
+            {"min_distance": bucket, "max_distance": bucket + settings.stats_distance_bucket, "count": count}
+            for bucket, count in sorted((int(key), int(value)) for key, value in distances.items())
+        ],
+    }
@@ -1,24 +1,81 @@
-from src.fast_api_airguardian.celery import celery_app
+from .celery import celery_app
+from celery import chord, group
 from fastapi import HTTPException
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 import asyncio
-from datetime import datetime, time
+from datetime import datetime
 import math
-from fast_api_airguardian.settings import settings
+import time
+import httpx
+import redis
+from .settings import settings
 from .schemas import Drone
 from pydantic import ValidationError
 import requests
-from fast_api_airguardian.model import Violation
+from .model import DroneTrack, Violation
 from .database import get_db_session 
+from .repository import ROW_ERRORS, STORED, episode_updates, violation_repository
+from .cache import owner_cache
+from .episodes import EpisodeChanges, incursion_tracker
+from .classify import drones_to_arrays, feed_to_arrays
+from .delta import FeedTracker, create_snapshot_store
+from .parsing import DroneRecord, parse_drones
+from .events import get_redis, publish_drone_snapshot, publish_feed_delta, publish_predictions, publish_violations
+from .stats import record_violations
+from .watermark import bump_violations_version
+from .pii import protect_rows
+from .sharding import Owner, shard_owner, split_feed
+from .scheduling import UpstreamHealth, tick_scheduler, upstream_health
+from .breaker import breakers, retry_budgets
+from .tracks import track_recorder
+from .prediction import PredictedIncursion, incursion_predictor
+from .metrics import (
+    CLASSIFICATION_SECONDS,
+    DB_WRITE_SECONDS,
+    DRONES_CHANGED,
+    DRONES_INVALID,
+    DRONES_SEEN,
+    OWNER_LOOKUP_SECONDS,
+    PREDICTED_INCURSIONS,
+    PREDICTION_SECONDS,
+    TICK_LAG_SECONDS,
+    TICK_SECONDS,
+    UPSTREAM_FAILURES,
+    UPSTREAM_FETCH_SECONDS,
+    UPSTREAM_RETRIES,
+    UPSTREAM_SHORT_CIRCUITS,
+    VALIDATION_SECONDS,
+    VIOLATIONS,
+    stage,
+)
+from .zones import DEFAULT_ZONE_ID, CircleZone, Detection, Zone, ZoneIndex, load_zones
 import logging
 
 logger = logging.getLogger(__name__)
 
 REQUEST_TIMEOUT = 10.0
 MAX_REPEAT = 3
+# Owner info of a violation whose lookup failed; the row is stored with
+# owner_pending set and filled in by the nfz-owner-backfill task
+OWNER_PENDING = {"pending": True}
 NO_FLY_ZONE_RADIUS = 1000  # units
 
+# Configured zones, or the single default circle around (0,0)
+zone_index = ZoneIndex(
+    load_zones(settings.nfz_zones_file)
+    or [CircleZone(id=DEFAULT_ZONE_ID, x=0, y=0, radius=NO_FLY_ZONE_RADIUS)],
+    settings.zone_grid_cell_size,
+)
+# Previous feed of incremental processing, valid for these zones only
+feed_tracker = FeedTracker(create_snapshot_store(zone_index.fingerprint()))
+
+# Per-process asyncio state for the async pipeline. Created lazily so that
+# Celery's prefork children each get their own loop and connection pool.
+_event_loop: asyncio.AbstractEventLoop | None = None
+_http_client: httpx.AsyncClient | None = None
+
 
 def calculate_distance(x: int, y: int) -> float: 
     """
@@ -51,11 +108,44 @@ def is_in_nfz(x: int, y: int) -> bool:
     return distance <= NO_FLY_ZONE_RADIUS
 
 # --- Data fetch ---
+def retry_allowed(upstream: str, attempt: int) -> bool:
+    """
+    Decide whether a failed upstream call is retried.
+
+    Retries stop after MAX_REPEAT attempts, when the upstream's circuit is
+    open, or when its shared retry budget is spent.
+
+    Args:
+        upstream: "drone_feed" or "user_api"
+        attempt: Zero-based number of the attempt that failed
+
+    Returns:
+        bool: True when the caller should back off and retry
+    """
+    if attempt >= MAX_REPEAT - 1 or breakers[upstream].is_open():
+        return False
+    if not retry_budgets[upstream].take():
+        logger.warning(f"⚠️ Retry budget for {upstream} exhausted, not retrying")
+        return False
+    UPSTREAM_RETRIES.labels(upstream).inc()
+    upstream_health.retry()
+    return True
+
+
+def circuit_open(upstream: str) -> bool:
+    """True (and counted) when a call to the upstream must fail fast."""
+    if breakers[upstream].allow():
+        return False
+    UPSTREAM_SHORT_CIRCUITS.labels(upstream).inc()
+    return True
+
+
 def fetch_drones_data() -> list[dict]:
     """
     Fetch live drone position data from external API.
     
-    Implements retry logic with exponential backoff for reliability.
+    Implements retry logic with exponential backoff for reliability, within
+    the drone feed's retry budget. Fails fast while its circuit is open.
     
     Returns:
         list[dict]: List of drone objects with position data
@@ -65,16 +155,25 @@ def fetch_drones_data() -> list[dict]:
         Logs warnings for failed attempts, error for complete failure
     """
     for attempt in range(MAX_REPEAT):
+        if circuit_open("drone_feed"):
+            logger.warning("⚠️ Drone feed circuit is open, skipping fetch")
+            break
         try:
             response = requests.get(str(settings.base_url), timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            return response.json()
+            drones = response.json()
+            breakers["drone_feed"].record_success()
+            return drones
         except Exception as e:
+            breakers["drone_feed"].record_failure()
             logger.warning(f"⚠️ Attempt {attempt + 1}/{MAX_REPEAT} failed: {e}")
-            if attempt < MAX_REPEAT -1:
-                backoff_time = 2 ** attempt         # Exponential backoff
-                logger.info(f"⏳ Retrying in {backoff_time} seconds...")
-                time.sleep(backoff_time)
+            if not retry_allowed("drone_feed", attempt):
+                break
+            backoff_time = 2 ** attempt         # Exponential backoff
+            logger.info(f"⏳ Retrying in {backoff_time} seconds...")
+            time.sleep(backoff_time)
+    UPSTREAM_FAILURES.labels("drone_feed").inc()
+    upstream_health.failure()
     logger.error("❌ Failed to fetch drone data after multiple attempts.")
     return []
 
@@ -82,29 +181,231 @@ def fetch_drones_data() -> list[dict]:
 def get_drone_owner_info(owner_id: int) -> dict:
     """
     Fetch drone owner information from user API.
+
+    Results, including 404s, are cached in owner_cache. Fails fast while
+    the user API circuit is open.
     
     Args:
         owner_id: Unique identifier for drone owner
         
     Returns:
         dict: Owner information including name and contact details
-        Empty dict if owner_id is invalid or API call fails
+        Empty dict if owner_id is invalid or unknown to the user API
+        OWNER_PENDING if the user API is unavailable (backfilled later)
+    """
+    if not owner_id:
+        return {}
+    cached = owner_cache.get(owner_id)
+    if cached is not None:
+        return cached
+    for attempt in range(MAX_REPEAT):
+        if circuit_open("user_api"):
+            break
+        try:
+            with OWNER_LOOKUP_SECONDS.time():
+                response = requests.get(f"{settings.user_api_url}/{owner_id}", timeout=REQUEST_TIMEOUT)
+            if response.status_code == 404:
+                breakers["user_api"].record_success()
+                owner_cache.set_missing(owner_id)
+                return {}
+            response.raise_for_status()
+            owner_info = response.json()
+            breakers["user_api"].record_success()
+            owner_cache.set(owner_id, owner_info)
+            return owner_info
+        except Exception as e:
+            breakers["user_api"].record_failure()
+            logger.warning(f"⚠️ Attempt {attempt + 1}/{MAX_REPEAT} to fetch owner info failed: {e}")
+            if not retry_allowed("user_api", attempt):
+                break
+            backoff_time = 2 ** attempt         # Exponential backoff 
+            logger.info(f"⏳ Retrying in {backoff_time} seconds...")
+            time.sleep(backoff_time)
+    UPSTREAM_FAILURES.labels("user_api").inc()
+    upstream_health.failure()
+    logger.error(f"❌ Owner {owner_id} unavailable, storing violation with owner pending.")
+    return OWNER_PENDING
+
+
+# --- Async pipeline ---
+def run_async(coro):
+    """
+    Run a coroutine on this process's long-lived event loop.
+
+    Reusing one loop keeps the pooled HTTP client (and its keep-alive
+    connections) valid across Celery ticks.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop.run_until_complete(coro)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared pooled HTTP client used by the async pipeline."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+            ),
+        )
+    return _http_client
+
+
+async def fetch_drones_data_async(client: httpx.AsyncClient) -> list[dict]:
+    """
+    Async variant of fetch_drones_data using the shared client.
+
+    Returns:
+        list[dict]: List of drone objects with position data
+        Empty list if all retry attempts fail
+    """
+    for attempt in range(MAX_REPEAT):
+        if circuit_open("drone_feed"):
+            logger.warning("⚠️ Drone feed circuit is open, skipping fetch")
+            break
+        try:
+            response = await client.get(str(settings.base_url))
+            response.raise_for_status()
+            drones = response.json()
+            breakers["drone_feed"].record_success()
+            return drones
+        except Exception as e:
+            breakers["drone_feed"].record_failure()
+            logger.warning(f"⚠️ Attempt {attempt + 1}/{MAX_REPEAT} failed: {e}")
+            if not retry_allowed("drone_feed", attempt):
+                break
+            backoff_time = 2 ** attempt         # Exponential backoff
+            logger.info(f"⏳ Retrying in {backoff_time} seconds...")
+            await asyncio.sleep(backoff_time)
+    UPSTREAM_FAILURES.labels("drone_feed").inc()
+    upstream_health.failure()
+    logger.error("❌ Failed to fetch drone data after multiple attempts.")
+    return []
+
+
+async def get_drone_owner_info_async(
+    client: httpx.AsyncClient,
+    owner_id: int,
+    semaphore: asyncio.Semaphore,
+) -> dict:
     """
+    Async variant of get_drone_owner_info.
+
+    The semaphore bounds concurrent requests to the user API. It is only
+    held while a request is in flight, not during backoff.
+
+    Args:
+        client: Shared pooled HTTP client
+        owner_id: Unique identifier for drone owner
+        semaphore: Limits concurrent owner lookups
+
+    Returns:
+        dict: Owner information, empty dict for unknown owners,
+        OWNER_PENDING if the user API is unavailable
+    """
+    if not owner_id:
+        return {}
     for attempt in range(MAX_REPEAT):
+        if circuit_open("user_api"):
+            break
         try:
-            if not owner_id:
+            async with semaphore:
+                with OWNER_LOOKUP_SECONDS.time():
+                    response = await client.get(f"{settings.user_api_url}/{owner_id}")
+            if response.status_code == 404:
+                breakers["user_api"].record_success()
+                owner_cache.set_missing(owner_id)
                 return {}
-            response = requests.get(f"{settings.user_api_url}/{owner_id}", timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            return response.json()
+            owner_info = response.json()
+            breakers["user_api"].record_success()
+            owner_cache.set(owner_id, owner_info)
+            return owner_info
         except Exception as e:
+            breakers["user_api"].record_failure()
             logger.warning(f"⚠️ Attempt {attempt + 1}/{MAX_REPEAT} to fetch owner info failed: {e}")
-            if attempt < MAX_REPEAT -1:
-                backoff_time = 2 ** attempt         # Exponential backoff 
-                logger.info(f"⏳ Retrying in {backoff_time} seconds...")
-                time.sleep(backoff_time)
-    logger.error("❌ Failed to fetch owner info after multiple attempts.")
-    return {}
+            if not retry_allowed("user_api", attempt):
+                break
+            backoff_time = 2 ** attempt         # Exponential backoff
+            logger.info(f"⏳ Retrying in {backoff_time} seconds...")
+            await asyncio.sleep(backoff_time)
+    UPSTREAM_FAILURES.labels("user_api").inc()
+    upstream_health.failure()
+    logger.error(f"❌ Owner {owner_id} unavailable, storing violation with owner pending.")
+    return OWNER_PENDING
+
+
+async def fetch_owners_info_async(client: httpx.AsyncClient, owner_ids: set[int]) -> dict[int, dict]:
+    """
+    Look up all distinct owners of a tick concurrently.
+
+    Owners already in the owner cache are served from it; only the misses
+    go to the user API.
+
+    Args:
+        client: Shared pooled HTTP client
+        owner_ids: Distinct owner ids to resolve
+
+    Returns:
+        dict[int, dict]: Owner information keyed by owner id
+    """
+    owners = owner_cache.get_many(list(owner_ids))
+    ids = [owner_id for owner_id in owner_ids if owner_id not in owners]
+    semaphore = asyncio.Semaphore(settings.owner_lookup_concurrency)
+    results = await asyncio.gather(
+        *(get_drone_owner_info_async(client, owner_id, semaphore) for owner_id in ids)
+    )
+    owners.update(zip(ids, results))
+    return owners
+
+
+def build_violation_row(
+    drone_data: dict,
+    owner_info: dict,
+    timestamp: datetime | None = None,
+    zone_id: str = DEFAULT_ZONE_ID,
+    distance: float | None = None,
+) -> dict:
+    """
+    Build the column values of a Violation from drone and owner data.
+
+    Args:
+        drone_data: Dictionary containing drone position and identification
+        owner_info: Dictionary containing owner personal information
+        timestamp: Detection time, defaults to now (UTC)
+        zone_id: Zone the drone was found in
+        distance: Distance from the zone center, defaults to distance from (0,0)
+
+    Returns:
+        dict: Column name to value mapping for the violations table
+    """
+    x, y = drone_data.get("x", 0), drone_data.get("y", 0)
+    return {
+        "drone_id": drone_data.get("id", ""),
+        "zone_id": zone_id,
+        "timestamp": timestamp or datetime.utcnow(),
+        "position_x": x,
+        "position_y": y,
+        "position_z": drone_data.get("z", 0),
+        "distance_from_center": round(calculate_distance(x, y) if distance is None else distance),
+        "owner_id": drone_data.get("owner_id"),
+        **owner_columns(owner_info),
+    }
+
+
+def owner_columns(owner_info: dict) -> dict:
+    """Owner columns of a Violation; OWNER_PENDING yields empty values with owner_pending set."""
+    return {
+        "owner_first_name": owner_info.get("first_name", ""),
+        "owner_last_name": owner_info.get("last_name", ""),
+        "owner_ssn": owner_info.get("social_security_number", ""),
+        "owner_phone": owner_info.get("phone_number", ""),
+        "owner_pending": bool(owner_info.get("pending")),
+    }
 
 
 def store_violation_to_db(drone_data: dict, owner_info: dict) -> Violation:
@@ -124,22 +425,10 @@ def store_violation_to_db(drone_data: dict, owner_info: dict) -> Violation:
     Raises:
         Exception: If database operation fails, rolls back transaction
     """
-    x, y = drone_data.get("x", 0), drone_data.get("y", 0)
     db = get_db_session()  # ✅ Get session from shared pool
     
     try:
-        violation = Violation(
-            drone_id=drone_data.get("id", ""),
-            timestamp=datetime.utcnow(),
-            position_x=x,
-            position_y=y,
-            position_z=drone_data.get("z", 0),
-            distance_from_center=calculate_distance(x, y),
-            owner_first_name=owner_info.get("first_name", ""),
-            owner_last_name=owner_info.get("last_name", ""),
-            owner_ssn=owner_info.get("social_security_number", ""),
-            owner_phone=owner_info.get("phone_number", "")
-        )
+        violation = Violation(**build_violation_row(drone_data, owner_info))
         db.add(violation)
         db.commit()
         db.refresh(violation)
@@ -152,6 +441,249 @@ def store_violation_to_db(drone_data: dict, owner_info: dict) -> Violation:
     finally:
         db.close()  # ✅ Always close session
 
+
+def _insert_violations(db: Session, rows: list[dict], returning: bool) -> list[int | None]:
+    """
+    Insert rows in one transaction, bisecting on ROW_ERRORS to isolate bad rows.
+
+    Returns:
+        list[int | None]: Primary keys aligned with rows (STORED when returning
+        is not set), None for rejected rows
+
+    Raises:
+        SQLAlchemyError: Any other error, e.g. the database is unreachable
+    """
+    try:
+        if returning:
+            stmt = insert(Violation).returning(Violation.id, sort_by_parameter_order=True)
+            ids = list(db.execute(stmt, rows).scalars())
+        else:
+            db.execute(insert(Violation), rows)
+            ids = [STORED] * len(rows)
+        db.commit()
+        return ids
+    except SQLAlchemyError as e:
+        db.rollback()
+        if not isinstance(e, ROW_ERRORS):
+            raise
+        if len(rows) == 1:
+            logger.error(f"❌ Rejected violation for drone {rows[0].get('drone_id')}: {e}")
+            return [None]
+        middle = len(rows) // 2
+        return (_insert_violations(db, rows[:middle], returning)
+                + _insert_violations(db, rows[middle:], returning))
+
+
+def store_violations_batch(rows: list[dict], returning: bool = False) -> list[int | None]:
+    """
+    Store all violations of a tick with a single multi-row INSERT.
+
+    SQLAlchemy's insertmanyvalues batching turns the executemany into
+    multi-row VALUES statements, so the whole tick costs one transaction
+    instead of one commit per violation. Owner PII is encrypted for the
+    whole batch first (pii.protect_rows). If rows of the batch are rejected
+    (ROW_ERRORS), it is split in halves and retried until they are isolated
+    and dropped; other errors are raised and fail the tick.
+
+    Args:
+        rows: Column mappings as returned by build_violation_row
+        returning: Fetch the generated primary keys (INSERT ... RETURNING)
+
+    Returns:
+        list[int | None]: Primary keys aligned with rows (STORED when returning
+        is not set), None for rejected rows
+    """
+    if not rows:
+        return []
+    db = get_db_session()
+    try:
+        with stage("store", DB_WRITE_SECONDS.labels("insert")):
+            ids = _insert_violations(db, protect_rows(rows), returning)
+    finally:
+        db.close()
+    logger.info(f"✅ Stored batch of {len(rows)} violations")
+    return ids
+
+
+def update_violation_episodes(changes: EpisodeChanges, now: datetime) -> None:
+    """
+    Update continuing episodes in place and close finished ones.
+
+    Uses bulk UPDATE by primary key, so a tick costs one transaction
+    regardless of how many drones are inside the zone.
+    """
+    updated, closed = episode_updates(changes, now)
+    if not updated and not closed:
+        return
+    db = get_db_session()
+    try:
+        with stage("update_episodes", DB_WRITE_SECONDS.labels("update")):
+            if updated:
+                db.execute(update(Violation), updated)
+            if closed:
+                db.execute(update(Violation), closed)
+            db.commit()
+        logger.info(f"✅ Updated {len(changes.updated)} and closed {len(changes.closed)} episodes")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Error updating episodes: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def plan_violation_writes(violators: list[Detection], owns: Owner = None) -> EpisodeChanges:
+    """
+    Decide which violators need a new row this tick.
+
+    Without episode tracking every detection is its own violation row.
+    With it, only drones entering a zone open a row; drones still inside
+    update their open episode. owns scopes episode closing to one shard.
+    """
+    if not settings.episode_tracking:
+        return EpisodeChanges(opened=violators)
+    return incursion_tracker.observe(violators, owns)
+
+
+def build_detection_rows(changes: EpisodeChanges, owners: dict[int, dict], now: datetime) -> list[dict]:
+    """
+    Violation rows of the drones opening a violation this tick.
+
+    Schedules an owner backfill when any owner is still pending.
+    """
+    rows = [
+        build_violation_row(detection.drone.model_dump(), owners.get(detection.drone.owner_id, {}),
+                            now, detection.zone_id, detection.distance)
+        for detection in changes.opened
+    ]
+    if any(row["owner_pending"] for row in rows):
+        schedule_owner_backfill()
+    if settings.episode_tracking:
+        for row in rows:
+            row.update(episode_start=now, min_distance=row["distance_from_center"], sample_count=1)
+    return rows
+
+
+def announce_detections(changes: EpisodeChanges, rows: list[dict], violation_ids: list[int | None],
+                        now: datetime) -> None:
+    """
+    Commit stored episodes, bump the violations watermark, then publish and
+    count the stored violations.
+
+    Rows the insert rejected (None ids) are neither published nor counted.
+    """
+    owner_ids = [detection.drone.owner_id for detection in changes.opened]
+    stored = [(row, owner_id) for row, owner_id, violation_id in zip(rows, owner_ids, violation_ids)
+              if violation_id is not None]
+    if stored or changes.updated or changes.closed:
+        bump_violations_version()
+    if settings.episode_tracking:
+        incursion_tracker.commit(changes, violation_ids, now)
+    publish_violations([row for row, _ in stored])
+    record_violations([row for row, _ in stored], [owner_id for _, owner_id in stored])
+
+
+def store_detections(changes: EpisodeChanges, owners: dict[int, dict]) -> None:
+    """
+    Write a tick's detections: episode updates in one batch, new rows in another.
+
+    The new rows are inserted last, right before the episode tracker is
+    committed, as in the async pipeline: when either write fails the tick
+    fails with no inserted row missing from the tracker, so the next tick
+    neither loses nor re-inserts an episode (the updates set absolute
+    values and are simply repeated). Newly stored violations are then
+    published for live subscribers and folded into the /nfz/stats aggregates.
+
+    Args:
+        changes: Output of plan_violation_writes
+        owners: Owner information keyed by owner id for the opened drones
+    """
+    now = datetime.utcnow()
+    rows = build_detection_rows(changes, owners, now)
+    if settings.episode_tracking:
+        update_violation_episodes(changes, now)
+    violation_ids = store_violations_batch(rows, returning=settings.episode_tracking)
+    announce_detections(changes, rows, violation_ids, now)
+
+
+async def store_violations_batch_async(rows: list[dict], returning: bool = False) -> list[int | None]:
+    """Asyncio variant of store_violations_batch, through the violation repository."""
+    if not rows:
+        return []
+    with stage("store", DB_WRITE_SECONDS.labels("insert")):
+        ids = await violation_repository.insert_many(protect_rows(rows), returning)
+    logger.info(f"✅ Stored batch of {len(rows)} violations")
+    return ids
+
+
+async def update_violation_episodes_async(changes: EpisodeChanges, now: datetime) -> None:
+    """Asyncio variant of update_violation_episodes, through the violation repository."""
+    if not changes.updated and not changes.closed:
+        return
+    try:
+        with stage("update_episodes", DB_WRITE_SECONDS.labels("update")):
+            await violation_repository.update_episodes(changes, now)
+        logger.info(f"✅ Updated {len(changes.updated)} and closed {len(changes.closed)} episodes")
+    except Exception as e:
+        logger.error(f"❌ Error updating episodes: {e}")
+        raise
+
+
+def store_track_segments(segments: list[dict]) -> None:
+    """
+    Insert encoded track segments in one batch.
+
+    Track history is best effort: a failed write is logged and dropped
+    without failing the tick.
+    """
+    if not segments:
+        return
+    db = get_db_session()
+    try:
+        with stage("store", DB_WRITE_SECONDS.labels("tracks")):
+            db.execute(insert(DroneTrack), segments)
+            db.commit()
+        logger.info(f"✅ Stored {len(segments)} track segments")
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"❌ Failed to store track segments: {e}")
+    finally:
+        db.close()
+
+
+def predict_incursions(raw_drones: list[dict]) -> list[PredictedIncursion]:
+    """
+    Warn about drones heading into a zone, when predictions are enabled.
+
+    New predictions are logged, counted and published to the
+    nfz:predictions channel.
+
+    Returns:
+        list[PredictedIncursion]: Predictions first raised this tick
+    """
+    if not settings.prediction_enabled:
+        return []
+    with stage("predict", PREDICTION_SECONDS):
+        predictions = incursion_predictor.observe(raw_drones, zone_index, time.time())
+    for prediction in predictions:
+        PREDICTED_INCURSIONS.labels(prediction.zone_id).inc()
+        logger.warning(f"⏳ Predicted incursion: drone {prediction.drone_id} enters zone "
+                       f"{prediction.zone_id} in {prediction.seconds_to_entry:.0f}s")
+    publish_predictions([prediction.to_message() for prediction in predictions])
+    return predictions
+
+
+def record_tracks(raw_drones: list[dict]) -> None:
+    """Buffer the feed's positions when track recording is on, storing segments as they complete."""
+    if settings.track_recording:
+        store_track_segments(track_recorder.record(raw_drones, datetime.utcnow()))
+
+
+def flush_tracks() -> None:
+    """Store the buffered, not yet flushed positions (on worker shutdown)."""
+    store_track_segments(track_recorder.flush())
+
+
 def validate_drone_data(drone_data: dict) -> Drone | None:
     """
     Validate raw drone dict. Returns Drone or None on failure.
@@ -162,13 +694,185 @@ def validate_drone_data(drone_data: dict) -> Drone | None:
         logger.error(f"❌ Validation failed for drone {drone_data.get('id', 'unknown')}: {e}")
         return None
 
-def validate_all_drones(raw_drones: list[dict]) -> list[Drone]:
+def validate_drones(raw_drones: list[dict]) -> list[Drone | DroneRecord | None]:
+    """
+    Validate raw drone dicts with the configured validation mode.
+
+    "model" builds one Drone per row and logs every rejection; "bulk" uses
+    parse_drones and logs rejections as a periodic summary.
+
+    Returns:
+        list: Validated drones aligned with raw_drones, None for rejected rows
+    """
+    if settings.validation_mode == "bulk":
+        return parse_drones(raw_drones)
+    return [validate_drone_data(drone) for drone in raw_drones]
+
+def validate_all_drones(raw_drones: list[dict]) -> list[Drone | DroneRecord]:
     """Validate a list of raw drone dicts. Skips invalid ones."""
 
-    drones = [d for drone in raw_drones if (d := validate_drone_data(drone))]
+    with stage("validate", VALIDATION_SECONDS):
+        drones = [drone for drone in validate_drones(raw_drones) if drone is not None]
+    DRONES_INVALID.inc(len(raw_drones) - len(drones))
     logger.info(f"✅ Validated {len(drones)}/{len(raw_drones)} drones")
     return drones
 
+def find_violators(raw_drones: list[dict], owns: Owner = None) -> list[Detection]:
+    """
+    Validate the feed and return the drones inside any No-Fly Zone.
+
+    Each drone is only tested against the zones of its grid cell in
+    zone_index. In "vectorized" classification mode the raw feed is
+    classified with NumPy first and only the violators are built into Drone
+    models, so invalid rows outside the zones are skipped without validation.
+
+    With delta processing enabled, only new and moved drones are validated
+    and classified; see find_violators_incremental.
+
+    Args:
+        raw_drones: Drone dicts as returned by the drone feed
+        owns: When processing one shard, scopes per-drone state to it
+
+    Returns:
+        list[Detection]: Valid drones within a zone, with the zone hit
+    """
+    if settings.delta_processing:
+        return find_violators_incremental(raw_drones, owns)
+    detections = []
+    if settings.classification_mode == "vectorized":
+        with stage("classify", CLASSIFICATION_SECONDS):
+            x, y, z = feed_to_arrays(raw_drones)
+            indices, zones = zone_index.match_arrays(x, y, z)
+        with stage("validate", VALIDATION_SECONDS):
+            flagged = validate_drones([raw_drones[index] for index in indices])
+            for drone, zone in zip(flagged, zones):
+                if drone is not None:
+                    detections.append(Detection(drone, zone.id, zone.distance(drone.x, drone.y)))
+        DRONES_INVALID.inc(len(indices) - len(detections))
+        logger.info(f"✅ Validated {len(detections)}/{len(indices)} flagged drones")
+        return detections
+
+    drones = validate_all_drones(raw_drones)
+    with stage("classify", CLASSIFICATION_SECONDS):
+        for drone in drones:
+            if zone := zone_index.match(drone.x, drone.y, drone.z):
+                detections.append(Detection(drone, zone.id, zone.distance(drone.x, drone.y)))
+    return detections
+
+
+def classify_drones(drones: list[Drone | DroneRecord | None]) -> list[Zone | None]:
+    """
+    Zone of each validated drone with the configured classification mode.
+
+    Returns:
+        list[Zone | None]: Aligned with drones, None outside every zone (or for None)
+    """
+    if settings.classification_mode == "vectorized":
+        zones = [None] * len(drones)
+        indices, matched = zone_index.match_arrays(*drones_to_arrays(drones))
+        for index, zone in zip(indices.tolist(), matched):
+            zones[index] = zone
+        return zones
+    return [zone_index.match(drone.x, drone.y, drone.z) if drone is not None else None
+            for drone in drones]
+
+
+def find_violators_incremental(raw_drones: list[dict], owns: Owner = None) -> list[Detection]:
+    """
+    Delta variant of find_violators.
+
+    The feed is compared against the previous tick's snapshot and only new
+    and moved rows are validated and classified. Drones that did not move
+    keep their stored zone result, so the returned violators are the same
+    as a full pass would find. The tick's delta is published for
+    incremental consumers.
+
+    Args:
+        raw_drones: Drone dicts as returned by the drone feed
+        owns: When processing one shard, limits removals to its drones
+
+    Returns:
+        list[Detection]: Valid drones within a zone, with the zone hit
+    """
+    split = feed_tracker.split(raw_drones, owns)
+    with stage("validate", VALIDATION_SECONDS):
+        drones = validate_drones(split.changed)
+    DRONES_INVALID.inc(sum(drone is None for drone in drones))
+    with stage("classify", CLASSIFICATION_SECONDS):
+        zones = classify_drones(drones)
+
+    delta = feed_tracker.commit(split, drones, zones)
+    for kind, count in delta.counts().items():
+        DRONES_CHANGED.labels(kind).inc(count)
+    logger.info(f"✅ Feed delta: {delta.counts()}")
+    publish_feed_delta(delta.to_message())
+
+    detections = [Detection(drone, zone.id, zone.distance(drone.x, drone.y))
+                  for drone, zone in zip(drones, zones) if zone is not None]
+    return detections + feed_tracker.unchanged_detections(split)
+
+
+def process_drones(raw_drones: list[dict], owns: Owner = None) -> int:
+    """
+    Detect, look up owners and store violations for a batch of raw drones.
+
+    Args:
+        raw_drones: The whole feed, or one shard of it
+        owns: Ownership test of the shard's drone ids (None for the whole feed)
+
+    Returns:
+        int: Number of violations detected and processed
+    """
+    DRONES_SEEN.inc(len(raw_drones))
+    record_tracks(raw_drones)
+    predict_incursions(raw_drones)
+    violators = find_violators(raw_drones, owns)
+    for detection in violators:
+        VIOLATIONS.labels(detection.zone_id).inc()
+        logger.warning(f"🚨 NFZ Violation! Drone id: {detection.drone.id} (zone {detection.zone_id})")
+
+    changes = plan_violation_writes(violators, owns)
+    with stage("owner_lookup"):
+        owners = {detection.drone.owner_id: get_drone_owner_info(detection.drone.owner_id)
+                  for detection in changes.opened if detection.drone.owner_id}
+    store_detections(changes, owners)
+    return len(violators)
+
+
+async def process_drones_async(client: httpx.AsyncClient, raw_drones: list[dict], owns: Owner = None) -> int:
+    """
+    Asyncio variant of process_drones.
+
+    Owner lookups for all violators run concurrently over one pooled client,
+    so a tick takes roughly as long as the slowest lookup instead of the sum.
+    Writes go through the async violation repository; episode updates
+    overlap the owner lookups.
+    """
+    DRONES_SEEN.inc(len(raw_drones))
+    record_tracks(raw_drones)
+    predict_incursions(raw_drones)
+    violators = find_violators(raw_drones, owns)
+    for detection in violators:
+        VIOLATIONS.labels(detection.zone_id).inc()
+        logger.warning(f"🚨 NFZ Violation! Drone id: {detection.drone.id} (zone {detection.zone_id})")
+
+    changes = plan_violation_writes(violators, owns)
+    now = datetime.utcnow()
+
+    async def lookup_owners() -> dict[int, dict]:
+        with stage("owner_lookup"):
+            return await fetch_owners_info_async(
+                client, {detection.drone.owner_id for detection in changes.opened if detection.drone.owner_id}
+            )
+
+    # Continuing episodes need no owner, so their UPDATE runs during the lookups
+    owners, _ = await asyncio.gather(lookup_owners(), update_violation_episodes_async(changes, now))
+    rows = build_detection_rows(changes, owners, now)
+    violation_ids = await store_violations_batch_async(rows, returning=settings.episode_tracking)
+    announce_detections(changes, rows, violation_ids, now)
+    return len(violators)
+
+
 def process_nfz_violations() -> int: # without passing a session
     """
     Main NFZ violation detection and processing function.
@@ -182,26 +886,245 @@ def process_nfz_violations() -> int: # without passing a session
     """
     logger.info("🚁 Starting NFZ check task")
 
-    raw_drones = fetch_drones_data()
+    with stage("fetch", UPSTREAM_FETCH_SECONDS):
+        raw_drones = fetch_drones_data()
     if not raw_drones:
         logger.info("⚠️ No drone data received.")
         return 0
 
-    drones = validate_all_drones(raw_drones)
-    
-    violations_detected = 0
-    for drone in drones:
-        if not is_in_nfz(drone.x, drone.y):
-            continue
-        logger.warning(f"🚨 NFZ Violation! Drone id: {drone.id}")
-        owner_info = get_drone_owner_info(drone.owner_id) if drone.owner_id else {}
-        store_violation_to_db(drone.dict(), owner_info) 
-        violations_detected+=1
-    return violations_detected
+    publish_drone_snapshot(raw_drones)
+    return process_drones(raw_drones)
+
+
+async def process_nfz_violations_async() -> int:
+    """
+    Asyncio variant of process_nfz_violations.
+
+    Returns:
+        int: Number of violations detected and processed
+        0:   no drone data available or validation fails
+    """
+    logger.info("🚁 Starting async NFZ check task")
+    client = get_http_client()
+
+    with stage("fetch", UPSTREAM_FETCH_SECONDS):
+        raw_drones = await fetch_drones_data_async(client)
+    if not raw_drones:
+        logger.info("⚠️ No drone data received.")
+        return 0
+
+    publish_drone_snapshot(raw_drones)
+    return await process_drones_async(client, raw_drones)
+
+
+# --- Owner backfill ---
+BACKFILL_SCHEDULED_KEY = "nfz:owners:backfill_scheduled"
 
 
-@celery_app.task(name="nfz-violation-check")
-def fetch_drone_positions_task():
+def schedule_owner_backfill() -> None:
+    """
+    Defer one nfz-owner-backfill run until the user API circuit may close.
+
+    A Redis key deduplicates the deferred runs scheduled by consecutive ticks.
+    """
+    countdown = max(breakers["user_api"].retry_after(), settings.owner_backfill_delay)
+    try:
+        if not get_redis().set(BACKFILL_SCHEDULED_KEY, 1, nx=True, px=int(countdown * 1000)):
+            return
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Could not deduplicate owner backfill: {e}")
+    owner_backfill_task.apply_async(countdown=countdown)
+    logger.info(f"⏳ Owner backfill scheduled in {countdown:.0f} seconds")
+
+
+def backfill_owners(limit: int) -> dict:
+    """
+    Fill in the owner columns of violations stored with owner_pending.
+
+    Owners are looked up one by one (through owner_cache); the run stops as
+    soon as the user API is unavailable again.
+
+    Args:
+        limit: Maximum number of distinct owners to look up
+
+    Returns:
+        dict: Owners resolved, rows updated and whether pending rows remain
+    """
+    pending = Violation.owner_pending.is_(True)
+    db = get_db_session()
+    try:
+        owner_ids = db.scalars(
+            select(Violation.owner_id).where(pending, Violation.owner_id.is_not(None)).distinct().limit(limit)
+        ).all()
+        resolved = updated = 0
+        for owner_id in owner_ids:
+            owner_info = get_drone_owner_info(owner_id)
+            if owner_info is OWNER_PENDING:
+                break
+            updated += db.execute(
+                update(Violation).where(pending, Violation.owner_id == owner_id)
+                .values(**protect_rows([owner_columns(owner_info)])[0])
+            ).rowcount
+            resolved += 1
+        db.commit()
+        remaining = db.scalar(select(Violation.id).where(pending).limit(1)) is not None
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Owner backfill failed: {e}")
+        raise
+    finally:
+        db.close()
+    if updated:
+        bump_violations_version()
+    logger.info(f"✅ Backfilled {resolved} owners ({updated} violations)")
+    return {"owners_resolved": resolved, "violations_updated": updated, "remaining": remaining}
+
+
+@celery_app.task(name="nfz-owner-backfill")
+def owner_backfill_task():
+    """
+    Deferred Celery task filling in owners of violations stored while the user API was down.
+
+    Reschedules itself while the circuit is still open or pending rows remain.
+
+    Returns:
+        dict: Task execution result with:
+            - success: Boolean indicating task completion status
+            - deferred: True when the circuit was still open
+            - owners_resolved / violations_updated / remaining: Backfill progress
+            - timestamp: UTC timestamp of task completion
+            - error: Error message if task failed
+    """
+    try:
+        get_redis().delete(BACKFILL_SCHEDULED_KEY)
+    except redis.RedisError:
+        pass
+    try:
+        if breakers["user_api"].is_open():
+            schedule_owner_backfill()
+            return {"success": True, "deferred": True, "timestamp": datetime.utcnow().isoformat()}
+        result = backfill_owners(settings.owner_backfill_batch)
+        if result["remaining"]:
+            schedule_owner_backfill()
+        return {"success": True, **result, "timestamp": datetime.utcnow().isoformat()}
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
+# --- Fan-out across workers ---
+def shard_strategy() -> str:
+    """
+    Effective shard strategy.
+
+    Episode and delta state is scoped to hash shards, so spatial tiles are
+    only used when neither is enabled.
+    """
+    if settings.shard_strategy == "tile" and (settings.episode_tracking or settings.delta_processing):
+        logger.warning("⚠️ Tile sharding needs stateless detection, using hash sharding")
+        return "hash"
+    return settings.shard_strategy
+
+
+def dispatch_shards(started: float) -> dict:
+    """
+    Fetch the feed once and fan detection out as a chord of shard tasks.
+
+    The chord callback gets the tick lock (when guarded) and the upstream
+    health of the fetch, and schedules the next tick from the duration of
+    the whole chord.
+
+    Args:
+        started: Epoch time the tick started
+
+    Returns:
+        dict: Number of drones and non-empty shards dispatched, and the chord id
+    """
+    logger.info("🚁 Starting sharded NFZ check task")
+    with stage("fetch", UPSTREAM_FETCH_SECONDS):
+        raw_drones = fetch_drones_data()
+    if not raw_drones:
+        logger.info("⚠️ No drone data received.")
+        return {"drones": 0, "shards": 0}
+
+    publish_drone_snapshot(raw_drones)
+    strategy = shard_strategy()
+    shards = split_feed(raw_drones, settings.shard_count, strategy, settings.shard_tile_size)
+    header = group(
+        process_shard_task.s(rows, index, settings.shard_count, strategy)
+        for index, rows in enumerate(shards) if rows
+    )
+    callback = aggregate_shards_task.s(
+        started, tick_scheduler.token, {"retries": upstream_health.retries, "failures": upstream_health.failures}
+    )
+    result = chord(header)(callback)
+    logger.info(f"✅ Dispatched {len(header.tasks)} shards of {len(raw_drones)} drones")
+    return {"drones": len(raw_drones), "shards": len(header.tasks), "chord_id": result.id}
+
+
+@celery_app.task(name="nfz-violation-shard")
+def process_shard_task(raw_drones: list[dict], shard: int, shard_count: int, strategy: str) -> dict:
+    """
+    Celery task detecting and storing the violations of one shard.
+
+    Returns:
+        dict: Shard index, drones processed, violations detected and
+        upstream retries/failures of its owner lookups
+    """
+    upstream_health.reset()
+    owns = shard_owner(shard, shard_count) if strategy == "hash" else None
+    if settings.pipeline_mode == "async":
+        violations = run_async(process_drones_async(get_http_client(), raw_drones, owns))
+    else:
+        violations = process_drones(raw_drones, owns)
+    return {"shard": shard, "drones": len(raw_drones), "violations_detected": violations,
+            "upstream": {"retries": upstream_health.retries, "failures": upstream_health.failures}}
+
+
+@celery_app.task(name="nfz-violation-aggregate")
+def aggregate_shards_task(results: list[dict], started: float, lock_token: str | None = None,
+                          upstream: dict | None = None) -> dict:
+    """
+    Chord callback summing the shard results of one tick.
+
+    Ends the tick for the tick guard: the next interval is computed from the
+    duration of fetch and all shards, and the lock the dispatching task
+    acquired is released only now.
+
+    Args:
+        results: Shard task results
+        started: Epoch time the tick started
+        lock_token: Tick lock handed off by the dispatching task
+        upstream: Upstream retries/failures while fetching the feed
+
+    Returns:
+        dict: Total drones and violations, shard count, tick duration and
+        (tick guard only) the schedule
+    """
+    duration = time.time() - started
+    health = UpstreamHealth(**(upstream or {}))
+    for result in results:
+        health.retries += result.get("upstream", {}).get("retries", 0)
+        health.failures += result.get("upstream", {}).get("failures", 0)
+    summary = {
+        "success": True,
+        "shards": len(results),
+        "drones": sum(result["drones"] for result in results),
+        "violations_detected": sum(result["violations_detected"] for result in results),
+        "duration_seconds": round(duration, 3),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    if settings.tick_guard:
+        summary["schedule"] = tick_scheduler.release(started, duration, health, lock_token)
+    logger.info(f"✅ Sharded tick finished: {summary}")
+    return summary
+
+
+@celery_app.task(name="nfz-violation-check", bind=True)
+def fetch_drone_positions_task(self):
     """
     Celery task for periodic drone position monitoring and NFZ violation detection.
     
@@ -212,16 +1135,59 @@ def fetch_drone_positions_task():
         dict: Task execution result with:
             - success: Boolean indicating task completion status
             - violations_detected: Number of violations found
+            - owner_cache: Owner cache hit/miss counters
+            - duration_seconds: Wall time of the tick
+            - delta: Added/moved/removed/unchanged drone counts (delta processing only)
+            - sharded/drones/shards/chord_id: Fan-out dispatch instead of the
+              counts above when SHARD_COUNT > 1 (totals come from the
+              nfz-violation-aggregate result)
+            - schedule: Next adaptive interval and ticks skipped since the
+              previous run (tick guard only; for a sharded tick it is in the
+              nfz-violation-aggregate result, which also releases the lock)
+            - skipped: Reason a tick did not run ("late", "overlap", "not_due")
             - timestamp: UTC timestamp of task completion
             - error: Error message if task failed
     """
+    started = time.time()
+    published_at = getattr(self.request, "published_at", None)
+    if published_at is not None:
+        TICK_LAG_SECONDS.set(max(0.0, started - published_at))
+    if settings.tick_guard:
+        skipped = tick_scheduler.acquire(started, published_at)
+        if skipped:
+            return {"success": True, "skipped": skipped, "timestamp": datetime.utcnow().isoformat()}
+
+    feed_tracker.last_delta = None
+    upstream_health.reset()
+    summary = run_tick(started)
+    if settings.tick_guard and "chord_id" in summary:
+        tick_scheduler.hand_off()  # released by nfz-violation-aggregate when the shards are done
+    elif settings.tick_guard:
+        summary["schedule"] = tick_scheduler.release(started, time.time() - started, upstream_health)
+    return summary
+
+
+def run_tick(started: float) -> dict:
+    """Run one detection tick (or dispatch its shards) and summarize it."""
     try:
-        result = process_nfz_violations()  # Direct sync call
-        return {
+        if settings.shard_count > 1:
+            return {"success": True, "sharded": True, **dispatch_shards(started),
+                    "timestamp": datetime.utcnow().isoformat()}
+        with stage("tick", TICK_SECONDS):
+            if settings.pipeline_mode == "async":
+                result = run_async(process_nfz_violations_async())
+            else:
+                result = process_nfz_violations()  # Direct sync call
+        summary = {
             "success": True,
             "violations_detected": result,
+            "owner_cache": owner_cache.stats(),
+            "duration_seconds": round(time.time() - started, 3),
             "timestamp": datetime.utcnow().isoformat()
         }
+        if settings.delta_processing and feed_tracker.last_delta is not None:
+            summary["delta"] = feed_tracker.last_delta.counts()
+        return summary
     except Exception as e:
         return {
             "success": False,
@@ -0,0 +1,195 @@
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .classify import feed_to_arrays
+from .settings import settings
+
+# Delta columns are stored with the smallest little-endian dtype that fits
+_DTYPES = ("<i1", "<i2", "<i4", "<i8")
+_COLUMNS = 4  # time offset (ms), x, y, z
+
+
+# --- Encoding ---
+def _dtype_code(values: np.ndarray) -> int:
+    if not len(values):
+        return 0
+    low, high = int(values.min()), int(values.max())
+    for code, dtype in enumerate(_DTYPES):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return code
+    raise ValueError("track values exceed int64")
+
+
+def encode_samples(t_ms: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bytes:
+    """
+    Encode one drone's samples as delta-encoded integer columns.
+
+    Each column stores its first value followed by the differences between
+    consecutive values, in the narrowest integer type that fits, and the
+    whole payload is zlib-compressed. A slow or parked drone costs a few
+    bytes per sample.
+
+    Args:
+        t_ms: Millisecond offsets from the segment start, ascending
+        x, y, z: Positions aligned with t_ms
+
+    Returns:
+        bytes: count (uint32), then per column a dtype code byte and the deltas
+    """
+    parts = [struct.pack("<I", len(t_ms))]
+    for column in (t_ms, x, y, z):
+        deltas = np.diff(np.asarray(column, dtype=np.int64), prepend=0)
+        code = _dtype_code(deltas)
+        parts.append(bytes([code]))
+        parts.append(deltas.astype(_DTYPES[code]).tobytes())
+    return zlib.compress(b"".join(parts))
+
+
+def decode_samples(data: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode a payload written by encode_samples.
+
+    Returns:
+        tuple: t_ms, x, y and z as int64 arrays
+    """
+    raw = zlib.decompress(data)
+    (count,) = struct.unpack_from("<I", raw)
+    offset = 4
+    columns = []
+    for _ in range(_COLUMNS):
+        dtype = np.dtype(_DTYPES[raw[offset]])
+        offset += 1
+        deltas = np.frombuffer(raw, dtype=dtype, count=count, offset=offset)
+        offset += count * dtype.itemsize
+        columns.append(np.cumsum(deltas, dtype=np.int64))
+    return tuple(columns)
+
+
+def bucket_start(moment: datetime) -> datetime:
+    """Start of the track bucket (settings.track_bucket_seconds) containing moment."""
+    seconds = settings.track_bucket_seconds
+    epoch = int((moment - datetime(1970, 1, 1)).total_seconds())
+    return datetime(1970, 1, 1) + timedelta(seconds=epoch - epoch % seconds)
+
+
+# --- Worker side: buffering ---
+@dataclass
+class _Tick:
+    timestamp: datetime
+    ids: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+
+
+class TrackRecorder:
+    """
+    Buffers feed positions in the worker and turns them into track segments.
+
+    Each tick is kept as columnar arrays. Every settings.track_flush_interval
+    seconds, and whenever a track bucket ends, the buffer is grouped by drone
+    and every drone gets one segment row with its encoded samples. Segments
+    never span two buckets, so a query only reads the buckets it covers.
+    Several worker processes may write segments of the same drone and
+    bucket; readers merge them.
+    """
+
+    def __init__(self):
+        self._ticks: list[_Tick] = []
+        self._bucket: datetime | None = None
+
+    def record(self, raw_drones: list[dict], now: datetime) -> list[dict]:
+        """
+        Buffer one tick of the feed.
+
+        Rows without a string id or numeric coordinates are skipped.
+
+        Returns:
+            list[dict]: Segment rows of the flushed buffer, empty when nothing was due
+        """
+        segments = []
+        if self._ticks and (bucket_start(now) != self._bucket or
+                            (now - self._ticks[0].timestamp).total_seconds() >= settings.track_flush_interval):
+            segments = self.flush()
+
+        x, y, z = feed_to_arrays(raw_drones)
+        ids = np.array([row.get("id") if isinstance(row, dict) else None for row in raw_drones], dtype=object)
+        keep = np.isfinite(x) & np.isfinite(y) & np.isfinite(z) & np.array(
+            [isinstance(drone_id, str) for drone_id in ids], dtype=bool)
+        if keep.any():
+            if not self._ticks:
+                self._bucket = bucket_start(now)
+            self._ticks.append(_Tick(now, ids[keep], *(np.rint(axis[keep]).astype(np.int64) for axis in (x, y, z))))
+        return segments
+
+    def flush(self) -> list[dict]:
+        """
+        Encode the buffered ticks, one segment per drone, and clear the buffer.
+
+        Returns:
+            list[dict]: Column values of DroneTrack rows
+        """
+        if not self._ticks:
+            return []
+        ticks, self._ticks = self._ticks, []
+        base = ticks[0].timestamp
+        ids = np.concatenate([tick.ids for tick in ticks])
+        t_ms = np.concatenate([
+            np.full(len(tick.ids), round((tick.timestamp - base).total_seconds() * 1000), dtype=np.int64)
+            for tick in ticks
+        ])
+        x, y, z = (np.concatenate([getattr(tick, axis) for tick in ticks]) for axis in ("x", "y", "z"))
+
+        order = np.argsort(ids, kind="stable")  # stable: samples stay in time order
+        sorted_ids = ids[order]
+        boundaries = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+        segments = []
+        for group in np.split(order, boundaries):
+            times = t_ms[group]
+            segments.append({
+                "drone_id": ids[group[0]],
+                "start_time": base + timedelta(milliseconds=int(times[0])),
+                "end_time": base + timedelta(milliseconds=int(times[-1])),
+                "sample_count": len(group),
+                "data": encode_samples(times - times[0], x[group], y[group], z[group]),
+            })
+        return segments
+
+
+# --- API side: decoding ---
+def decode_track(segments, start: datetime, end: datetime) -> list[dict]:
+    """
+    Merge the samples of a drone's segments that fall within [start, end].
+
+    Args:
+        segments: DroneTrack rows (start_time and data) overlapping the range
+        start: Inclusive lower bound
+        end: Inclusive upper bound
+
+    Returns:
+        list[dict]: Samples with timestamp, x, y and z, oldest first
+    """
+    columns = []
+    for segment in segments:
+        t_ms, x, y, z = decode_samples(segment.data)
+        offset = round((segment.start_time - start).total_seconds() * 1000)
+        columns.append((t_ms + offset, x, y, z))
+    if not columns:
+        return []
+    t_ms, x, y, z = (np.concatenate(column) for column in zip(*columns))
+    limit = round((end - start).total_seconds() * 1000)
+    inside = (t_ms >= 0) & (t_ms <= limit)
+    order = np.argsort(t_ms[inside], kind="stable")
+    t_ms, x, y, z = (column[inside][order] for column in (t_ms, x, y, z))
+    return [
+        {"timestamp": start + timedelta(milliseconds=int(t)), "x": int(px), "y": int(py), "z": int(pz)}
+        for t, px, py, pz in zip(t_ms, x, y, z)
+    ]
+
+
+track_recorder = TrackRecorder()
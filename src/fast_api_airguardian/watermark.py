@@ -0,0 +1,99 @@
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+
+import redis
+
+from .events import get_redis
+from .stats import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "nfz:violations:version"
+
+
+@dataclass
+class Watermark:
+    """Change token of a resource: a version and the wall time it last changed."""
+    version: str
+    updated_at: float
+
+    def etag(self, *variant: str) -> str:
+        """Weak ETag of the resource at this version, distinct per variant (query, format)."""
+        digest = hashlib.blake2b("|".join((self.version, *variant)).encode(), digest_size=8).hexdigest()
+        return f'W/"{digest}"'
+
+    def last_modified(self, now: float | None = None) -> str | None:
+        """
+        HTTP date of the last change, or None while that change's second is not over.
+
+        HTTP dates have one-second precision, so a date handed out during the
+        second of a change could not tell it apart from a later change in the
+        same second.
+        """
+        if int(self.updated_at) >= int(time.time() if now is None else now):
+            return None
+        return formatdate(int(self.updated_at), usegmt=True)
+
+    def not_modified(self, etag: str, if_none_match: str | None, if_modified_since: str | None) -> bool:
+        """
+        Whether a conditional GET can be answered with 304.
+
+        If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        If-Modified-Since is ignored while the last change's second is not
+        over (see last_modified).
+        """
+        if if_none_match is not None:
+            return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
+        if if_modified_since is not None and self.last_modified() is not None:
+            try:
+                return int(self.updated_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+# --- Worker side ---
+def bump_violations_version() -> None:
+    """
+    Mark the violations table as changed, after the worker wrote to it.
+
+    When the bump fails the watermark is deleted, so the API serves full
+    responses instead of 304s for the old version until the next successful
+    bump. That bump starts a new epoch, so restarted version numbers never
+    repeat an ETag handed out before.
+    """
+    try:
+        pipe = get_redis().pipeline(transaction=True)
+        pipe.hsetnx(VERSION_KEY, "epoch", time.time_ns())
+        pipe.hincrby(VERSION_KEY, "version", 1)
+        pipe.hset(VERSION_KEY, "updated_at", time.time())
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Failed to bump violations version: {e}")
+        try:
+            get_redis().delete(VERSION_KEY)
+        except redis.RedisError as e:
+            logger.error(f"❌ Failed to drop violations version, conditional GETs may be stale: {e}")
+
+
+# --- API side ---
+async def read_violations_watermark() -> Watermark | None:
+    """
+    Current violations watermark, or None when unknown (never bumped, Redis down).
+
+    Without a watermark the API skips conditional GET rather than risk a
+    wrong 304.
+    """
+    try:
+        epoch, version, updated_at = await get_async_redis().hmget(VERSION_KEY, "epoch", "version", "updated_at")
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Failed to read violations version: {e}")
+        return None
+    if version is None or updated_at is None:
+        return None
+    if epoch is not None:
+        version = epoch + b"." + version
+    return Watermark(version.decode(), float(updated_at))
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from .parsing import DroneRecord
+from .schemas import Drone
+
+DEFAULT_ZONE_ID = "default"
+
+
+@dataclass(frozen=True)
+class CircleZone:
+    """Circular No-Fly Zone, optionally limited to an altitude band."""
+    id: str
+    x: float
+    y: float
+    radius: float
+    min_z: float | None = None
+    max_z: float | None = None
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        return (self.x - self.radius, self.y - self.radius,
+                self.x + self.radius, self.y + self.radius)
+
+    def distance(self, x: float, y: float) -> float:
+        """Distance from the zone center."""
+        return math.hypot(x - self.x, y - self.y)
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        dx, dy = x - self.x, y - self.y
+        return dx * dx + dy * dy <= self.radius * self.radius and _in_band(self, z)
+
+    def contains_arrays(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        dx, dy = x - self.x, y - self.y
+        return (dx * dx + dy * dy <= self.radius * self.radius) & _in_band_arrays(self, z)
+
+    def entry_times(self, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                    vx: np.ndarray, vy: np.ndarray, horizon: float, steps: int) -> np.ndarray:
+        """
+        Seconds until each position, moving at constant velocity, enters the zone.
+
+        Solved exactly: the first root of |p + v t - c| = radius.
+
+        Returns:
+            np.ndarray: Entry times within [0, horizon], NaN if the drone is
+            already inside or does not enter within the horizon
+        """
+        dx, dy = x - self.x, y - self.y
+        a = vx * vx + vy * vy
+        b = 2 * (dx * vx + dy * vy)
+        c = dx * dx + dy * dy - self.radius * self.radius
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = (-b - np.sqrt(b * b - 4 * a * c)) / (2 * a)
+        entering = (c > 0) & (t >= 0) & (t <= horizon) & _in_band_arrays(self, z)
+        return np.where(entering, t, np.nan)
+
+
+@dataclass(frozen=True)
+class PolygonZone:
+    """Polygonal No-Fly Zone (even-odd rule), optionally limited to an altitude band."""
+    id: str
+    points: tuple[tuple[float, float], ...]
+    min_z: float | None = None
+    max_z: float | None = None
+    center: tuple[float, float] = field(init=False)
+
+    def __post_init__(self):
+        xs, ys = zip(*self.points)
+        object.__setattr__(self, "center", (sum(xs) / len(xs), sum(ys) / len(ys)))
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        xs, ys = zip(*self.points)
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def distance(self, x: float, y: float) -> float:
+        """Distance from the polygon's vertex centroid."""
+        return math.hypot(x - self.center[0], y - self.center[1])
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        if not _in_band(self, z):
+            return False
+        inside = False
+        for (x1, y1), (x2, y2) in zip(self.points, self.points[1:] + self.points[:1]):
+            if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                inside = not inside
+        return inside
+
+    def contains_arrays(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        inside = np.zeros(len(x), dtype=bool)
+        for (x1, y1), (x2, y2) in zip(self.points, self.points[1:] + self.points[:1]):
+            crosses = (y1 > y) != (y2 > y)
+            if y1 != y2:
+                crosses &= x < (x2 - x1) * (y - y1) / (y2 - y1) + x1
+            inside ^= crosses
+        return inside & _in_band_arrays(self, z)
+
+    def entry_times(self, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                    vx: np.ndarray, vy: np.ndarray, horizon: float, steps: int) -> np.ndarray:
+        """
+        Seconds until each position, moving at constant velocity, enters the zone.
+
+        The path is sampled at steps points across the horizon, so the
+        result is the first sampled time inside the polygon.
+
+        Returns:
+            np.ndarray: Entry times within (0, horizon], NaN if the drone is
+            already inside or does not enter within the horizon
+        """
+        times = np.full(len(x), np.nan)
+        outside = ~self.contains_arrays(x, y, z)
+        for step in range(1, steps + 1):
+            t = horizon * step / steps
+            entered = outside & np.isnan(times) & self.contains_arrays(x + vx * t, y + vy * t, z)
+            times[entered] = t
+        return times
+
+
+Zone = CircleZone | PolygonZone
+
+
+def _in_band(zone: Zone, z: float) -> bool:
+    return ((zone.min_z is None or z >= zone.min_z)
+            and (zone.max_z is None or z <= zone.max_z))
+
+
+def _in_band_arrays(zone: Zone, z: np.ndarray) -> np.ndarray:
+    mask = np.ones(len(z), dtype=bool)
+    if zone.min_z is not None:
+        mask &= z >= zone.min_z
+    if zone.max_z is not None:
+        mask &= z <= zone.max_z
+    return mask
+
+
+@dataclass
+class Detection:
+    """A drone found inside a zone during a tick."""
+    drone: Drone | DroneRecord
+    zone_id: str
+    distance: float
+
+
+class ZoneIndex:
+    """
+    Uniform grid over the zones' bounding boxes.
+
+    Each cell lists the zones overlapping it, so a position is only tested
+    against the few zones of its own cell instead of every configured zone.
+    """
+
+    def __init__(self, zones: list[Zone], cell_size: float):
+        self.zones = zones
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list[Zone]] = {}
+        for zone in zones:
+            min_x, min_y, max_x, max_y = zone.bounds()
+            for cx in range(self._cell(min_x), self._cell(max_x) + 1):
+                for cy in range(self._cell(min_y), self._cell(max_y) + 1):
+                    self.cells.setdefault((cx, cy), []).append(zone)
+
+    def fingerprint(self) -> str:
+        """Short hash of the zone definitions, changing whenever the zone config does."""
+        definitions = json.dumps([[type(zone).__name__, repr(zone)] for zone in self.zones])
+        return hashlib.blake2b(definitions.encode(), digest_size=8).hexdigest()
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+    def match(self, x: float, y: float, z: float) -> Zone | None:
+        """
+        First configured zone containing the position.
+
+        Returns:
+            Zone: The matching zone
+            None: Position is outside every zone
+        """
+        for zone in self.cells.get((self._cell(x), self._cell(y)), ()):
+            if zone.contains(x, y, z):
+                return zone
+        return None
+
+    def match_arrays(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> tuple[np.ndarray, list[Zone]]:
+        """
+        Vectorized match over whole coordinate arrays.
+
+        Positions outside every occupied grid cell are discarded with one
+        lookup; the rest are grouped by cell and tested against that cell's
+        zones only. NaN coordinates never match.
+
+        Returns:
+            tuple: Sorted indices of matching positions and the zone of each
+        """
+        finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y) & np.isfinite(z))
+        keys = self._cell_keys(x[finite], y[finite])
+        occupied = np.fromiter((self._key(cx, cy) for cx, cy in self.cells),
+                               dtype=np.int64, count=len(self.cells))
+        candidates = np.isin(keys, occupied)
+        positions, keys = finite[candidates], keys[candidates]
+
+        order = np.argsort(keys, kind="stable")
+        positions, keys = positions[order], keys[order]
+        cell_keys, starts = np.unique(keys, return_index=True)
+        ends = np.append(starts[1:], len(keys))
+
+        zone_number = {id(zone): n for n, zone in enumerate(self.zones)}
+        found = np.full(len(positions), -1)
+        for key, start, end in zip(cell_keys.tolist(), starts, ends):
+            members = positions[start:end]
+            cell_found = found[start:end]
+            for zone in self.cells[self._unkey(key)]:
+                hit = (cell_found < 0) & zone.contains_arrays(x[members], y[members], z[members])
+                cell_found[hit] = zone_number[id(zone)]
+
+        keep = found >= 0
+        positions, found = positions[keep], found[keep]
+        order = np.argsort(positions)
+        return positions[order], [self.zones[n] for n in found[order]]
+
+    def _cell_keys(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        limit = 2 ** 31 - 1
+        cell_x = np.clip(np.floor(x / self.cell_size), -limit, limit).astype(np.int64)
+        cell_y = np.clip(np.floor(y / self.cell_size), -limit, limit).astype(np.int64)
+        return self._key(cell_x, cell_y)
+
+    @staticmethod
+    def _key(cell_x, cell_y):
+        return (cell_x << 32) + (cell_y + 2 ** 31)
+
+    @staticmethod
+    def _unkey(key: int) -> tuple[int, int]:
+        return (key - (key & 0xFFFFFFFF)) >> 32, (key & 0xFFFFFFFF) - 2 ** 31
+
+
+def zone_from_dict(data: dict) -> Zone:
+    """
+    Build a zone from its config entry.
+
+    Circles: {"id", "type": "circle", "x", "y", "radius"}
+    Polygons: {"id", "type": "polygon", "points": [[x, y], ...]}
+    Both accept optional "min_z"/"max_z" altitude bounds.
+    """
+    band = {"min_z": data.get("min_z"), "max_z": data.get("max_z")}
+    if data.get("type", "circle") == "polygon":
+        points = tuple((float(px), float(py)) for px, py in data["points"])
+        if len(points) < 3:
+            raise ValueError(f"Polygon zone {data['id']} needs at least 3 points")
+        return PolygonZone(id=data["id"], points=points, **band)
+    return CircleZone(id=data["id"], x=data.get("x", 0), y=data.get("y", 0),
+                      radius=data["radius"], **band)
+
+
+def load_zones(path: str | None) -> list[Zone]:
+    """Load zones from a JSON file containing a list of zone entries."""
+    if not path:
+        return []
+    return [zone_from_dict(entry) for entry in json.loads(Path(path).read_text())]
@@ -50,3 +50,56 @@ def fake_error_response():
 @pytest.fixture
 def fake_invalid_response():
     return FakeInvalidResponse()
+
+@pytest.fixture
+def sqlite_session(mocker):
+    """Point the task module's DB sessions at an in-memory SQLite database."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from src.fast_api_airguardian import task
+
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    task.Violation.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    mocker.patch.object(task, "get_db_session", side_effect=session_factory)
+    yield session_factory
+    engine.dispose()
+
+@pytest.fixture
+def sqlite_repository(tmp_path):
+    """A ViolationRepository over a SQLite file, and a sync engine to inspect it."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from src.fast_api_airguardian import task
+    from src.fast_api_airguardian.repository import ViolationRepository
+
+    path = tmp_path / "violations.db"
+    engine = create_engine(f"sqlite:///{path}")
+    task.Violation.metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield ViolationRepository(async_sessionmaker(async_engine, expire_on_commit=False)), engine
+    task.run_async(async_engine.dispose())
+    engine.dispose()
+
+@pytest.fixture(autouse=True)
+def clear_owner_cache():
+    from src.fast_api_airguardian.cache import owner_cache
+    owner_cache.clear()
+    yield
+    owner_cache.clear()
+
+@pytest.fixture(autouse=True)
+def clear_drone_snapshot():
+    from src.fast_api_airguardian.main import drone_snapshot
+    drone_snapshot.clear()
+    yield
+    drone_snapshot.clear()
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(mocker):
+    from src.fast_api_airguardian import task
+    from src.fast_api_airguardian.breaker import UPSTREAMS, CircuitBreaker, RetryBudget
+    mocker.patch.object(task, "breakers", {name: CircuitBreaker(name) for name in UPSTREAMS})
+    mocker.patch.object(task, "retry_budgets", {name: RetryBudget(name) for name in UPSTREAMS})
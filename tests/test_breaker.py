@@ -0,0 +1,127 @@
+import redis
+from sqlalchemy import select
+from src.fast_api_airguardian import breaker as breaker_module, task
+from src.fast_api_airguardian.breaker import CircuitBreaker, RetryBudget
+from src.fast_api_airguardian.episodes import EpisodeChanges
+from src.fast_api_airguardian.schemas import Drone, ViolationSchema
+from src.fast_api_airguardian.zones import Detection
+
+OWNER = {"first_name": "Ada", "last_name": "L", "social_security_number": "010101-123A",
+         "phone_number": "0401234567"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_800_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def no_redis():
+    raise redis.ConnectionError("down")
+
+
+def test_breaker_opens_probes_and_closes(mocker):
+    mocker.patch.object(breaker_module.settings, "breaker_failure_threshold", 3)
+    mocker.patch.object(breaker_module.settings, "breaker_reset_timeout", 30.0)
+    clock = Clock()
+    breaker = CircuitBreaker("user_api", no_redis, clock)
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert not breaker.allow() and breaker.retry_after() == 30.0
+
+    clock.now += 31
+    assert breaker.allow()  # half-open probe
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.retry_after() == 0.0
+
+
+def test_breaker_state_is_shared_through_redis(mocker):
+    clock = Clock()
+    client = mocker.MagicMock()
+    client.hmget.return_value = [b"5", str(clock.now + 10).encode()]
+    breaker = CircuitBreaker("drone_feed", lambda: client, clock)
+
+    assert not breaker.allow()
+    clock.now += 11
+    client.set.return_value = None  # another process holds the probe
+    assert not breaker.allow()
+    assert client.set.call_args.kwargs["nx"] is True
+
+
+def test_success_resets_failures_counted_elsewhere(mocker):
+    mocker.patch.object(breaker_module.settings, "breaker_failure_threshold", 3)
+    shared = {}
+    client = mocker.MagicMock()
+    client.hincrby.side_effect = lambda key, field, amount: shared.update(
+        {field: shared.get(field, 0) + amount}) or shared[field]
+    client.delete.side_effect = lambda *keys: shared.clear()
+    client.hmget.side_effect = lambda key, *fields: [shared.get(field) for field in fields]
+    failing, healthy = (CircuitBreaker("user_api", lambda: client, Clock()) for _ in range(2))
+
+    failing.record_failure()
+    failing.record_failure()
+    healthy.record_success()  # this process saw no failures of its own
+    failing.record_failure()
+
+    assert shared == {"failures": 1} and failing.allow()
+
+
+def test_retry_budget_is_per_window(mocker):
+    mocker.patch.object(breaker_module.settings, "retry_budget", 2)
+    mocker.patch.object(breaker_module.settings, "retry_budget_window", 10.0)
+    clock = Clock()
+    budget = RetryBudget("user_api", no_redis, clock)
+
+    assert [budget.take() for _ in range(3)] == [True, True, False]
+    clock.now += 10
+    assert budget.take()
+
+
+def test_open_circuit_fails_fast_with_pending_owner(mocker):
+    task.breakers["user_api"]._open_until = task.time.time() + 60
+    get = mocker.patch.object(task.requests, "get")
+
+    assert task.get_drone_owner_info(7) is task.OWNER_PENDING
+    get.assert_not_called()
+    row = task.build_violation_row({"id": "d1", "owner_id": 7, "x": 1, "y": 1, "z": 1}, task.OWNER_PENDING)
+    assert row["owner_pending"] and row["owner_id"] == 7 and row["owner_first_name"] == ""
+
+
+def test_exhausted_budget_stops_retrying(mocker):
+    mocker.patch.object(breaker_module.settings, "retry_budget", 0)
+    get = mocker.patch.object(task.requests, "get", side_effect=ConnectionError("down"))
+    sleep = mocker.patch.object(task.time, "sleep")
+
+    assert task.fetch_drones_data() == []
+    assert get.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_pending_owners_are_backfilled(mocker, sqlite_session):
+    mocker.patch.object(task, "publish_violations")
+    schedule = mocker.patch.object(task, "schedule_owner_backfill")
+    drone = Drone(id="d1", owner_id=7, x=100, y=0, z=10)
+    task.store_detections(EpisodeChanges(opened=[Detection(drone, "default", 100)]), {7: task.OWNER_PENDING})
+    schedule.assert_called_once()
+
+    with sqlite_session() as db:
+        pending = db.scalars(select(task.Violation)).one()
+        assert pending.owner_pending and ViolationSchema.model_validate(pending).owner_phone is None
+
+    mocker.patch.object(task, "get_drone_owner_info", return_value=OWNER)
+    result = task.backfill_owners(limit=10)
+
+    assert result == {"owners_resolved": 1, "violations_updated": 1, "remaining": False}
+    with sqlite_session() as db:
+        violation = db.scalars(select(task.Violation)).one()
+        assert not violation.owner_pending and violation.owner_first_name == "Ada"
+        assert ViolationSchema.model_validate(violation).owner_phone == 401234567
@@ -0,0 +1,62 @@
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.cache import OwnerCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeOwnerResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def test_lru_eviction():
+    cache = OwnerCache(maxsize=2, ttl=60, negative_ttl=10)
+    cache.set(1, {"first_name": "a"})
+    cache.set(2, {"first_name": "b"})
+    cache.get(1)  # 1 becomes most recently used
+    cache.set(3, {"first_name": "c"})
+    assert cache.get(2) is None
+    assert cache.get(1) == {"first_name": "a"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_and_negative_ttl():
+    clock = FakeClock()
+    cache = OwnerCache(maxsize=10, ttl=60, negative_ttl=10, clock=clock)
+    cache.set(1, {"first_name": "a"})
+    cache.set_missing(2)
+    clock.now = 30
+    assert cache.get(1) == {"first_name": "a"}
+    assert cache.get(2) is None  # negative entry expired
+    clock.now = 61
+    assert cache.get(1) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_owner_lookup_uses_cache(mocker):
+    get = mocker.patch.object(task.requests, "get",
+                              return_value=FakeOwnerResponse(200, {"first_name": "a"}))
+    assert task.get_drone_owner_info(7) == {"first_name": "a"}
+    assert task.get_drone_owner_info(7) == {"first_name": "a"}
+    assert get.call_count == 1
+
+
+def test_owner_lookup_caches_404(mocker):
+    get = mocker.patch.object(task.requests, "get", return_value=FakeOwnerResponse(404))
+    assert task.get_drone_owner_info(8) == {}
+    assert task.get_drone_owner_info(8) == {}
+    assert get.call_count == 1
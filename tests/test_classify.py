@@ -0,0 +1,56 @@
+import random
+import numpy as np
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.classify import feed_to_arrays
+from src.fast_api_airguardian.zones import CircleZone, PolygonZone, ZoneIndex
+
+
+def test_vectorized_matches_scalar_reference():
+    rng = random.Random(42)
+    positions = [(rng.randint(-3000, 3000), rng.randint(-3000, 3000)) for _ in range(20_000)]
+    positions += [(1000, 0), (0, -1000), (1000, 1), (600, 800), (600, 801), (-706, 708)]
+    x = np.array([p[0] for p in positions], dtype=np.float64)
+    y = np.array([p[1] for p in positions], dtype=np.float64)
+
+    indices, zones = task.zone_index.match_arrays(x, y, np.zeros(len(positions)))
+    expected = [i for i, (px, py) in enumerate(positions) if task.is_in_nfz(px, py)]
+    assert indices.tolist() == expected
+    assert {zone.id for zone in zones} == {task.DEFAULT_ZONE_ID}
+
+
+def test_vectorized_matches_scalar_for_several_zones():
+    rng = random.Random(7)
+    index = ZoneIndex([
+        CircleZone(id="airport", x=0, y=0, radius=1000, max_z=500),
+        CircleZone(id="overlap", x=800, y=0, radius=600),
+        PolygonZone(id="harbour", points=((2000, -500), (3000, -500), (3000, 500), (2500, 0), (2000, 500))),
+    ], cell_size=700)
+    x, y, z = (np.array([rng.uniform(low, high) for _ in range(20_000)]) for low, high in
+               ((-1500, 3500), (-1500, 1500), (0, 1000)))
+
+    indices, zones = index.match_arrays(x, y, z)
+    expected = [(n, zone.id) for n in range(len(x)) if (zone := index.match(x[n], y[n], z[n]))]
+    assert list(zip(indices.tolist(), (zone.id for zone in zones))) == expected
+
+
+def test_malformed_rows_are_never_violators():
+    raw = [
+        {"id": "a", "owner_id": 1, "x": 10, "y": 10, "z": 1},
+        {"id": "b", "owner_id": 1, "x": "oops", "y": 10, "z": 1},
+        {"id": "c", "owner_id": 1, "y": 10, "z": 1},
+        {"id": "d", "owner_id": 1, "x": None, "y": 0, "z": 1},
+    ]
+    indices, _ = task.zone_index.match_arrays(*feed_to_arrays(raw))
+    assert indices.tolist() == [0]
+
+
+def test_find_violators_modes_agree(mocker):
+    raw = [
+        {"id": "in", "owner_id": 1, "x": 100, "y": 100, "z": 1},
+        {"id": "out", "owner_id": 1, "x": 5000, "y": 0, "z": 1},
+        {"id": "bad", "owner_id": "INVALID", "x": 1, "y": 1, "z": 1},
+    ]
+    scalar = task.find_violators(raw)
+    mocker.patch.object(task.settings, "classification_mode", "vectorized")
+    assert task.find_violators(raw) == scalar
+    assert [detection.drone.id for detection in scalar] == ["in"]
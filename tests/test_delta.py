@@ -0,0 +1,79 @@
+import random
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.delta import FeedTracker, InMemorySnapshotStore, create_snapshot_store
+from src.fast_api_airguardian.zones import CircleZone, ZoneIndex
+
+
+def drone(drone_id, x, y=0, z=10, owner_id=1):
+    return {"id": drone_id, "owner_id": owner_id, "x": x, "y": y, "z": z}
+
+
+def test_delta_reprocesses_only_new_and_moved(mocker):
+    tracker = FeedTracker(InMemorySnapshotStore())
+    mocker.patch.object(task, "feed_tracker", tracker)
+    mocker.patch.object(task.settings, "delta_processing", True)
+    mocker.patch.object(task, "publish_feed_delta")
+    validate = mocker.spy(task, "validate_drones")
+
+    first = task.find_violators([drone("parked", 100), drone("mover", 5000), drone("gone", 10)])
+    assert sorted(d.drone.id for d in first) == ["gone", "parked"]
+    assert tracker.last_delta.counts() == {"added": 3, "moved": 0, "removed": 0, "unchanged": 0}
+
+    second = task.find_violators([drone("parked", 100), drone("mover", 500), drone("new", 7000)])
+    assert [row["id"] for row in validate.call_args.args[0]] == ["mover", "new"]
+    assert sorted(d.drone.id for d in second) == ["mover", "parked"]
+    parked = next(d for d in second if d.drone.id == "parked")
+    assert parked.zone_id == "default" and parked.distance == 100
+    assert parked.drone.model_dump() == drone("parked", 100)
+
+    delta = tracker.last_delta
+    assert [row["id"] for row in delta.added] == ["new"]
+    assert [row["id"] for row in delta.moved] == ["mover"]
+    assert delta.removed == ["gone"] and delta.unchanged == 1
+
+
+def test_drone_turning_invalid_is_removed():
+    tracker = FeedTracker(InMemorySnapshotStore())
+    split = tracker.split([drone("d1", 1)])
+    tracker.commit(split, task.validate_drones(split.changed), [None])
+
+    split = tracker.split([{"id": "d1", "owner_id": 1, "x": "broken", "y": 0, "z": 0}])
+    delta = tracker.commit(split, task.validate_drones(split.changed), [None])
+    assert delta.removed == ["d1"]
+    assert tracker.store.load() == {}
+
+
+def test_incremental_matches_full_pass(mocker):
+    rng = random.Random(3)
+    mocker.patch.object(task, "publish_feed_delta")
+    feed = [drone(f"d{n}", rng.randint(-2000, 2000), rng.randint(-2000, 2000)) for n in range(300)]
+    for mode in ("scalar", "vectorized"):
+        mocker.patch.object(task.settings, "classification_mode", mode)
+        mocker.patch.object(task, "feed_tracker", FeedTracker(InMemorySnapshotStore()))
+        for _ in range(4):
+            for row in rng.sample(feed, 30):
+                row["x"] += rng.randint(-500, 500)
+            current = [row for row in feed if rng.random() > 0.1]
+
+            mocker.patch.object(task.settings, "delta_processing", False)
+            full = sorted((d.drone.id, d.zone_id, d.distance) for d in task.find_violators(current))
+            mocker.patch.object(task.settings, "delta_processing", True)
+            incremental = sorted((d.drone.id, d.zone_id, d.distance) for d in task.find_violators(current))
+            assert incremental == full
+
+
+def test_memory_snapshot_store_warns_under_prefork(mocker, caplog):
+    from src.fast_api_airguardian import celery
+    mocker.patch.object(celery.settings, "delta_processing", True)
+    mocker.patch.object(celery.settings, "feed_snapshot_store", "memory")
+    celery.check_process_local_stores(sender=mocker.Mock(pool_cls="prefork", concurrency=2))
+    assert "FEED_SNAPSHOT_STORE=memory" in caplog.text
+
+
+def test_redis_snapshot_is_scoped_to_the_zone_config(mocker):
+    mocker.patch.object(task.settings, "feed_snapshot_store", "redis")
+    circle = ZoneIndex([CircleZone(id="airport", x=0, y=0, radius=1000)], cell_size=1000)
+    moved = ZoneIndex([CircleZone(id="airport", x=500, y=0, radius=1000)], cell_size=1000)
+
+    assert circle.fingerprint() == ZoneIndex(list(circle.zones), cell_size=500).fingerprint()
+    assert create_snapshot_store(circle.fingerprint()).key != create_snapshot_store(moved.fingerprint()).key
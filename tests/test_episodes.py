@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import select
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.episodes import IncursionTracker, InMemoryEpisodeStore
+from src.fast_api_airguardian.schemas import Drone
+from src.fast_api_airguardian.zones import Detection
+
+
+def tick(drones):
+    violators = task.find_violators([drone.model_dump() for drone in drones])
+    changes = task.plan_violation_writes(violators)
+    task.store_detections(changes, {})
+
+
+def test_one_row_per_incursion(mocker, sqlite_session):
+    mocker.patch.object(task.settings, "episode_tracking", True)
+    mocker.patch.object(task, "incursion_tracker", IncursionTracker(InMemoryEpisodeStore()))
+
+    tick([Drone(id="d1", owner_id=1, x=600, y=0, z=10)])
+    tick([Drone(id="d1", owner_id=1, x=300, y=0, z=12)])
+    tick([Drone(id="d1", owner_id=1, x=500, y=0, z=14)])
+    with sqlite_session() as db:
+        violation = db.scalars(select(task.Violation)).one()
+        assert violation.sample_count == 3
+        assert violation.min_distance == 300
+        assert violation.position_x == 500
+        assert violation.episode_end is None
+
+    tick([Drone(id="d1", owner_id=1, x=5000, y=0, z=14)])  # left the zone
+    with sqlite_session() as db:
+        violation = db.scalars(select(task.Violation)).one()
+        assert violation.episode_end is not None
+        assert violation.episode_start == violation.timestamp
+
+
+def test_reentry_opens_new_episode():
+    tracker = IncursionTracker(InMemoryEpisodeStore())
+    detection = Detection(Drone(id="d1", owner_id=1, x=10, y=0, z=0), "default", 10.0)
+    changes = tracker.observe([detection])
+    assert changes.opened == [detection]
+    tracker.commit(changes, [1], now=None)
+
+    changes = tracker.observe([])
+    assert [episode.violation_id for episode in changes.closed] == [1]
+    tracker.commit(changes, [], now=None)
+
+    assert tracker.observe([detection]).opened == [detection]
+
+
+def test_zone_change_closes_the_episode_and_opens_another():
+    tracker = IncursionTracker(InMemoryEpisodeStore())
+    drone = Drone(id="d1", owner_id=1, x=10, y=0, z=0)
+    tracker.commit(tracker.observe([Detection(drone, "airport", 10.0)]), [1], now=None)
+
+    changes = tracker.observe([Detection(drone, "harbour", 20.0)])
+
+    assert [(d.drone.id, d.zone_id) for d in changes.opened] == [("d1", "harbour")]
+    assert [(e.zone_id, e.violation_id) for e in changes.closed] == [("airport", 1)]
+    tracker.commit(changes, [2], now=None)
+    assert [(e.zone_id, e.violation_id) for e in tracker.observe([Detection(drone, "harbour", 15.0)]).updated] == [
+        ("harbour", 2)]
+
+
+def test_failed_episode_update_inserts_nothing(mocker, sqlite_session):
+    mocker.patch.object(task.settings, "episode_tracking", True)
+    mocker.patch.object(task, "incursion_tracker", IncursionTracker(InMemoryEpisodeStore()))
+    tick([Drone(id="d1", owner_id=1, x=600, y=0, z=10)])
+
+    update = mocker.patch.object(task, "update_violation_episodes", side_effect=RuntimeError("db down"))
+    with pytest.raises(RuntimeError):
+        tick([Drone(id="d1", owner_id=1, x=300, y=0, z=10), Drone(id="d2", owner_id=2, x=100, y=0, z=10)])
+    update.side_effect = None  # the next tick writes both
+    tick([Drone(id="d1", owner_id=1, x=300, y=0, z=10), Drone(id="d2", owner_id=2, x=100, y=0, z=10)])
+
+    with sqlite_session() as db:
+        assert sorted(db.scalars(select(task.Violation.drone_id))) == ["d1", "d2"]
+
+
+def test_memory_store_warns_under_prefork(mocker, caplog):
+    from src.fast_api_airguardian import celery
+    mocker.patch.object(celery.settings, "episode_tracking", True)
+    mocker.patch.object(celery.settings, "episode_store", "memory")
+    worker = mocker.Mock(pool_cls="celery.concurrency.prefork:TaskPool", concurrency=4)
+
+    celery.check_process_local_stores(sender=worker)
+    assert "EPISODE_STORE=memory" in caplog.text
+
+    caplog.clear()
+    worker.concurrency = 1
+    celery.check_process_local_stores(sender=worker)
+    assert caplog.text == ""
@@ -0,0 +1,60 @@
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+import pytest
+from src.fast_api_airguardian import events
+from src.fast_api_airguardian.main import app
+from src.fast_api_airguardian.settings import settings
+
+
+def test_slow_consumer_drops_oldest():
+    async def scenario():
+        broadcaster = events.Broadcaster("test", queue_size=2)
+        slow, fast = broadcaster.add_subscriber(), broadcaster.add_subscriber()
+        for n in range(3):
+            broadcaster.publish_local(f"m{n}")
+            await fast.get()
+        assert [slow.get_nowait(), slow.get_nowait()] == ["m1", "m2"]
+        assert broadcaster.dropped == 1
+    asyncio.run(scenario())
+
+
+def test_publish_violations_uses_one_pipeline(mocker):
+    client = mocker.patch.object(events, "get_redis").return_value
+    pipe = client.pipeline.return_value
+    events.publish_violations([{"drone_id": "d1"}, {"drone_id": "d2"}])
+    assert pipe.publish.call_count == 2
+    channel, message = pipe.publish.call_args.args
+    assert channel == events.VIOLATIONS_CHANNEL
+    assert json.loads(message) == {"drone_id": "d2"}
+    pipe.execute.assert_called_once()
+
+
+def test_websocket_requires_secret():
+    with pytest.raises(WebSocketDisconnect):
+        with TestClient(app).websocket_connect("/ws/violations") as websocket:
+            websocket.receive_text()
+
+
+def test_websocket_unsubscribes_when_the_client_leaves(mocker):
+    mocker.patch.object(events.violation_events, "_listen", mocker.AsyncMock())
+    scope = {"type": "websocket", "path": "/ws/violations", "raw_path": b"/ws/violations", "headers": [],
+             "query_string": f"secret={settings.api_secret}".encode(), "subprotocols": []}
+    sent = []
+
+    async def scenario():
+        incoming = asyncio.Queue()
+        for message in ({"type": "websocket.connect"}, {"type": "websocket.receive", "text": "ping"},
+                        {"type": "websocket.disconnect", "code": 1000}):
+            incoming.put_nowait(message)
+
+        async def send(message):
+            sent.append(message)
+
+        # nothing is ever published: only reading the client notices it left
+        await asyncio.wait_for(app(scope, incoming.get, send), timeout=1)
+
+    asyncio.run(scenario())
+    assert sent == [{"type": "websocket.accept", "subprotocol": None, "headers": []}]
+    assert events.violation_events.subscribers == set()
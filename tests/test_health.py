@@ -0,0 +1,82 @@
+import asyncio
+import json
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.fast_api_airguardian import health, main, migrate, task
+
+client = TestClient(main.app)
+HEAD = ScriptDirectory.from_config(Config(str(migrate.ALEMBIC_INI))).get_current_head()
+
+
+def test_readiness_reports_each_dependency(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ready.db'}")
+
+    async def database():
+        return await health.check_database(engine)
+
+    async def redis():
+        await asyncio.sleep(1)
+
+    async def run():
+        try:
+            return await health.readiness({"database": database, "redis": redis}, timeout=0.05)
+        finally:
+            await engine.dispose()
+
+    ready, checks = asyncio.run(run())
+    assert not ready
+    assert checks["database"]["ok"] and checks["database"]["latency_ms"] >= 0
+    assert checks["redis"] == {"ok": False, "error": "TimeoutError()"}
+
+
+def test_probe_endpoints(mocker):
+    mocker.patch.object(main.health_checks, "readiness",
+                        return_value=(False, {"database": {"ok": True}, "redis": {"ok": False, "error": "down"}}))
+
+    assert client.get("/health/live").json() == {"status": "ok"}
+    response = client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["status"] == "unavailable"
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+def test_drone_feed_is_fetched_once_for_all_workers(mocker):
+    mocker.patch.object(main.settings, "drones_cache_store", "redis")
+    shared = {}
+    redis_client = mocker.MagicMock()
+    redis_client.get = mocker.AsyncMock(side_effect=lambda key: shared.get(key))
+    redis_client.set = mocker.AsyncMock(return_value=True)
+    pipe = redis_client.pipeline.return_value
+    pipe.set.side_effect = lambda key, value, px: shared.update({key: value})
+    pipe.execute = mocker.AsyncMock()
+    mocker.patch.object(main, "get_async_redis", return_value=redis_client)
+    feed = [{"id": "drone-1", "owner_id": 1, "x": 1, "y": 2, "z": 3}]
+    upstream = mocker.patch.object(main, "fetch_drone_feed", mocker.AsyncMock(return_value=feed))
+
+    first = task.run_async(main.fetch_drone_snapshot())
+    second = task.run_async(main.fetch_drone_snapshot())  # another worker, same TTL window
+
+    assert first == second and upstream.await_count == 1
+    assert json.loads(shared[main.SHARED_DRONES_KEY]) == feed
+    pipe.delete.assert_called_once_with(main.SHARED_DRONES_LOCK_KEY)
+
+
+def test_migrations_run_once_per_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+
+    assert migrate.run_migrations(engine) == "created"
+    assert migrate.run_migrations(engine) == "upgraded"
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar() == HEAD
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    migrate.BASELINE.create_all(legacy)  # as the old API startup did
+    assert migrate.run_migrations(legacy) == "adopted"
+    for database in (engine, legacy):
+        tables = inspect(database).get_table_names()
+        assert set(task.Violation.metadata.tables) <= set(tables)
+        columns = {column["name"] for column in inspect(database).get_columns("violations")}
+        assert columns == set(task.Violation.__table__.columns.keys())
+        database.dispose()
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from src.fast_api_airguardian import maintenance, task
+from src.fast_api_airguardian.model import DroneHourlyRollup, ZoneHourlyRollup
+
+NOW = datetime(2026, 10, 17, 12, 30)
+OWNER = {"first_name": "a", "last_name": "b", "social_security_number": "010101-123A", "phone_number": "123"}
+
+
+def store(drone_id, x, timestamp, zone_id="default"):
+    task.store_violations_batch([task.build_violation_row(
+        {"id": drone_id, "x": x, "y": 0, "z": 10}, OWNER, timestamp, zone_id)])
+
+
+def test_retention_and_hourly_rollups(mocker, sqlite_session):
+    mocker.patch.object(maintenance, "get_db_session", side_effect=sqlite_session)
+    mocker.patch.object(maintenance.settings, "violation_retention_days", 30)
+    store("d1", 500, NOW - timedelta(minutes=20))
+    store("d1", 200, NOW - timedelta(minutes=10))
+    store("d2", 900, NOW - timedelta(minutes=5), zone_id="harbour")
+    store("d3", 100, NOW - timedelta(days=31))
+
+    result = maintenance.run_maintenance(NOW)
+
+    assert result["deleted_rows"] == 1
+    with sqlite_session() as db:
+        assert db.scalars(select(task.Violation.drone_id)).all() == ["d1", "d1", "d2"]
+        drones = {(r.drone_id, r.violations, r.closest_distance) for r in db.scalars(select(DroneHourlyRollup))}
+        assert drones == {("d1", 2, 200), ("d2", 1, 900)}
+        zones = {(r.zone_id, r.violations, r.drones) for r in db.scalars(select(ZoneHourlyRollup))}
+        assert zones == {("default", 2, 1), ("harbour", 1, 1)}
+        assert db.scalars(select(DroneHourlyRollup.bucket)).first() == NOW.replace(minute=0)
+
+    store("d1", 50, NOW - timedelta(minutes=1))
+    maintenance.run_maintenance(NOW)  # recomputing is idempotent
+    with sqlite_session() as db:
+        d1 = db.scalars(select(DroneHourlyRollup).where(DroneHourlyRollup.drone_id == "d1")).one()
+        assert (d1.violations, d1.closest_distance) == (3, 50)
+
+
+def test_partition_periods(mocker):
+    moment = datetime(2026, 10, 17, 15, 4)  # a Saturday
+    assert maintenance.period_start(moment) == datetime(2026, 10, 17)
+    assert maintenance.next_period(datetime(2026, 10, 17)) == datetime(2026, 10, 18)
+
+    mocker.patch.object(maintenance.settings, "partition_interval", "week")
+    assert maintenance.period_start(moment) == datetime(2026, 10, 12)
+    # continues from a daily partition boundary to the next week boundary
+    assert maintenance.next_period(datetime(2026, 10, 15)) == datetime(2026, 10, 19)
+
+
+def test_partitions_catch_up_after_downtime(mocker):
+    # the last partition ends on Oct 13: maintenance was down while rows of later days went to the default one
+    mocker.patch.object(maintenance, "list_partitions",
+                        return_value=[("violations_p20261012", datetime(2026, 10, 13)), ("violations_default", None)])
+    mocker.patch.object(maintenance.settings, "partition_interval", "day")
+    mocker.patch.object(maintenance.settings, "partitions_ahead", 1)
+    failures = mocker.patch.object(maintenance, "PARTITION_FAILURES")
+    statements = []
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        statements.append(sql)
+        if sql.startswith("ALTER") and "FROM ('2026-10-15" in sql:
+            raise OperationalError(sql, params, Exception("partition constraint violated"))
+        result = mocker.MagicMock()
+        result.scalar.return_value = 2 if params and params["start"].day in (14, 15) else 0
+        return result
+
+    db = mocker.MagicMock()
+    db.execute.side_effect = execute
+    db.begin_nested.return_value.__exit__.return_value = False
+
+    created, failed = maintenance.ensure_partitions(db, NOW)
+
+    assert created == [f"violations_p202610{day}" for day in (13, 14, 16, 17, 18)]
+    assert failed == ["violations_p20261015"]
+    failures.inc.assert_called_once()
+    assert any(sql.startswith("WITH moved AS (DELETE FROM \"violations_default\"") for sql in statements)
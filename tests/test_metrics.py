@@ -0,0 +1,48 @@
+import time
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.main import app
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_tick_records_pipeline_metrics(mocker):
+    mocker.patch.object(task, "fetch_drones_data", return_value=[
+        {"id": "in", "owner_id": 0, "x": 10, "y": 10, "z": 5},
+        {"id": "out", "owner_id": 0, "x": 5000, "y": 0, "z": 5},
+        {"id": "broken", "x": "nope"},
+    ])
+    mocker.patch.object(task, "store_violations_batch")
+    mocker.patch.object(task, "publish_violations")
+    seen = sample("nfz_drones_seen_total")
+    invalid = sample("nfz_drones_invalid_total")
+    violations = sample("nfz_violations_total", zone="default")
+    fetches = sample("nfz_upstream_fetch_seconds_count")
+
+    assert task.process_nfz_violations() == 1
+
+    assert sample("nfz_drones_seen_total") == seen + 3
+    assert sample("nfz_drones_invalid_total") == invalid + 1
+    assert sample("nfz_violations_total", zone="default") == violations + 1
+    assert sample("nfz_upstream_fetch_seconds_count") == fetches + 1
+
+
+def test_task_reports_tick_lag(mocker):
+    mocker.patch.object(task, "process_nfz_violations", return_value=0)
+    task.fetch_drone_positions_task.push_request(published_at=time.time() - 4)
+    try:
+        result = task.fetch_drone_positions_task.run()
+    finally:
+        task.fetch_drone_positions_task.pop_request()
+
+    assert result["success"] is True
+    assert sample("nfz_tick_lag_seconds") >= 4
+
+
+def test_metrics_endpoint():
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert "nfz_tick_seconds_bucket" in response.text
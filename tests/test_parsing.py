@@ -0,0 +1,44 @@
+import logging
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.parsing import RejectionReport, parse_drones
+
+FEED = [
+    {"id": "ok", "owner_id": 1, "x": 1, "y": 2, "z": 3, "extra": "ignored"},
+    {"id": "coerced", "owner_id": "2", "x": 5.0, "y": True, "z": "-4"},
+    {"id": "fraction", "owner_id": 3, "x": 5.5, "y": 0, "z": 0},
+    {"id": "missing", "owner_id": 4, "x": 0, "y": 0},
+    {"id": 5, "owner_id": 5, "x": 0, "y": 0, "z": 0},
+    {"id": "none", "owner_id": None, "x": 0, "y": 0, "z": 0},
+]
+
+
+def test_bulk_parsing_matches_model_validation():
+    expected = [task.validate_drone_data(row) for row in FEED]
+    parsed = parse_drones(FEED)
+
+    assert [drone is None for drone in parsed] == [drone is None for drone in expected]
+    for record, model in zip(parsed, expected):
+        if model is not None:
+            assert record.model_dump() == model.model_dump()
+
+
+def test_bulk_mode_in_pipeline(mocker):
+    mocker.patch.object(task.settings, "validation_mode", "bulk")
+    drones = task.validate_all_drones(FEED)
+    assert [drone.id for drone in drones] == ["ok", "coerced"]
+    assert drones[1].x == 5 and drones[1].z == -4
+
+
+def test_rejections_are_logged_as_rate_limited_summary(caplog):
+    now = [0.0]
+    report = RejectionReport(interval=60, clock=lambda: now[0])
+    with caplog.at_level(logging.ERROR):
+        report.record(10, {2: [{"loc": (2, "x"), "type": "int_parsing"}]}, [{}] * 2 + [{"id": "bad"}])
+        report.record(10, {0: [{"loc": (0, "x"), "type": "int_parsing"}]}, [{"id": "bad2"}])
+        assert len(caplog.records) == 1
+        assert "Rejected 1/10" in caplog.text and "x: int_parsing ×1" in caplog.text
+
+        now[0] = 61
+        report.record(10, {}, [])
+    assert len(caplog.records) == 2
+    assert "Rejected 1/20 drones (x: int_parsing ×1; e.g. drone bad2)" in caplog.records[1].message
@@ -0,0 +1,90 @@
+import base64
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from src.fast_api_airguardian import main, pii, task
+from src.fast_api_airguardian.cache import OwnerCache
+from src.fast_api_airguardian.settings import settings
+
+InvalidTag = pytest.importorskip("cryptography.exceptions").InvalidTag  # optional dependency
+KEY = base64.urlsafe_b64encode(os.urandom(32)).decode()
+HEADERS = {"x-secret": settings.api_secret}
+OWNERS = [
+    {"first_name": "Ada", "last_name": "L", "social_security_number": "010101-123A", "phone_number": "0401234567"},
+    {"first_name": "Bo", "last_name": "K", "social_security_number": "020202-456B", "phone_number": "+358501112222"},
+]
+
+
+@pytest.fixture
+def encrypted(mocker):
+    mocker.patch.object(pii.settings, "pii_encryption_key", KEY)
+    mocker.patch.object(pii.settings, "pii_secret", "pii-secret")
+
+
+def test_cipher_binds_tokens_to_their_column():
+    cipher = pii.PiiCipher(os.urandom(32))
+    tokens = cipher.encrypt_many(["010101-123A", "", "020202-456B"], "owner_ssn")
+
+    assert tokens[1] is None and tokens[0] != tokens[2]
+    assert cipher.decrypt_many([tokens[0], tokens[2]], "owner_ssn") == ["010101-123A", "020202-456B"]
+    with pytest.raises(InvalidTag):
+        cipher.decrypt_many([tokens[0]], "owner_phone")
+
+
+def test_stored_pii_is_encrypted_and_hashed(encrypted, sqlite_session):
+    rows = [task.build_violation_row({"id": f"d{n}", "owner_id": n, "x": 1, "y": 1, "z": 1}, owner)
+            for n, owner in enumerate(OWNERS)]
+    task.store_violations_batch(rows)
+
+    with sqlite_session() as db:
+        stored = db.scalars(select(task.Violation).order_by(task.Violation.id)).all()
+    assert [violation.owner_ssn for violation in stored] == ["", ""]
+    assert b"010101" not in stored[0].owner_ssn_enc
+    assert stored[0].owner_ssn_hash == pii.ssn_digest(" 010101-123a", pii.index_key())
+    assert rows[0]["owner_ssn"] == "010101-123A"  # rows announced to subscribers are not modified
+
+
+def test_owner_cache_keeps_pii_encrypted_in_redis(mocker, encrypted):
+    shared = {}
+    redis_client = mocker.MagicMock()
+    redis_client.set.side_effect = lambda key, value, ex: shared.update({key: value})
+    redis_client.mget.side_effect = lambda keys: [shared.get(key) for key in keys]
+    OwnerCache(maxsize=10, ttl=60, negative_ttl=10, redis_client=redis_client).set(1, OWNERS[0])
+
+    assert b"010101-123A" not in shared["owner:1"] and b"0401234567" not in shared["owner:1"]
+    other_worker = OwnerCache(maxsize=10, ttl=60, negative_ttl=10, redis_client=redis_client)
+    assert other_worker.get(1) == OWNERS[0]
+
+    mocker.patch.object(pii.settings, "pii_encryption_key", base64.urlsafe_b64encode(os.urandom(32)).decode())
+    rotated = OwnerCache(maxsize=10, ttl=60, negative_ttl=10, redis_client=redis_client)
+    assert rotated.get(1) is None  # sealed under the old key: refetched
+
+
+@pytest.mark.parametrize("mode", ["model", "columns"])
+def test_nfz_redacts_unless_pii_secret(mocker, encrypted, sqlite_repository, mode):
+    mocker.patch.object(main.settings, "nfz_response_mode", mode)
+    repo, _ = sqlite_repository
+    rows = [task.build_violation_row({"id": f"d{n}", "owner_id": n, "x": 1, "y": 1, "z": 1}, owner)
+            for n, owner in enumerate(OWNERS)]
+    task.run_async(repo.insert_many(pii.protect_rows(rows)))
+    mocker.patch.dict(main.app.dependency_overrides, {main.get_violation_repository: lambda: repo})
+    client = TestClient(main.app)
+
+    redacted = client.get("/nfz", headers=HEADERS).json()
+    assert [(v["owner_ssn"], v["owner_phone"]) for v in redacted] == [(pii.REDACTED, None)] * 2
+
+    revealed = client.get("/nfz", headers={**HEADERS, "x-pii-secret": "pii-secret"})
+    assert [(v["owner_ssn"], v["owner_phone"]) for v in revealed.json()] == [
+        ("010101-123A", 401234567), ("020202-456B", 358501112222)]
+    assert revealed.headers["Cache-Control"] == "private, no-store"
+
+    assert client.get("/nfz", headers={**HEADERS, "x-pii-secret": "wrong"}).status_code == 403
+    assert client.get("/nfz", params={"owner_ssn": "020202-456B"}, headers=HEADERS).status_code == 403
+    found = client.get("/nfz", params={"owner_ssn": "020202-456b"}, headers={**HEADERS, "x-pii-secret": "pii-secret"})
+    assert [v["drone_id"] for v in found.json()] == ["d1"]
+
+
+def test_live_events_are_redacted():
+    message = pii.redact({"drone_id": "d1", "owner_ssn": "010101-123A", "owner_phone": "0401234567"})
+    assert message == {"drone_id": "d1", "owner_ssn": pii.REDACTED, "owner_phone": None}
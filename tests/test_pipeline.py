@@ -0,0 +1,44 @@
+import asyncio
+import time
+import httpx
+from src.fast_api_airguardian import task
+
+VIOLATORS = 20
+LOOKUP_DELAY = 0.2
+
+
+def make_client():
+    async def handler(request):
+        if request.url.path.endswith("/drones"):
+            return httpx.Response(200, json=[
+                {"id": f"drone-{i}", "owner_id": i + 1, "x": i, "y": -i, "z": 10}
+                for i in range(VIOLATORS)
+            ])
+        await asyncio.sleep(LOOKUP_DELAY)  # slow user API
+        owner_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"first_name": f"owner-{owner_id}"})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_async_pipeline_runs_owner_lookups_concurrently(mocker):
+    mocker.patch.object(task.settings, "base_url", "http://test/drones")
+    mocker.patch.object(task, "get_http_client", side_effect=make_client)
+    stored = mocker.patch.object(task.violation_repository, "insert_many")
+
+    start = time.perf_counter()
+    result = task.run_async(task.process_nfz_violations_async())
+    elapsed = time.perf_counter() - start
+
+    assert result == VIOLATORS
+    assert elapsed < LOOKUP_DELAY * 5  # not VIOLATORS * LOOKUP_DELAY
+    rows = stored.call_args.args[0]
+    assert len(rows) == VIOLATORS
+    assert rows[3]["drone_id"] == "drone-3"
+    assert rows[3]["owner_first_name"] == "owner-4"
+
+
+def test_async_pipeline_no_data(mocker):
+    mocker.patch.object(task, "fetch_drones_data_async", return_value=[])
+    stored = mocker.patch.object(task.violation_repository, "insert_many")
+    assert task.run_async(task.process_nfz_violations_async()) == 0
+    stored.assert_not_called()
@@ -0,0 +1,86 @@
+import numpy as np
+from src.fast_api_airguardian import celery
+from src.fast_api_airguardian.prediction import IncursionPredictor, RedisPositionHistory
+from src.fast_api_airguardian.zones import CircleZone, PolygonZone, ZoneIndex
+
+CIRCLE = CircleZone(id="airport", x=0, y=0, radius=1000)
+SQUARE = PolygonZone(id="harbour", points=((5000, -500), (6000, -500), (6000, 500), (5000, 500)))
+
+
+def arrays(*values):
+    return [np.array(value, dtype=float) for value in values]
+
+
+def test_circle_entry_time_is_exact():
+    x, y, z, vx, vy = arrays([-2000, -2000, 3000, 500], [0, 1500, 0, 0], [10] * 4, [100, 100, 100, 100], [0] * 4)
+    times = CIRCLE.entry_times(x, y, z, vx, vy, horizon=60, steps=12)
+
+    assert times[0] == 10.0
+    assert np.isnan(times[1])  # passes beside the zone
+    assert np.isnan(times[2])  # flying away
+    assert np.isnan(times[3])  # already inside
+
+
+def test_polygon_entry_time_is_sampled():
+    x, y, z, vx, vy = arrays([4000, 4000], [0, 2000], [10, 10], [40, 40], [0, 0])
+    times = SQUARE.entry_times(x, y, z, vx, vy, horizon=60, steps=12)
+
+    assert times[0] == 25.0  # enters at 25 s, first sample inside
+    assert np.isnan(times[1])
+
+
+def test_predictor_raises_each_prediction_once():
+    predictor = IncursionPredictor()
+    zones = ZoneIndex([CIRCLE, SQUARE], cell_size=1000)
+
+    def tick(seconds, x):
+        feed = [{"id": "inbound", "owner_id": 1, "x": x, "y": 0, "z": 10},
+                {"id": "parked", "owner_id": 2, "x": 3000, "y": 3000, "z": 10},
+                {"id": "broken", "owner_id": 3, "x": None, "y": 0, "z": 10}]
+        return predictor.observe(feed, zones, 1_800_000_000.0 + seconds)
+
+    assert tick(0, -4000) == []  # no velocity yet
+    predictions = tick(10, -3000)
+    assert [(p.drone_id, p.zone_id) for p in predictions] == [("inbound", "airport")]
+    assert predictions[0].seconds_to_entry == 20.0 and predictions[0].vx == 100.0
+    assert tick(20, -2000) == []  # still predicted, not raised again
+
+
+def test_shards_keep_each_others_predictions():
+    predictor = IncursionPredictor()
+    zones = ZoneIndex([CIRCLE], cell_size=1000)
+
+    def shard(seconds, drone_id, x):
+        return predictor.observe([{"id": drone_id, "owner_id": 1, "x": x, "y": 0, "z": 10}], zones,
+                                 1_800_000_000.0 + seconds)
+
+    for seconds in (0, 10):
+        shard(seconds, "west", -4000 + seconds * 100)
+        shard(seconds + 1, "east", 4000 - seconds * 100)
+    # each shard's tick no longer clears the other's active prediction
+    assert shard(20, "west", -2000) == []
+    assert shard(21, "east", 2000) == []
+
+
+def test_worker_processes_share_the_position_history(mocker):
+    shared = {}
+    client = mocker.MagicMock()
+    client.mget.side_effect = lambda keys: [shared.get(key) for key in keys]
+    client.pipeline.return_value.set.side_effect = lambda key, value, ex: shared.update({key: value})
+    children = [IncursionPredictor(RedisPositionHistory(client)) for _ in range(2)]
+    zones = ZoneIndex([CIRCLE], cell_size=1000)
+
+    def tick(child, seconds, x):
+        feed = [{"id": "inbound", "owner_id": 1, "x": x, "y": 0, "z": 10}]
+        return children[child].observe(feed, zones, 1_800_000_000.0 + seconds)
+
+    assert tick(0, 0, -4000) == []
+    assert [(p.drone_id, p.zone_id) for p in tick(1, 10, -3000)] == [("inbound", "airport")]
+    assert tick(0, 20, -2000) == []  # raised by the other child already
+    assert client.pipeline.return_value.set.call_args.kwargs == {"ex": 30}
+
+
+def test_memory_prediction_store_is_flagged_for_prefork(mocker):
+    mocker.patch.object(celery.settings, "prediction_enabled", True)
+    mocker.patch.object(celery.settings, "prediction_store", "memory")
+    assert "PREDICTION_STORE" in celery.process_local_stores()
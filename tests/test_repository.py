@@ -0,0 +1,67 @@
+from sqlalchemy import select
+from fastapi.testclient import TestClient
+from src.fast_api_airguardian import main, task
+from src.fast_api_airguardian.episodes import IncursionTracker, InMemoryEpisodeStore
+from src.fast_api_airguardian.settings import settings
+
+OWNER = {"first_name": "Ada", "last_name": "L", "social_security_number": "010101-123A",
+         "phone_number": "0401234567"}
+
+
+def rows(count):
+    return [task.build_violation_row({"id": f"drone-{i}", "owner_id": 1, "x": 30, "y": 40, "z": 10}, OWNER)
+            for i in range(count)]
+
+
+def test_insert_many_isolates_bad_row(sqlite_repository):
+    repo, engine = sqlite_repository
+    batch = rows(5)
+    batch[3]["drone_id"] = None  # violates NOT NULL
+
+    ids = task.run_async(repo.insert_many(batch, returning=True))
+
+    assert ids[3] is None
+    assert all(ids[i] for i in (0, 1, 2, 4))
+    with engine.connect() as connection:
+        assert len(connection.execute(select(task.Violation.id)).all()) == 4
+
+
+def test_async_pipeline_writes_episodes_through_repository(mocker, sqlite_repository):
+    repo, engine = sqlite_repository
+    mocker.patch.object(task, "violation_repository", repo)
+    mocker.patch.object(task.settings, "episode_tracking", True)
+    mocker.patch.object(task, "incursion_tracker", IncursionTracker(InMemoryEpisodeStore()))
+    mocker.patch.object(task, "fetch_owners_info_async", return_value={1: OWNER})
+    mocker.patch.object(task, "publish_violations")
+
+    def tick(x):
+        feed = [{"id": "d1", "owner_id": 1, "x": x, "y": 0, "z": 10}]
+        return task.run_async(task.process_drones_async(None, feed))
+
+    assert tick(600) == 1
+    assert tick(300) == 1
+    with engine.connect() as connection:
+        violation = connection.execute(select(task.Violation)).one()
+    assert violation.sample_count == 2 and violation.min_distance == 300
+    assert violation.owner_first_name == "Ada"
+
+    tick(5000)  # left the zone
+    with engine.connect() as connection:
+        assert connection.execute(select(task.Violation.episode_end)).scalar_one() is not None
+
+
+def test_nfz_pages_and_streams_through_repository(mocker, sqlite_repository):
+    repo, _ = sqlite_repository
+    task.run_async(repo.insert_many(rows(3)))
+    mocker.patch.dict(main.app.dependency_overrides, {main.get_violation_repository: lambda: repo})
+    client = TestClient(main.app)
+    headers = {"x-secret": settings.api_secret}
+
+    first = client.get("/nfz", params={"limit": 2}, headers=headers)
+    assert [row["drone_id"] for row in first.json()] == ["drone-0", "drone-1"]
+    rest = client.get("/nfz", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]}, headers=headers)
+    assert [row["drone_id"] for row in rest.json()] == ["drone-2"]
+    assert "X-Next-Cursor" not in rest.headers
+
+    streamed = client.get("/nfz", params={"format": "ndjson"}, headers=headers)
+    assert len(streamed.text.splitlines()) == 3
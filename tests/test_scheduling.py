@@ -0,0 +1,71 @@
+import redis
+from src.fast_api_airguardian import scheduling, task
+from src.fast_api_airguardian.scheduling import TickScheduler, UpstreamHealth, next_interval
+
+NOW = 1_800_000_000.0
+
+
+def scheduler(mocker, next_at=None, locked=False):
+    client = mocker.MagicMock()
+    client.hget.return_value = next_at
+    client.set.return_value = None if locked else True
+    return TickScheduler(lambda: client), client
+
+
+def test_interval_adapts_within_bounds(mocker):
+    mocker.patch.object(scheduling.settings, "tick_min_interval", 10.0)
+    mocker.patch.object(scheduling.settings, "tick_max_interval", 60.0)
+    mocker.patch.object(scheduling.settings, "tick_interval_factor", 2.0)
+
+    assert next_interval(10.0, 1.0, UpstreamHealth()) == 10.0
+    assert next_interval(10.0, 8.0, UpstreamHealth()) == 16.0
+    assert next_interval(16.0, 1.0, UpstreamHealth(retries=2)) == 24.0
+    assert next_interval(40.0, 1.0, UpstreamHealth(failures=1)) == 60.0
+    assert next_interval(60.0, 1.0, UpstreamHealth()) == 10.0  # recovered
+
+
+def test_skips_late_overlapping_and_early_ticks(mocker):
+    guard, client = scheduler(mocker)
+    assert guard.acquire(NOW, published_at=NOW - 60) == "late"
+    client.hincrby.assert_called_once_with(scheduling.SKIPPED_KEY, "late", 1)
+
+    guard, _ = scheduler(mocker, locked=True)
+    assert guard.acquire(NOW, published_at=NOW) == "overlap"
+
+    guard, _ = scheduler(mocker, next_at=b"%f" % (NOW + 30))
+    assert guard.acquire(NOW) == "not_due"
+
+    guard, client = scheduler(mocker, next_at=b"%f" % (NOW + 1))  # within half a beat
+    assert guard.acquire(NOW) is None
+    assert client.set.call_args.kwargs == {"nx": True, "px": int(scheduling.settings.tick_lock_lease * 1000)}
+
+
+def test_release_schedules_next_tick_and_reports_skips(mocker):
+    guard, client = scheduler(mocker)
+    guard.acquire(NOW)
+    token = client.set.call_args.args[1]
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = [1, {b"overlap": b"2"}, 1, 1]
+
+    report = guard.release(NOW, 1.0, UpstreamHealth())
+
+    assert report == {"next_interval": 10.0, "skipped": {"overlap": 2}}
+    pipe.hset.assert_called_once_with(scheduling.SCHEDULE_KEY, mapping={"interval": 10.0, "next_at": NOW + 10})
+    pipe.eval.assert_called_once_with(scheduling._RELEASE_SCRIPT, 1, scheduling.LOCK_KEY, token)
+
+
+def test_guard_fails_open_without_redis(mocker):
+    guard = TickScheduler(mocker.Mock(side_effect=redis.ConnectionError("down")))
+    assert guard.acquire(NOW) is None
+    assert guard.release(NOW, 1.0, UpstreamHealth())["skipped"] == {}
+
+
+def test_skipped_tick_does_not_run(mocker):
+    mocker.patch.object(task.settings, "tick_guard", True)
+    mocker.patch.object(task.tick_scheduler, "acquire", return_value="overlap")
+    process = mocker.patch.object(task, "process_nfz_violations")
+
+    result = task.fetch_drone_positions_task.run()
+
+    assert result["success"] and result["skipped"] == "overlap"
+    process.assert_not_called()
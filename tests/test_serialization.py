@@ -0,0 +1,52 @@
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from src.fast_api_airguardian import main, serialization, task
+from src.fast_api_airguardian.settings import settings
+
+HEADERS = {"x-secret": settings.api_secret}
+
+
+@pytest.fixture
+def client(mocker, sqlite_repository):
+    repo, _ = sqlite_repository
+    owner = {"first_name": "Åsa", "last_name": "L", "social_security_number": "010101-123A",
+             "phone_number": "0401234567"}
+    rows = [task.build_violation_row({"id": f"drone-{i}", "owner_id": i, "x": 30 * i, "y": 40, "z": 10},
+                                     owner, datetime(2026, 10, 17, 12, 0, i, 1000 * i))
+            for i in range(4)]
+    rows[1]["owner_phone"] = "+358401234567"
+    rows[2].update(task.build_violation_row({"id": "drone-2", "owner_id": 2, "x": 0, "y": 0, "z": 0},
+                                            task.OWNER_PENDING, rows[2]["timestamp"]))
+    rows[3].update(episode_start=rows[3]["timestamp"], episode_end=datetime(2026, 10, 17, 12, 5),
+                   min_distance=12, sample_count=3)
+    task.run_async(repo.insert_many(rows))
+    mocker.patch.dict(main.app.dependency_overrides, {main.get_violation_repository: lambda: repo})
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("params", [{"limit": 3}, {"format": "ndjson"}])
+def test_column_mode_matches_model_mode(mocker, client, params):
+    mocker.patch.object(main.settings, "nfz_response_mode", "model")
+    expected = client.get("/nfz", params=params, headers=HEADERS)
+    mocker.patch.object(main.settings, "nfz_response_mode", "columns")
+    fast = client.get("/nfz", params=params, headers=HEADERS)
+
+    assert fast.status_code == expected.status_code == 200
+    assert fast.content == expected.content
+    assert fast.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor")
+
+
+def test_stdlib_fallback_encodes_the_same(mocker):
+    violation = {"timestamp": datetime(2026, 10, 17, 12, 0, 1, 5), "owner_first_name": "Åsa", "owner_phone": None}
+    with_orjson = serialization.dumps([violation])
+    mocker.patch.object(serialization, "orjson", None)
+    assert serialization.dumps([violation]) == with_orjson
+
+
+def test_phone_coercion_follows_schema():
+    assert serialization.phone_to_int("0401234567") == 401234567
+    assert serialization.phone_to_int("+358401234567") == 358401234567
+    assert serialization.phone_to_int("") is None
+    with pytest.raises(ValueError):
+        serialization.phone_to_int("040-123")
@@ -0,0 +1,95 @@
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.episodes import IncursionTracker, InMemoryEpisodeStore
+from src.fast_api_airguardian.sharding import shard_of, shard_owner, split_feed
+
+
+def drone(drone_id, x, y=0, z=10, owner_id=1):
+    return {"id": drone_id, "owner_id": owner_id, "x": x, "y": y, "z": z}
+
+
+def test_hash_split_is_stable_and_complete():
+    feed = [drone(f"d{i}", i * 100) for i in range(200)]
+    shards = split_feed(feed, 4, "hash", 5000.0)
+
+    assert sorted(row["id"] for shard in shards for row in shard) == sorted(row["id"] for row in feed)
+    assert split_feed(list(reversed(feed)), 4, "hash", 5000.0)[1] == list(reversed(shards[1]))
+    for index, shard in enumerate(shards):
+        assert all(shard_of(row["id"], 4) == index for row in shard)
+
+
+def test_tile_split_keeps_neighbours_together():
+    feed = [drone("a", 10, 10), drone("b", 4000, 20), drone("c", -10, 10), drone("bad", "x")]
+    shards = [[row["id"] for row in shard] for shard in split_feed(feed, 8, "tile", 5000.0)]
+
+    assert any(shard[:2] == ["a", "b"] for shard in shards)
+    assert sum(len(shard) for shard in shards) == 4
+
+
+def test_shard_only_closes_its_own_episodes(mocker):
+    tracker = IncursionTracker(InMemoryEpisodeStore())
+    mocker.patch.object(task, "incursion_tracker", tracker)
+    mocker.patch.object(task.settings, "episode_tracking", True)
+    ids = [f"d{i}" for i in range(20)]
+    changes = task.plan_violation_writes(task.find_violators([drone(i, 100) for i in ids]))
+    tracker.commit(changes, list(range(len(ids))), task.datetime.utcnow())
+
+    mine = split_feed([drone(i, 100) for i in ids], 2, "hash", 5000.0)[0]
+    changes = task.plan_violation_writes(task.find_violators(mine), shard_owner(0, 2))
+
+    assert changes.closed == []
+    assert {episode.drone_id for episode in changes.updated} == {row["id"] for row in mine}
+
+
+def test_coordinator_dispatches_a_chord(mocker):
+    feed = [drone(f"d{i}", i * 100) for i in range(30)]
+    mocker.patch.object(task.settings, "shard_count", 3)
+    mocker.patch.object(task, "fetch_drones_data", return_value=feed)
+    mocker.patch.object(task, "publish_drone_snapshot")
+    chord = mocker.patch.object(task, "chord")
+
+    result = task.fetch_drone_positions_task.run()
+
+    header = chord.call_args.args[0]
+    assert result["sharded"] and result["drones"] == 30 and result["shards"] == len(header.tasks)
+    assert sum(len(sig.args[0]) for sig in header.tasks) == 30
+    assert {sig.args[2:] for sig in header.tasks} == {(3, "hash")}
+
+
+def test_shard_task_and_aggregate(mocker):
+    process = mocker.patch.object(task, "process_drones", return_value=2)
+    mocker.patch.object(task.settings, "pipeline_mode", "sync")
+
+    shard = task.process_shard_task.run([drone("d1", 100), drone("d2", 200)], 1, 4, "hash")
+    assert shard == {"shard": 1, "drones": 2, "violations_detected": 2, "upstream": {"retries": 0, "failures": 0}}
+    assert process.call_args.args[1]("d1") == (shard_of("d1", 4) == 1)
+
+    summary = task.aggregate_shards_task.run([shard, {"shard": 0, "drones": 5, "violations_detected": 1}],
+                                             task.time.time())
+    assert (summary["shards"], summary["drones"], summary["violations_detected"]) == (2, 7, 3)
+
+
+def test_sharded_tick_holds_the_lock_until_aggregated(mocker):
+    mocker.patch.object(task.settings, "tick_guard", True)
+    mocker.patch.object(task.settings, "shard_count", 2)
+    mocker.patch.object(task.tick_scheduler, "_token", None)
+    mocker.patch.object(task.tick_scheduler, "acquire", side_effect=lambda *args: setattr(
+        task.tick_scheduler, "_token", "tick-token"))
+    release = mocker.patch.object(task.tick_scheduler, "release", return_value={"next_interval": 30.0})
+    mocker.patch.object(task, "fetch_drones_data", return_value=[drone("d1", 100)])
+    mocker.patch.object(task, "publish_drone_snapshot")
+    chord = mocker.patch.object(task, "chord")
+
+    result = task.fetch_drone_positions_task.run()
+
+    release.assert_not_called()
+    assert "schedule" not in result and task.tick_scheduler.token is None
+    callback = chord.return_value.call_args.args[0]
+    started, token, upstream = callback.args
+    assert token == "tick-token" and started <= task.time.time()
+
+    shards = [{"shard": 0, "drones": 1, "violations_detected": 0, "upstream": {"retries": 2, "failures": 0}}]
+    summary = task.aggregate_shards_task.run(shards, started - 20, token, upstream)
+
+    assert summary["schedule"] == {"next_interval": 30.0}
+    (_, duration, health, released), _ = release.call_args
+    assert duration >= 20 and health.retries == 2 and released == "tick-token"
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from src.fast_api_airguardian.snapshot import SnapshotCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(clock, fail=False):
+    calls = []
+
+    async def fetch():
+        calls.append(clock.now)
+        await asyncio.sleep(0.05)
+        if fail:
+            raise RuntimeError("upstream down")
+        return len(calls)
+
+    return SnapshotCache(fetch, ttl=2, max_stale=10, clock=clock), calls
+
+
+def test_concurrent_requests_share_one_fetch():
+    async def scenario():
+        cache, calls = make_cache(FakeClock())
+        results = await asyncio.gather(*(cache.get() for _ in range(50)))
+        assert results == [1] * 50
+        assert len(calls) == 1
+    asyncio.run(scenario())
+
+
+def test_stale_served_while_refreshing():
+    async def scenario():
+        clock = FakeClock()
+        cache, calls = make_cache(clock)
+        assert await cache.get() == 1
+        clock.now = 5  # past ttl, within max_stale
+        assert await cache.get() == 1  # stale value, refresh started
+        assert await cache.get() == 1  # refresh still in flight, no second fetch
+        await asyncio.sleep(0.1)
+        assert await cache.get() == 2
+        assert len(calls) == 2
+    asyncio.run(scenario())
+
+
+def test_too_stale_waits_for_refresh():
+    async def scenario():
+        clock = FakeClock()
+        cache, _ = make_cache(clock)
+        await cache.get()
+        clock.now = 30
+        assert await cache.get() == 2
+    asyncio.run(scenario())
+
+
+def test_fetch_error_propagates_without_snapshot():
+    async def scenario():
+        cache, _ = make_cache(FakeClock(), fail=True)
+        with pytest.raises(RuntimeError):
+            await cache.get()
+    asyncio.run(scenario())
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+import redis
+from fastapi.testclient import TestClient
+from src.fast_api_airguardian import main, stats
+from src.fast_api_airguardian.settings import settings
+
+NOW = datetime(2026, 10, 17, 12, 30, 15)
+
+
+def row(drone_id, distance, zone_id="default"):
+    return {"drone_id": drone_id, "zone_id": zone_id, "timestamp": NOW, "distance_from_center": distance,
+            "owner_first_name": "Ada", "owner_last_name": "Lovelace"}
+
+
+def test_record_violations_pre_aggregates_one_pipeline(mocker):
+    pipe = mocker.patch.object(stats, "get_redis").return_value.pipeline.return_value
+    stats.record_violations([row("d1", 120), row("d1", 150), row("d2", 990, "harbour")], [7, 7, None])
+
+    pipe.incrby.assert_any_call(stats.TOTAL_KEY, 3)
+    minute_key = stats.window_keys(NOW)["last_hour"][0]
+    pipe.incrby.assert_any_call(minute_key, 3)
+    pipe.zincrby.assert_any_call(stats.DRONES_KEY, 2, "d1")
+    pipe.zincrby.assert_any_call(stats.OWNERS_KEY, 2, "7")
+    pipe.hset.assert_called_once_with(stats.OWNER_NAMES_KEY, mapping={"7": "Ada Lovelace"})
+    pipe.hincrby.assert_any_call(stats.DISTANCE_KEY, "100", 2)
+    pipe.hincrby.assert_any_call(stats.ZONES_KEY, "harbour", 1)
+    pipe.execute.assert_called_once()
+
+
+def test_record_violations_survives_redis_errors(mocker):
+    mocker.patch.object(stats, "get_redis").return_value.pipeline.side_effect = redis.ConnectionError("down")
+    stats.record_violations([row("d1", 120)], [1])  # logged, not raised
+
+
+def test_read_stats(mocker):
+    client = mocker.patch.object(stats, "get_async_redis").return_value
+    pipe = client.pipeline.return_value
+    pipe.execute = mocker.AsyncMock(return_value=[
+        b"42",
+        [b"3", None] + [None] * 58,
+        [b"10"] + [None] * 23,
+        [b"40"] + [None] * 6,
+        [(b"d1", 5.0), (b"d2", 1.0)],
+        [(b"7", 5.0)],
+        {b"default": b"40", b"harbour": b"2"},
+        {b"100": b"4", b"0": b"1"},
+    ])
+    client.hmget = mocker.AsyncMock(return_value=[b"Ada Lovelace"])
+
+    result = asyncio.run(stats.read_stats(NOW))
+
+    assert result["violations"] == {"total": 42, "last_hour": 3, "last_24h": 10, "last_7d": 40}
+    assert result["top_drones"][0] == {"drone_id": "d1", "violations": 5}
+    assert result["top_owners"] == [{"owner_id": 7, "name": "Ada Lovelace", "violations": 5}]
+    assert [bucket["min_distance"] for bucket in result["distance_histogram"]] == [0, 100]
+
+
+def test_stats_endpoint(mocker):
+    client = TestClient(main.app)
+    assert client.get("/nfz/stats").status_code == 401
+
+    get = mocker.patch.object(main.stats_snapshot, "get", mocker.AsyncMock(side_effect=redis.ConnectionError()))
+    assert client.get("/nfz/stats", headers={"x-secret": settings.api_secret}).status_code == 503
+
+    get.side_effect = None
+    get.return_value = {
+        "generated_at": NOW, "violations": {"total": 1, "last_hour": 1, "last_24h": 1, "last_7d": 1},
+        "zones": {"default": 1}, "top_drones": [{"drone_id": "d1", "violations": 1}],
+        "top_owners": [], "distance_histogram": [{"min_distance": 0, "max_distance": 100, "count": 1}],
+    }
+    response = client.get("/nfz/stats", headers={"x-secret": settings.api_secret})
+    assert response.status_code == 200
+    assert response.json()["zones"] == {"default": 1}
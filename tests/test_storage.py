@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.episodes import EpisodeChanges
+from src.fast_api_airguardian.repository import STORED
+from src.fast_api_airguardian.zones import Detection
+
+
+def make_rows(count):
+    drone = {"id": "drone-1", "owner_id": 1, "x": 30, "y": 40, "z": 10}
+    owner = {"first_name": "Ada", "last_name": "L", "social_security_number": "010101-123A",
+             "phone_number": "+358401234567"}
+    rows = []
+    for i in range(count):
+        rows.append(task.build_violation_row({**drone, "id": f"drone-{i}"}, owner))
+    return rows
+
+
+def count_violations(session_factory):
+    with session_factory() as db:
+        return db.scalar(select(func.count()).select_from(task.Violation))
+
+
+def test_batch_insert_returns_ids(sqlite_session):
+    ids = task.store_violations_batch(make_rows(5), returning=True)
+    assert ids == [1, 2, 3, 4, 5]
+    assert count_violations(sqlite_session) == 5
+
+
+def test_batch_insert_isolates_bad_row(sqlite_session):
+    rows = make_rows(5)
+    rows[2]["drone_id"] = None  # violates NOT NULL
+    ids = task.store_violations_batch(rows, returning=True)
+    assert ids[2] is None
+    assert all(ids[i] for i in (0, 1, 3, 4))
+    assert count_violations(sqlite_session) == 4
+
+
+def test_batch_insert_fails_fast_when_the_database_is_down(mocker):
+    db = mocker.patch.object(task, "get_db_session").return_value
+    db.execute.side_effect = OperationalError("INSERT", {}, Exception("connection refused"))
+
+    with pytest.raises(OperationalError):
+        task.store_violations_batch(make_rows(8))
+    db.execute.assert_called_once()  # not bisected into 15 failing round trips
+
+
+def test_rejected_rows_are_not_announced(mocker, sqlite_session):
+    rows = make_rows(3)
+    rows[1]["drone_id"] = None  # violates NOT NULL
+    ids = task.store_violations_batch(rows)
+    assert ids == [STORED, None, STORED]
+
+    publish = mocker.patch.object(task, "publish_violations")
+    record = mocker.patch.object(task, "record_violations")
+    mocker.patch.object(task, "bump_violations_version")
+    drones = [mocker.Mock(owner_id=n) for n in range(3)]
+    task.announce_detections(EpisodeChanges(opened=[Detection(drone, "default", 50) for drone in drones]),
+                             rows, ids, task.datetime.utcnow())
+
+    assert publish.call_args.args[0] == [rows[0], rows[2]]
+    record.assert_called_once_with([rows[0], rows[2]], [0, 2])
+
+
+def test_build_violation_row_distance():
+    row = make_rows(1)[0]
+    assert row["distance_from_center"] == 50
+    assert row["owner_ssn"] == "010101-123A"
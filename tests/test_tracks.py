@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.fast_api_airguardian import main, tracks
+from src.fast_api_airguardian.settings import settings
+from src.fast_api_airguardian.tracks import TrackRecorder, decode_samples, encode_samples
+
+START = datetime(2026, 10, 17, 12, 0, 0)
+
+
+def feed(tick):
+    return [
+        {"id": "mover", "owner_id": 1, "x": -5000 + tick * 250, "y": 120, "z": 30},
+        {"id": "parked", "owner_id": 2, "x": 10, "y": 10, "z": 0},
+        {"id": "broken", "owner_id": 3, "x": "?", "y": 0, "z": 0},
+    ]
+
+
+def test_encoding_roundtrip_is_compact():
+    t_ms = np.arange(0, 300_000, 10_000)
+    x, y, z = -5000 + np.arange(30) * 250, np.full(30, 120), np.full(30, 2**40)
+    data = encode_samples(t_ms, x, y, z)
+    for decoded, original in zip(decode_samples(data), (t_ms, x, y, z)):
+        assert decoded.tolist() == original.tolist()
+    assert len(data) < 30 * 4  # vs 32 bytes per raw sample
+
+
+def test_recorder_flushes_per_bucket(mocker):
+    mocker.patch.object(tracks.settings, "track_bucket_seconds", 300)
+    mocker.patch.object(tracks.settings, "track_flush_interval", 300.0)
+    recorder = TrackRecorder()
+
+    segments = []
+    for tick in range(36):  # 6 minutes of 10 s ticks, crossing a bucket boundary
+        segments += recorder.record(feed(tick), START + timedelta(seconds=10 * tick))
+    segments += recorder.flush()
+
+    mover = [segment for segment in segments if segment["drone_id"] == "mover"]
+    assert [segment["sample_count"] for segment in mover] == [30, 6]
+    assert mover[1]["start_time"] == START + timedelta(minutes=5)
+    assert {segment["drone_id"] for segment in segments} == {"mover", "parked"}
+    t_ms, x, _, _ = decode_samples(mover[0]["data"])
+    assert t_ms[-1] == 290_000 and x.tolist() == [-5000 + tick * 250 for tick in range(30)]
+
+
+def test_track_endpoint_decodes_overlapping_segments(mocker, tmp_path):
+    path = tmp_path / "tracks.db"
+    engine = create_engine(f"sqlite:///{path}")
+    main.DroneTrack.metadata.create_all(engine)
+    recorder = TrackRecorder()
+    segments = []
+    for tick in range(36):
+        segments += recorder.record(feed(tick), START + timedelta(seconds=10 * tick))
+    with engine.begin() as connection:
+        connection.execute(insert(main.DroneTrack), segments + recorder.flush())
+
+    sessions = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"))
+
+    async def test_db():
+        async with sessions() as session:
+            yield session
+
+    mocker.patch.dict(main.app.dependency_overrides, {main.get_async_db: test_db})
+    client = TestClient(main.app)
+    response = client.get("/drones/mover/track", headers={"x-secret": settings.api_secret},
+                          params={"from": "2026-10-17T12:04:30", "to": "2026-10-17T12:05:10"})
+
+    assert response.status_code == 200
+    points = response.json()["points"]
+    assert [point["timestamp"] for point in points] == [
+        f"2026-10-17T12:0{minute}:{second:02d}" for minute, second in ((4, 30), (4, 40), (4, 50), (5, 0), (5, 10))]
+    assert points[0]["x"] == -5000 + 27 * 250
+
+    assert client.get("/drones/mover/track").status_code == 401
+    too_long = {"from": "2026-10-01T00:00:00", "to": "2026-10-17T00:00:00"}
+    assert client.get("/drones/mover/track", params=too_long,
+                      headers={"x-secret": settings.api_secret}).status_code == 400
@@ -0,0 +1,31 @@
+from datetime import datetime
+from fastapi.testclient import TestClient
+from src.fast_api_airguardian.main import app, decode_cursor, encode_cursor, violations_query
+from src.fast_api_airguardian.settings import settings
+
+client = TestClient(app)
+
+
+def test_cursor_roundtrip():
+    timestamp = datetime(2026, 5, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+
+def test_invalid_cursor_rejected():
+    response = client.get("/nfz", params={"cursor": "not-a-cursor"},
+                          headers={"x-secret": settings.api_secret})
+    assert response.status_code == 400
+
+
+def test_requires_secret():
+    assert client.get("/nfz").status_code == 401
+
+
+def test_filters_and_keyset_condition():
+    query = violations_query(encode_cursor(datetime(2026, 1, 1), 7),
+                             since=datetime(2025, 1, 1), drone_id="d1", min_distance=100)
+    sql = str(query)
+    assert "(violations.timestamp, violations.id) >" in sql
+    assert "violations.drone_id =" in sql
+    assert "violations.distance_from_center >=" in sql
+    assert sql.strip().endswith("ORDER BY violations.timestamp, violations.id")
@@ -0,0 +1,82 @@
+import time
+import redis
+from email.utils import formatdate
+from fastapi.testclient import TestClient
+from src.fast_api_airguardian import main, watermark as watermark_module
+from src.fast_api_airguardian.schemas import Drone
+from src.fast_api_airguardian.settings import settings
+from src.fast_api_airguardian.watermark import Watermark
+
+client = TestClient(main.app)
+HEADERS = {"x-secret": settings.api_secret}
+
+
+def test_nfz_not_modified_skips_the_database(mocker):
+    mocker.patch.object(main, "read_violations_watermark", return_value=Watermark("7", 1_700_000_000.4))
+    repo = mocker.MagicMock()
+    repo.page = mocker.AsyncMock(return_value=[])
+    mocker.patch.dict(main.app.dependency_overrides, {main.get_violation_repository: lambda: repo})
+
+    first = client.get("/nfz", params={"limit": 5, "drone_id": "d1"}, headers=HEADERS)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == f"private, max-age={int(settings.tick_min_interval)}"
+    assert first.headers["Last-Modified"] == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+    reordered = {"drone_id": "d1", "limit": 5}
+    assert client.get("/nfz", params=reordered, headers={**HEADERS, "If-None-Match": etag}).status_code == 304
+    assert client.get("/nfz", params={"limit": 5, "drone_id": "d1"},
+                      headers={**HEADERS, "If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
+    assert repo.page.await_count == 1
+    other = client.get("/nfz", params={"limit": 6}, headers={**HEADERS, "If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["ETag"] != etag
+
+
+def test_nfz_without_watermark_is_served_in_full(mocker):
+    mocker.patch.object(main, "read_violations_watermark", return_value=None)
+    repo = mocker.MagicMock()
+    repo.page = mocker.AsyncMock(return_value=[])
+    mocker.patch.dict(main.app.dependency_overrides, {main.get_violation_repository: lambda: repo})
+
+    response = client.get("/nfz", headers={**HEADERS, "If-None-Match": "*"})
+    assert response.status_code == 200 and "ETag" not in response.headers
+    repo.page.assert_awaited_once()
+
+
+def test_drones_snapshot_etag_and_gzip(mocker):
+    drones = [Drone(id=f"drone-{i}", owner_id=i, x=i, y=-i, z=10) for i in range(100)]
+    mocker.patch.object(main.drone_snapshot, "_fetch", mocker.AsyncMock(return_value=drones))
+
+    response = client.get("/drones", headers={"Accept-Encoding": "gzip"})
+    assert response.json() == [drone.model_dump() for drone in drones]
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == f"public, max-age={int(settings.drones_cache_ttl)}"
+
+    again = client.get("/drones", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304 and again.content == b""
+
+
+def test_worker_bumps_the_watermark(mocker):
+    redis_client = mocker.patch.object(watermark_module, "get_redis").return_value
+    watermark_module.bump_violations_version()
+
+    pipe = redis_client.pipeline.return_value
+    pipe.hincrby.assert_called_once_with(watermark_module.VERSION_KEY, "version", 1)
+    assert abs(pipe.hset.call_args.args[2] - time.time()) < 5
+
+
+def test_worker_drops_the_watermark_when_the_bump_fails(mocker):
+    redis_client = mocker.patch.object(watermark_module, "get_redis").return_value
+    redis_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+    watermark_module.bump_violations_version()
+
+    redis_client.delete.assert_called_once_with(watermark_module.VERSION_KEY)
+
+
+def test_last_modified_waits_for_the_second_to_end():
+    now = time.time()
+    current = Watermark("1", now)
+    assert current.last_modified() is None
+    assert not current.not_modified(current.etag(), None, formatdate(now + 1, usegmt=True))
+
+    settled = Watermark("1", now - 2)
+    assert settled.not_modified(settled.etag(), None, settled.last_modified())
@@ -0,0 +1,54 @@
+import json
+import numpy as np
+from src.fast_api_airguardian import task
+from src.fast_api_airguardian.zones import CircleZone, PolygonZone, ZoneIndex, load_zones
+
+ZONES = [
+    CircleZone(id="airport", x=0, y=0, radius=1000),
+    CircleZone(id="low-only", x=5000, y=5000, radius=500, max_z=100),
+    PolygonZone(id="triangle", points=((-4000, -4000), (-2000, -4000), (-3000, -2000))),
+]
+
+
+def test_scalar_match():
+    index = ZoneIndex(ZONES, cell_size=750)
+    assert index.match(600, 800, 0).id == "airport"
+    assert index.match(600, 801, 0) is None
+    assert index.match(5100, 5100, 50).id == "low-only"
+    assert index.match(5100, 5100, 150) is None  # above the altitude band
+    assert index.match(-3000, -3500, 0).id == "triangle"
+    assert index.match(-2100, -2100, 0) is None  # inside bbox, outside triangle
+
+
+def test_vectorized_match_agrees_with_scalar():
+    index = ZoneIndex(ZONES, cell_size=750)
+    rng = np.random.default_rng(7)
+    x = rng.integers(-6000, 6000, 50_000).astype(np.float64)
+    y = rng.integers(-6000, 6000, 50_000).astype(np.float64)
+    z = rng.integers(0, 200, 50_000).astype(np.float64)
+    x[0] = np.nan
+
+    indices, zones = index.match_arrays(x, y, z)
+    expected = [(i, zone.id) for i in range(1, len(x)) if (zone := index.match(x[i], y[i], z[i]))]
+    assert [(int(i), zone.id) for i, zone in zip(indices, zones)] == expected
+
+
+def test_load_zones(tmp_path):
+    path = tmp_path / "zones.json"
+    path.write_text(json.dumps([
+        {"id": "c", "type": "circle", "x": 1, "y": 2, "radius": 3, "min_z": 0},
+        {"id": "p", "type": "polygon", "points": [[0, 0], [1, 0], [0, 1]]},
+    ]))
+    circle, polygon = load_zones(str(path))
+    assert circle == CircleZone(id="c", x=1, y=2, radius=3, min_z=0)
+    assert polygon.points == ((0, 0), (1, 0), (0, 1))
+
+
+def test_violation_records_zone(mocker):
+    mocker.patch.object(task, "zone_index", ZoneIndex(ZONES, cell_size=750))
+    raw = [{"id": "d1", "owner_id": 1, "x": 5100, "y": 5000, "z": 20}]
+    [detection] = task.find_violators(raw)
+    row = task.build_violation_row(detection.drone.model_dump(), {}, None,
+                                   detection.zone_id, detection.distance)
+    assert row["zone_id"] == "low-only"
+    assert row["distance_from_center"] == 100